@@ -0,0 +1,50 @@
+"""Add agreement_jobs table for background agreement PDF generation
+
+Revision ID: 022_agreement_jobs
+Revises: 021_email_outbox
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "022_agreement_jobs"
+down_revision: Union[str, None] = "021_email_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agreement_jobs",
+        sa.Column("id", sa.String(36), primary_key=True, index=True),
+        sa.Column("kind", sa.String(16), nullable=False),
+        sa.Column("invite_token", sa.String(64), nullable=False),
+        sa.Column("merchant_id", sa.String(36), sa.ForeignKey("merchants.id"), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False, server_default="queued"),
+        sa.Column("agreement_pdf_path", sa.String(512), nullable=True),
+        sa.Column("signing_url", sa.Text(), nullable=True),
+        sa.Column("error", sa.String(1024), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_agreement_jobs_merchant_status", "agreement_jobs", ["merchant_id", "status"])
+    op.create_index("ix_agreement_jobs_status_created", "agreement_jobs", ["status", "created_at"])
+    op.create_index(
+        "uq_agreement_jobs_active_merchant_kind",
+        "agreement_jobs",
+        ["merchant_id", "kind"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_agreement_jobs_active_merchant_kind", table_name="agreement_jobs")
+    op.drop_index("ix_agreement_jobs_status_created", table_name="agreement_jobs")
+    op.drop_index("ix_agreement_jobs_merchant_status", table_name="agreement_jobs")
+    op.drop_table("agreement_jobs")
@@ -0,0 +1,27 @@
+"""Add batch_id to agreement_jobs for bulk regeneration runs
+
+Revision ID: 023_agreement_job_batch
+Revises: 022_agreement_jobs
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "023_agreement_job_batch"
+down_revision: Union[str, None] = "022_agreement_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("agreement_jobs", sa.Column("batch_id", sa.String(36), nullable=True))
+    op.create_index("ix_agreement_jobs_batch_id", "agreement_jobs", ["batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agreement_jobs_batch_id", table_name="agreement_jobs")
+    op.drop_column("agreement_jobs", "batch_id")
@@ -0,0 +1,32 @@
+"""Composite indexes for keyset-paginated list endpoints
+
+Revision ID: 024_list_keyset_indexes
+Revises: 023_agreement_job_batch
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "024_list_keyset_indexes"
+down_revision: Union[str, None] = "023_agreement_job_batch"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_partners_name_id", "partners", ["name", "id"])
+    op.create_index("ix_partners_active_name_id", "partners", ["is_active", "name", "id"])
+    op.create_index("ix_fee_schedules_name_id", "fee_schedules", ["name", "id"])
+    op.create_index("ix_product_catalog_type_code", "product_catalog", ["product_type", "product_code"])
+    op.create_index("ix_product_packages_partner_created_id", "product_packages", ["partner_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_packages_partner_created_id", table_name="product_packages")
+    op.drop_index("ix_product_catalog_type_code", table_name="product_catalog")
+    op.drop_index("ix_fee_schedules_name_id", table_name="fee_schedules")
+    op.drop_index("ix_partners_active_name_id", table_name="partners")
+    op.drop_index("ix_partners_name_id", table_name="partners")
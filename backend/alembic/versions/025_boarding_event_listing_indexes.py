@@ -0,0 +1,28 @@
+"""Indexes for the partner boarding event listing
+
+Revision ID: 025_boarding_event_listing
+Revises: 024_list_keyset_indexes
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "025_boarding_event_listing"
+down_revision: Union[str, None] = "024_list_keyset_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_boarding_events_partner_status_created", "boarding_events", ["partner_id", "status", "created_at"]
+    )
+    op.create_index("ix_boarding_events_partner_created_id", "boarding_events", ["partner_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_boarding_events_partner_created_id", table_name="boarding_events")
+    op.drop_index("ix_boarding_events_partner_status_created", table_name="boarding_events")
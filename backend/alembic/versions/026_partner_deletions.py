@@ -0,0 +1,44 @@
+"""Add partner_deletions for background partner deletion
+
+Revision ID: 026_partner_deletions
+Revises: 025_boarding_event_listing
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision: str = "026_partner_deletions"
+down_revision: Union[str, None] = "025_boarding_event_listing"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "partner_deletions",
+        sa.Column("id", sa.String(36), primary_key=True, index=True),
+        sa.Column("partner_id", sa.String(36), nullable=False),
+        sa.Column("partner_name", sa.String(255), nullable=True),
+        sa.Column("status", sa.String(16), nullable=False, server_default="queued"),
+        sa.Column("phase", sa.String(64), nullable=True),
+        sa.Column("deleted", JSONB, nullable=False, server_default="{}"),
+        sa.Column("files_removed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.String(1024), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_partner_deletions_partner_status", "partner_deletions", ["partner_id", "status"])
+    op.create_index("ix_partner_deletions_status_updated", "partner_deletions", ["status", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_partner_deletions_status_updated", table_name="partner_deletions")
+    op.drop_index("ix_partner_deletions_partner_status", table_name="partner_deletions")
+    op.drop_table("partner_deletions")
@@ -0,0 +1,25 @@
+"""Functional index on lower(boarding_contact.email) for merchant login
+
+Revision ID: 027_boarding_contact_email_lower
+Revises: 026_partner_deletions
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "027_boarding_contact_email_lower"
+down_revision: Union[str, None] = "026_partner_deletions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_boarding_contact_email_lower", "boarding_contact", [sa.text("lower(email)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_boarding_contact_email_lower", table_name="boarding_contact")
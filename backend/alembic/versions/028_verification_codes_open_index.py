@@ -0,0 +1,30 @@
+"""Partial index for unused verification codes by contact/channel
+
+Revision ID: 028_verification_codes_open_index
+Revises: 027_boarding_contact_email_lower
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "028_verification_codes_open_index"
+down_revision: Union[str, None] = "027_boarding_contact_email_lower"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_verification_codes_open_contact_channel_created",
+        "verification_codes",
+        ["contact", "channel", sa.text("created_at DESC")],
+        postgresql_where=sa.text("used_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_verification_codes_open_contact_channel_created", table_name="verification_codes")
@@ -0,0 +1,41 @@
+"""Add boarding_archive for expired, never-submitted boardings
+
+Revision ID: 029_boarding_archive
+Revises: 028_verification_codes_open_index
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+revision: str = "029_boarding_archive"
+down_revision: Union[str, None] = "028_verification_codes_open_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "boarding_archive",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("partner_id", sa.String(36), nullable=False),
+        sa.Column("merchant_id", sa.String(36), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="expired"),
+        sa.Column("last_status", sa.String(20), nullable=False),
+        sa.Column("last_step", sa.Integer(), nullable=True),
+        sa.Column("contact_email", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("data", JSONB, nullable=False),
+    )
+    op.create_index("ix_boarding_archive_partner_created", "boarding_archive", ["partner_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_boarding_archive_partner_created", table_name="boarding_archive")
+    op.drop_table("boarding_archive")
@@ -1,9 +1,12 @@
-from typing import Optional
+import threading
+import time
+from typing import Callable, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.deps import get_db
 from app.core.security import decode_access_token
 from app.models.admin_user import AdminUser
@@ -11,6 +14,94 @@ from app.models.partner import Partner
 
 security = HTTPBearer(auto_error=False)
 
+# Bound on memoized tokens / cached principals per process
+_CACHE_MAX_ENTRIES = 10_000
+
+
+class _ExpiringCache:
+    """Thread-safe dict whose entries carry their own expiry (monotonic seconds)."""
+
+    def __init__(self, max_entries: int = _CACHE_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._data: dict = {}
+        self._max_entries = max_entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._data) >= self._max_entries:
+                self._data = {k: v for k, v in self._data.items() if v[0] > now}
+                while len(self._data) >= self._max_entries:
+                    self._data.pop(next(iter(self._data)))
+            self._data[key] = (now + ttl_seconds, value)
+
+    def pop(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_token_payloads = _ExpiringCache()
+_principals = _ExpiringCache()
+
+
+def _decode_token(token: str) -> Optional[dict]:
+    """decode_access_token memoized per token until its exp."""
+    payload = _token_payloads.get(token)
+    if payload is not None:
+        return payload
+    payload = decode_access_token(token)
+    if payload and isinstance(payload.get("exp"), (int, float)):
+        _token_payloads.set(token, payload, payload["exp"] - time.time())
+    return payload
+
+
+def _cached_principal(kind: str, principal_id: str, load: Callable[[], Optional[object]]):
+    """
+    Principal row from the short-TTL cache, else load() it and cache a detached copy.
+    Only column attributes are available on cached rows (no lazy relationships).
+    """
+    key = (kind, principal_id)
+    principal = _principals.get(key)
+    if principal is not None:
+        return principal
+    principal = load()
+    if principal is not None:
+        _principals.set(key, principal, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    return principal
+
+
+def _load_detached(db: Session, model, principal_id: str):
+    row = db.query(model).filter(model.id == principal_id).first()
+    if row is not None:
+        db.expunge(row)
+    return row
+
+
+def invalidate_partner(partner_id: str) -> None:
+    """Drop a cached partner (call after changing or deleting it)."""
+    _principals.pop(("partner", partner_id))
+
+
+def invalidate_admin(admin_id: str) -> None:
+    _principals.pop(("admin", admin_id))
+
 
 def get_current_admin(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -23,7 +114,7 @@ def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = _decode_token(token)
     if not payload or payload.get("role") != "admin" or "sub" not in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -31,7 +122,7 @@ def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
     admin_id = payload["sub"]
-    admin = db.query(AdminUser).filter(AdminUser.id == admin_id).first()
+    admin = _cached_principal("admin", admin_id, lambda: _load_detached(db, AdminUser, admin_id))
     if not admin:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,7 +143,7 @@ def get_current_partner(
             headers={"WWW-Authenticate": "Bearer"},
         )
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = _decode_token(token)
     if not payload or "sub" not in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,7 +151,7 @@ def get_current_partner(
             headers={"WWW-Authenticate": "Bearer"},
         )
     partner_id = payload["sub"]
-    partner = db.query(Partner).filter(Partner.id == partner_id).first()
+    partner = _cached_principal("partner", partner_id, lambda: _load_detached(db, Partner, partner_id))
     if not partner:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
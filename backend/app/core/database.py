@@ -1,17 +1,174 @@
-from sqlalchemy import create_engine
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout wait time and timeout counters for one engine's pool (read via snapshot())."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connect_errors = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe(self, wait_seconds: float, timed_out: bool = False, failed: bool = False) -> None:
+        """Record a checkout: timed_out = pool exhausted for pool_timeout, failed = connect/pre-ping error."""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            if failed:
+                self.connect_errors += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            avg = self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),  # QueuePool reports negative while under pool_size
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "connect_errors": self.connect_errors,
+                "checkout_wait_avg_ms": round(avg * 1000, 3),
+                "checkout_wait_max_ms": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """Times connect() (queue wait + pre-ping + new connection if any) into the pool's PoolMetrics."""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        except Exception:
+            # Database down, auth or pre-ping failure: not pool exhaustion
+            self.metrics.observe(time.perf_counter() - start, failed=True)
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return conn
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
+    poolclass=TimedQueuePool,
     echo=False,
+    **_pool_kwargs(),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class BlockingDBCallError(RuntimeError):
+    """Sync (psycopg2) DB I/O on the event loop thread (DB_LOOP_BLOCKING_CHECK=raise)."""
+
+
+# Statements already warned about (one warning with stack per statement per worker)
+_blocking_warned: set[str] = set()
+_BLOCKING_WARNED_MAX = 1000
+
+
+def _check_not_on_event_loop(statement: str) -> None:
+    """The sync engine blocks its thread; on the loop thread that stalls every request in the worker."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return  # threadpool / background thread: fine
+    if settings.DB_LOOP_BLOCKING_CHECK == "raise":
+        raise BlockingDBCallError(f"Sync DB call on the event loop thread: {statement[:200]}")
+    if statement not in _blocking_warned and len(_blocking_warned) < _BLOCKING_WARNED_MAX:
+        _blocking_warned.add(statement)
+        logger.warning(
+            "Sync DB call on the event loop thread (use get_async_db or a sync def handler): %s",
+            statement[:200],
+            stack_info=True,
+        )
+
+
+if settings.DB_LOOP_BLOCKING_CHECK != "off":
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _check_not_on_event_loop(statement)
+
+    @event.listens_for(engine, "commit")
+    def _on_commit(conn):
+        _check_not_on_event_loop("COMMIT")
+
+
+def _async_database_url(url: str) -> str:
+    """Derive the asyncpg URL from DATABASE_URL (postgresql:// or postgresql+psycopg2:// -> postgresql+asyncpg://)."""
+    u = make_url(url)
+    u = u.set(drivername="postgresql+asyncpg")
+    # asyncpg takes ssl=..., not libpq's sslmode=...
+    if "sslmode" in u.query:
+        query = dict(u.query)
+        query["ssl"] = query.pop("sslmode")
+        u = u.set(query=query)
+    return u.render_as_string(hide_password=False)
+
+
+# Async engine for async def handlers (asyncpg); same database and pool settings as the sync engine
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL),
+    poolclass=TimedAsyncQueuePool,
+    echo=False,
+    **_pool_kwargs(),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def pool_metrics() -> dict:
+    """Current pool state and checkout timings for the sync and async engines."""
+    return {
+        "sync": TimedQueuePool.metrics.snapshot(engine.pool),
+        "async": TimedAsyncQueuePool.metrics.snapshot(async_engine.pool),
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
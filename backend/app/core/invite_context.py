@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.deps import get_async_db, get_db
+from app.models.boarding_contact import BoardingContact
+from app.models.boarding_event import BoardingEvent
+from app.models.invite import Invite
+from app.models.merchant import Merchant
+from app.models.partner import Partner
+
+
+class InviteContext:
+    """Invite with its boarding event, contact, merchant and partner (loaded in one joined query)."""
+
+    def __init__(self, invite: Invite):
+        self.invite = invite
+        self.event: Optional[BoardingEvent] = invite.boarding_event
+        self.contact: Optional[BoardingContact] = self.event.contact if self.event else None
+        self.merchant: Optional[Merchant] = self.event.merchant if self.event else None
+        self.partner: Optional[Partner] = invite.partner
+
+    @property
+    def is_used(self) -> bool:
+        return self.invite.used_at is not None
+
+    @property
+    def is_expired(self) -> bool:
+        return bool(self.invite.expires_at and self.invite.expires_at < datetime.now(timezone.utc))
+
+    @property
+    def is_open(self) -> bool:
+        """Invite can still be used for boarding steps (not used, not expired)."""
+        return not self.is_used and not self.is_expired
+
+
+def _context_options() -> tuple:
+    return (
+        joinedload(Invite.boarding_event).joinedload(BoardingEvent.contact),
+        joinedload(Invite.boarding_event).joinedload(BoardingEvent.merchant),
+        joinedload(Invite.partner),
+    )
+
+
+def load_invite_context(db: Session, token: str, *extra_options) -> Optional[InviteContext]:
+    """Load invite + event + contact + merchant + partner for a token in a single round trip. None if no invite."""
+    invite = (
+        db.query(Invite)
+        .options(*_context_options(), *extra_options)
+        .filter(Invite.token == token)
+        .first()
+    )
+    if not invite:
+        return None
+    return InviteContext(invite)
+
+
+async def load_invite_context_async(db: AsyncSession, token: str, *extra_options) -> Optional[InviteContext]:
+    """Async variant of load_invite_context. Anything the caller touches beyond the context must be in extra_options."""
+    result = await db.execute(
+        select(Invite).options(*_context_options(), *extra_options).where(Invite.token == token).limit(1)
+    )
+    invite = result.unique().scalar_one_or_none()
+    if not invite:
+        return None
+    return InviteContext(invite)
+
+
+def get_invite_context(
+    token: str = Query(..., description="Invite token from boarding URL"),
+    db: Session = Depends(get_db),
+) -> InviteContext:
+    """Dependency: invite context for any existing invite (no expiry/used check). 404 if unknown."""
+    ctx = load_invite_context(db, token)
+    if not ctx:
+        raise HTTPException(status_code=404, detail="Invalid or expired link")
+    if not ctx.event:
+        raise HTTPException(status_code=404, detail="Invalid link")
+    return ctx
+
+
+async def get_invite_context_async(
+    token: str = Query(..., description="Invite token from boarding URL"),
+    db: AsyncSession = Depends(get_async_db),
+) -> InviteContext:
+    """Async dependency: same checks as get_invite_context, on the asyncpg session."""
+    ctx = await load_invite_context_async(db, token)
+    if not ctx:
+        raise HTTPException(status_code=404, detail="Invalid or expired link")
+    if not ctx.event:
+        raise HTTPException(status_code=404, detail="Invalid link")
+    return ctx
+
+
+def get_open_invite_context(
+    token: str = Query(..., description="Invite token from boarding URL"),
+    db: Session = Depends(get_db),
+) -> InviteContext:
+    """Dependency: invite context for an invite that is neither used nor expired. 404 otherwise."""
+    ctx = load_invite_context(db, token)
+    if not ctx or not ctx.is_open:
+        raise HTTPException(status_code=404, detail="Invalid or expired link")
+    if not ctx.event:
+        raise HTTPException(status_code=404, detail="Invalid link")
+    return ctx
@@ -0,0 +1,75 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+Endpoints keep returning a plain JSON list; when more rows exist the opaque cursor for the next page is sent in the
+X-Next-Cursor response header and passed back as ?cursor=. Ordering columns must end with a unique column (id).
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page:
+    """limit/cursor query params (use as a dependency: page: Page = Depends())."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def _encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, columns: Sequence) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(v) if v is not None and col.type.python_type is datetime else v
+            for v, col in zip(values, columns)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset(stmt, page: Page, *columns, descending: bool = False):
+    """Order a Query/Select by columns, start after the page's cursor and fetch limit + 1 rows (to detect a next page)."""
+    if page.cursor:
+        values = _decode_cursor(page.cursor, columns)
+        key = tuple_(*columns)
+        stmt = stmt.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+    return stmt.order_by(*(c.desc() if descending else c for c in columns)).limit(page.limit + 1)
+
+
+def page_rows(rows: Sequence, page: Page, response: Response, *columns) -> list:
+    """Rows of this page (drops the look-ahead row) and sets the next-page cursor header when there are more."""
+    rows = list(rows)
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor([getattr(last, c.key) for c in columns])
+    return rows
+
+
+def filter_created(stmt, column, created_after: Optional[datetime], created_before: Optional[datetime]):
+    """Restrict to created_after <= column < created_before (either bound optional)."""
+    if created_after is not None:
+        stmt = stmt.filter(column >= created_after)
+    if created_before is not None:
+        stmt = stmt.filter(column < created_before)
+    return stmt
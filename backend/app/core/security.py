@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -9,18 +11,47 @@ from app.core.config import settings
 # Bcrypt limit is 72 bytes; truncate to avoid errors
 BCRYPT_MAX_PASSWORD_BYTES = 72
 
+# bcrypt releases the GIL; a small dedicated pool caps concurrent hashing so login bursts queue here
+# instead of occupying the shared request threadpool
+_bcrypt_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
     pwd_bytes = plain_password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
     return bcrypt.checkpw(pwd_bytes, hashed_password.encode("utf-8"))
 
 
-def get_password_hash(password: str) -> str:
+def _hashpw(password: str) -> str:
     pwd_bytes = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(pwd_bytes, salt).decode("utf-8")
 
 
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _bcrypt_executor.submit(_checkpw, plain_password, hashed_password).result()
+
+
+def get_password_hash(password: str) -> str:
+    return _bcrypt_executor.submit(_hashpw, password).result()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password for async handlers: waits on the bcrypt pool without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, _checkpw, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, _hashpw, password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different cost than BCRYPT_ROUNDS (rehash after a successful login)."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
 def create_access_token(
     subject: str,
     expires_delta: Optional[timedelta] = None,
@@ -3,9 +3,11 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.models import Base  # noqa: F401 - register models
 from app.routers import admin, auth, boarding, health, partners
 
@@ -23,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(health.router, prefix="/health")
@@ -37,10 +40,8 @@ upload_dir.mkdir(parents=True, exist_ok=True)
 app.mount("/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
 
 
-@app.on_event("startup")
-async def startup():
-    logger.info("CORS allowed origins: %s", settings.CORS_ORIGINS)
-    # Seed initial Path Admin if no admin users exist (Admin / keywee50)
+def _seed_admin() -> None:
+    """Seed initial Path Admin if no admin users exist (Admin / keywee50)."""
     from app.core.database import SessionLocal
     from app.core.security import get_password_hash
     from app.models.admin_user import AdminUser
@@ -59,6 +60,53 @@ async def startup():
         db.close()
 
 
+@app.on_event("startup")
+async def startup():
+    logger.info("CORS allowed origins: %s", settings.CORS_ORIGINS)
+    # Sync DB work runs in the threadpool, off the event loop thread
+    await run_in_threadpool(_seed_admin)
+
+    from app.services.http_clients import start_http_clients
+    start_http_clients()
+
+    from app.services.email import smtp_configured
+    from app.services.email_outbox import outbox_sender
+    if smtp_configured():
+        outbox_sender.start()
+
+    from app.services.verification_sweeper import verification_sweeper
+    verification_sweeper.start()
+    from app.services.boarding_archive import boarding_archiver
+    boarding_archiver.start()
+
+    from app.services.agreement_jobs import resume_agreement_jobs
+    resumed = await run_in_threadpool(resume_agreement_jobs)
+    if resumed:
+        logger.info("Resumed %d queued agreement job(s)", resumed)
+
+    from app.services.partner_deletion import resume_partner_deletions
+    resumed = await run_in_threadpool(resume_partner_deletions)
+    if resumed:
+        logger.info("Resumed %d partner deletion(s)", resumed)
+
+
 @app.on_event("shutdown")
 async def shutdown():
-    pass
+    from app.core.database import async_engine
+    from app.services.agreement_jobs import shutdown_agreement_executor
+    from app.services.email_outbox import outbox_sender
+    from app.services.partner_deletion import shutdown_partner_deletion_executor
+    outbox_sender.stop()
+    from app.services.verification_sweeper import verification_sweeper
+    verification_sweeper.stop()
+    from app.services.boarding_archive import boarding_archiver
+    boarding_archiver.stop()
+    shutdown_agreement_executor()
+    shutdown_partner_deletion_executor()
+    from app.services.boarding_notify import boarding_listener
+    await boarding_listener.stop()
+    from app.services.address_lookup import close_address_lookup
+    await close_address_lookup()
+    from app.services.http_clients import close_http_clients
+    await close_http_clients()
+    await async_engine.dispose()
@@ -13,6 +13,10 @@ from app.models.product_package import ProductPackage
 from app.models.product_package_item import ProductPackageItem
 from app.models.invite_device_detail import InviteDeviceDetail
 from app.models.fee_schedule import FeeSchedule
+from app.models.email_outbox import EmailOutbox
+from app.models.agreement_job import AgreementJob
+from app.models.partner_deletion import PartnerDeletion
+from app.models.boarding_archive import BoardingArchive
 
 __all__ = [
     "Base",
@@ -30,4 +34,8 @@ __all__ = [
     "ProductPackageItem",
     "InviteDeviceDetail",
     "FeeSchedule",
+    "EmailOutbox",
+    "AgreementJob",
+    "PartnerDeletion",
+    "BoardingArchive",
 ]
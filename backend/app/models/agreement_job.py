@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class AgreementJob(Base):
+    """Background agreement PDF generation (and DocuSign envelope creation) for one merchant."""
+
+    __tablename__ = "agreement_jobs"
+
+    id = Column(String(36), primary_key=True, index=True)
+    kind = Column(String(16), nullable=False)  # submit (PDF + DocuSign/completion), regenerate (PDF only)
+    invite_token = Column(String(64), nullable=False)
+    merchant_id = Column(String(36), ForeignKey("merchants.id"), nullable=False)
+    batch_id = Column(String(36), nullable=True, index=True)  # Bulk regeneration run this job belongs to
+    status = Column(String(16), nullable=False, default="queued")  # queued, running, succeeded, failed
+    agreement_pdf_path = Column(String(512), nullable=True)  # Relative to UPLOAD_DIR once generated
+    signing_url = Column(Text, nullable=True)  # DocuSign embedded signing URL (submit with DocuSign)
+    error = Column(String(1024), nullable=True)  # User-facing message when failed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_agreement_jobs_merchant_status", "merchant_id", "status"),
+        Index("ix_agreement_jobs_status_created", "status", "created_at"),
+        # At most one queued/running job per merchant and kind (concurrent submits can't create two envelopes)
+        Index(
+            "uq_agreement_jobs_active_merchant_kind",
+            "merchant_id",
+            "kind",
+            unique=True,
+            postgresql_where=status.in_(("queued", "running")),
+        ),
+    )
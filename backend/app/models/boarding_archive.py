@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, Integer, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class BoardingArchive(Base):
+    """Boarding that expired without being submitted, moved out of the live tables (see services.boarding_archive)."""
+
+    __tablename__ = "boarding_archive"
+
+    id = Column(String(36), primary_key=True)  # The boarding event's id
+    partner_id = Column(String(36), nullable=False)
+    merchant_id = Column(String(36), nullable=True)
+    status = Column(String(20), nullable=False, default="expired")  # Terminal status of the archived boarding
+    last_status = Column(String(20), nullable=False)  # Event status when archived (draft, in_progress, ...)
+    last_step = Column(Integer, nullable=True)
+    contact_email = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)  # Event creation
+    last_activity_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Snapshot of the rows removed: {"event": {...}, "contact": {...} | null, "invites": [...], "device_details": [...]}
+    data = Column(JSONB, nullable=False)
+
+    __table_args__ = (
+        Index("ix_boarding_archive_partner_created", "partner_id", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -66,3 +66,8 @@ class BoardingContact(Base):
     truelayer_verified = Column(Boolean(), nullable=True)
 
     boarding_event = relationship("BoardingEvent", back_populates="contact")
+
+    __table_args__ = (
+        # Login and email lookups compare lower(email)
+        Index("ix_boarding_contact_email_lower", func.lower(email)),
+    )
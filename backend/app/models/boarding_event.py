@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -37,3 +37,9 @@ class BoardingEvent(Base):
     merchant = relationship("Merchant", back_populates="boarding_events")
     invites = relationship("Invite", back_populates="boarding_event")
     contact = relationship("BoardingContact", back_populates="boarding_event", uselist=False)
+
+    # Partner event listing (GET /partners/boarding/events), newest first, with or without a status filter
+    __table_args__ = (
+        Index("ix_boarding_events_partner_status_created", "partner_id", "status", "created_at"),
+        Index("ix_boarding_events_partner_created_id", "partner_id", "created_at", "id"),
+    )
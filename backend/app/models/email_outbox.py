@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, DateTime, Integer, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class EmailOutbox(Base):
+    """Queued outbound email; rendered and sent by the background outbox sender."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(String(36), primary_key=True, index=True)
+    kind = Column(String(32), nullable=False)  # verification_code, save_for_later, completion
+    to_email = Column(String(255), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)  # builder kwargs (code, user_name, pdf_path, ...)
+    status = Column(String(16), nullable=False, default="pending")  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(String(1024), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
@@ -16,3 +16,5 @@ class FeeSchedule(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     partners = relationship("Partner", back_populates="fee_schedule")
+
+    __table_args__ = (Index("ix_fee_schedules_name_id", "name", "id"),)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -26,3 +26,9 @@ class Partner(Base):
     boarding_events = relationship("BoardingEvent", back_populates="partner")
     invites = relationship("Invite", back_populates="partner")
     product_packages = relationship("ProductPackage", back_populates="partner")
+
+    # Keyset pagination of the admin partner list (by name, optionally per is_active)
+    __table_args__ = (
+        Index("ix_partners_name_id", "name", "id"),
+        Index("ix_partners_active_name_id", "is_active", "name", "id"),
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, DateTime, Integer, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class PartnerDeletion(Base):
+    """Background deletion of a partner (ISV) and everything boarded under it, with progress."""
+
+    __tablename__ = "partner_deletions"
+
+    id = Column(String(36), primary_key=True, index=True)
+    partner_id = Column(String(36), nullable=False)  # No FK: the partner row is deleted last
+    partner_name = Column(String(255), nullable=True)
+    status = Column(String(16), nullable=False, default="queued")  # queued, running, succeeded, failed
+    phase = Column(String(64), nullable=True)  # Table currently being deleted
+    deleted = Column(JSONB, nullable=False, default=dict)  # Rows deleted so far per table
+    files_removed = Column(Integer, nullable=False, default=0)
+    error = Column(String(1024), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)  # Progress heartbeat (set after every chunk)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_partner_deletions_partner_status", "partner_id", "status"),
+        Index("ix_partner_deletions_status_updated", "status", "updated_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -26,3 +26,5 @@ class ProductPackage(Base):
         cascade="all, delete-orphan",
     )
     invites = relationship("Invite", back_populates="product_package")
+
+    __table_args__ = (Index("ix_product_packages_partner_created_id", "partner_id", "created_at", "id"),)
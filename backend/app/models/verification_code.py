@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import Column, String, DateTime, Index, Integer
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -14,3 +14,14 @@ class VerificationCode(Base):
     expires_at = Column(DateTime(timezone=True), nullable=False)
     used_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Code verification: newest unused codes for a contact/channel
+        Index(
+            "ix_verification_codes_open_contact_channel_created",
+            "contact",
+            "channel",
+            created_at.desc(),
+            postgresql_where=used_at.is_(None),
+        ),
+    )
@@ -2,28 +2,36 @@ import os
 import secrets
 import shutil
 import uuid
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.core.auth import get_current_admin
+from app.core.auth import get_current_admin, invalidate_admin, invalidate_partner
 from app.core.config import settings
-from app.core.deps import get_db
-from app.core.security import create_access_token, get_password_hash
+from app.core.deps import get_async_db, get_db
+from app.core.pagination import Page, filter_created, keyset, page_rows
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 from app.models.admin_user import AdminUser
-from app.models.boarding_contact import BoardingContact
-from app.models.boarding_event import BoardingEvent
-from app.models.invite import Invite
-from app.models.merchant import Merchant
-from app.models.merchant_user import MerchantUser
 from app.models.fee_schedule import FeeSchedule
 from app.models.partner import Partner
+from app.models.partner_deletion import PartnerDeletion
 from app.models.product_catalog import ProductCatalog
 from app.models.product_package import ProductPackage
 from app.models.product_package_item import ProductPackageItem
 from app.schemas.admin import (
+    AgreementRegenerationCreate,
+    AgreementRegenerationResponse,
     AdminChangePassword,
     AdminCreate,
     AdminLogin,
@@ -31,6 +39,7 @@ from app.schemas.admin import (
     AdminPartnerUpdate,
     AdminPartnerResponse,
     AdminUserResponse,
+    PartnerDeletionResponse,
     TokenResponse,
 )
 from app.schemas.fee_schedule import (
@@ -48,6 +57,8 @@ from app.schemas.product_package import (
     ProductPackageResponse,
     ProductPackageUpdate,
 )
+from app.services.agreement_regeneration import batch_progress, start_regeneration_batch
+from app.services.partner_deletion import create_partner_deletion, submit_partner_deletion
 
 router = APIRouter()
 
@@ -62,14 +73,19 @@ def _ensure_upload_dir():
 
 
 @router.post("/login", response_model=TokenResponse)
-def admin_login(body: AdminLogin, db: Session = Depends(get_db)):
+async def admin_login(body: AdminLogin, db: AsyncSession = Depends(get_async_db)):
     """Path Admin login. Initial account: Admin / keywee50."""
-    admin = db.query(AdminUser).filter(func.lower(AdminUser.username) == body.username.lower()).first()
+    result = await db.execute(
+        select(AdminUser).where(func.lower(AdminUser.username) == body.username.lower()).limit(1)
+    )
+    admin = result.scalar_one_or_none()
     if not admin:
         raise HTTPException(status_code=401, detail="Invalid username or password")
-    from app.core.security import verify_password
-    if not verify_password(body.password, admin.hashed_password):
+    if not await verify_password_async(body.password, admin.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid username or password")
+    if password_needs_rehash(admin.hashed_password):
+        admin.hashed_password = await get_password_hash_async(body.password)
+        await db.commit()
     token = create_access_token(subject=admin.id, extra_claims={"role": "admin"})
     return TokenResponse(access_token=token)
 
@@ -97,12 +113,20 @@ def create_admin_user(
 
 @router.get("/users", response_model=list[AdminUserResponse])
 def list_admin_users(
+    response: Response,
+    page: Page = Depends(),
+    username: Optional[str] = Query(None, description="Username prefix (case-insensitive)"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin),
 ):
-    """List all Path Admin users."""
-    admins = db.query(AdminUser).order_by(AdminUser.username).all()
-    return admins
+    """List Path Admin users by username (keyset-paginated)."""
+    q = filter_created(db.query(AdminUser), AdminUser.created_at, created_after, created_before)
+    if username:
+        q = q.filter(AdminUser.username.istartswith(username, autoescape=True))
+    order = (AdminUser.username,)  # unique
+    return page_rows(keyset(q, page, *order).all(), page, response, *order)
 
 
 @router.patch("/users/{admin_id}/password")
@@ -118,6 +142,7 @@ def change_admin_password(
         raise HTTPException(status_code=404, detail="Admin user not found")
     target.hashed_password = get_password_hash(body.new_password)
     db.commit()
+    invalidate_admin(admin_id)
     return {"ok": True, "message": "Password updated"}
 
 
@@ -134,12 +159,20 @@ def get_fee_schedule_schema(
 
 @router.get("/fee-schedules", response_model=list[FeeScheduleResponse])
 def list_fee_schedules(
+    response: Response,
+    page: Page = Depends(),
+    name: Optional[str] = Query(None, description="Name prefix (case-insensitive)"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin),
 ):
-    """List all fee schedules."""
-    schedules = db.query(FeeSchedule).order_by(FeeSchedule.name).all()
-    return schedules
+    """List fee schedules by name (keyset-paginated)."""
+    q = filter_created(db.query(FeeSchedule), FeeSchedule.created_at, created_after, created_before)
+    if name:
+        q = q.filter(FeeSchedule.name.istartswith(name, autoescape=True))
+    order = (FeeSchedule.name, FeeSchedule.id)
+    return page_rows(keyset(q, page, *order).all(), page, response, *order)
 
 
 @router.post("/fee-schedules", response_model=FeeScheduleResponse)
@@ -273,12 +306,23 @@ def setup_new_isv(
 
 @router.get("/partners", response_model=list[AdminPartnerResponse])
 def list_partners(
+    response: Response,
+    page: Page = Depends(),
+    name: Optional[str] = Query(None, description="Name prefix (case-insensitive)"),
+    is_active: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin),
 ):
-    """List all ISVs (partners)."""
-    partners = db.query(Partner).order_by(Partner.name).all()
-    return partners
+    """List ISVs (partners) by name (keyset-paginated)."""
+    q = filter_created(db.query(Partner), Partner.created_at, created_after, created_before)
+    if name:
+        q = q.filter(Partner.name.istartswith(name, autoescape=True))
+    if is_active is not None:
+        q = q.filter(Partner.is_active == is_active)
+    order = (Partner.name, Partner.id)
+    return page_rows(keyset(q, page, *order).all(), page, response, *order)
 
 
 @router.get("/partners/{partner_id}", response_model=AdminPartnerResponse)
@@ -328,6 +372,7 @@ def update_partner(
     if body.merchant_support_phone is not None:
         partner.merchant_support_phone = body.merchant_support_phone
     db.commit()
+    invalidate_partner(partner_id)
     db.refresh(partner)
     return partner
 
@@ -377,6 +422,7 @@ def update_partner_logo(
         f.write(content)
     partner.logo_url = f"/uploads/partners/{partner_id}{ext}"
     db.commit()
+    invalidate_partner(partner_id)
     db.refresh(partner)
     return partner
 
@@ -394,20 +440,62 @@ def delete_partner_logo(
     _delete_partner_logo_file(partner.logo_url or "")
     partner.logo_url = None
     db.commit()
+    invalidate_partner(partner_id)
     db.refresh(partner)
     return partner
 
 
+# --- Agreement regeneration ---
+
+
+@router.post("/agreement-regenerations", response_model=AgreementRegenerationResponse)
+def start_agreement_regeneration(
+    body: AgreementRegenerationCreate,
+    db: Session = Depends(get_db),
+    admin: AdminUser = Depends(get_current_admin),
+):
+    """Regenerate agreement PDFs for in-flight merchants (optionally one partner or fee schedule) in the background."""
+    if body.partner_id and not db.query(Partner.id).filter(Partner.id == body.partner_id).first():
+        raise HTTPException(status_code=404, detail="Partner not found")
+    if body.fee_schedule_id and not db.query(FeeSchedule.id).filter(FeeSchedule.id == body.fee_schedule_id).first():
+        raise HTTPException(status_code=404, detail="Fee schedule not found")
+    batch_id, _ = start_regeneration_batch(db, body.partner_id, body.fee_schedule_id)
+    return AgreementRegenerationResponse(batch_id=batch_id, **batch_progress(db, batch_id))
+
+
+@router.get("/agreement-regenerations/{batch_id}", response_model=AgreementRegenerationResponse)
+def get_agreement_regeneration(
+    batch_id: str,
+    db: Session = Depends(get_db),
+    admin: AdminUser = Depends(get_current_admin),
+):
+    """Progress of a regeneration batch (job counts by status)."""
+    progress = batch_progress(db, batch_id)
+    if not progress["total"]:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return AgreementRegenerationResponse(batch_id=batch_id, **progress)
+
+
 # --- Product Catalog (Admin read) ---
 
 
 @router.get("/product-catalog", response_model=list[ProductCatalogItem])
 def admin_list_product_catalog(
+    response: Response,
+    page: Page = Depends(),
+    product_type: Optional[str] = None,
+    name: Optional[str] = Query(None, description="Name prefix (case-insensitive)"),
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin),
 ):
-    """List all products in the global catalog."""
-    products = db.query(ProductCatalog).order_by(ProductCatalog.product_type, ProductCatalog.product_code).all()
+    """List products in the global catalog by type and code (keyset-paginated)."""
+    q = db.query(ProductCatalog)
+    if product_type:
+        q = q.filter(ProductCatalog.product_type == product_type)
+    if name:
+        q = q.filter(ProductCatalog.name.istartswith(name, autoescape=True))
+    order = (ProductCatalog.product_type, ProductCatalog.product_code)
+    products = page_rows(keyset(q, page, *order).all(), page, response, *order)
     return [
         ProductCatalogItem(
             id=p.id,
@@ -424,6 +512,13 @@ def admin_list_product_catalog(
 # --- Product Packages (Admin manages for any partner) ---
 
 
+def _admin_packages_query(db: Session):
+    """Packages with items and their catalog products eager-loaded."""
+    return db.query(ProductPackage).options(
+        selectinload(ProductPackage.items).joinedload(ProductPackageItem.catalog_product)
+    )
+
+
 def _admin_package_to_response(pkg: ProductPackage) -> ProductPackageResponse:
     items = []
     for it in pkg.items:
@@ -454,14 +549,24 @@ def _admin_package_to_response(pkg: ProductPackage) -> ProductPackageResponse:
 @router.get("/partners/{partner_id}/product-packages", response_model=list[ProductPackageResponse])
 def admin_list_product_packages(
     partner_id: str,
+    response: Response,
+    page: Page = Depends(),
+    name: Optional[str] = Query(None, description="Name prefix (case-insensitive)"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin),
 ):
-    """List product packages for a partner."""
+    """List product packages for a partner, newest first (keyset-paginated)."""
     partner = db.query(Partner).filter(Partner.id == partner_id).first()
     if not partner:
         raise HTTPException(status_code=404, detail="Partner not found")
-    packages = db.query(ProductPackage).filter(ProductPackage.partner_id == partner_id).order_by(ProductPackage.created_at.desc()).all()
+    q = _admin_packages_query(db).filter(ProductPackage.partner_id == partner_id)
+    q = filter_created(q, ProductPackage.created_at, created_after, created_before)
+    if name:
+        q = q.filter(ProductPackage.name.istartswith(name, autoescape=True))
+    order = (ProductPackage.created_at, ProductPackage.id)
+    packages = page_rows(keyset(q, page, *order, descending=True).all(), page, response, *order)
     return [_admin_package_to_response(p) for p in packages]
 
 
@@ -499,8 +604,7 @@ def admin_create_product_package(
             )
         )
     db.commit()
-    db.refresh(pkg)
-    return _admin_package_to_response(pkg)
+    return _admin_package_to_response(_admin_packages_query(db).filter(ProductPackage.id == pkg.id).one())
 
 
 @router.get("/partners/{partner_id}/product-packages/{package_id}", response_model=ProductPackageResponse)
@@ -511,7 +615,7 @@ def admin_get_product_package(
     admin: AdminUser = Depends(get_current_admin),
 ):
     """Get a product package by ID."""
-    pkg = db.query(ProductPackage).filter(ProductPackage.id == package_id, ProductPackage.partner_id == partner_id).first()
+    pkg = _admin_packages_query(db).filter(ProductPackage.id == package_id, ProductPackage.partner_id == partner_id).first()
     if not pkg:
         raise HTTPException(status_code=404, detail="Package not found")
     return _admin_package_to_response(pkg)
@@ -547,8 +651,7 @@ def admin_update_product_package(
                 )
             )
     db.commit()
-    db.refresh(pkg)
-    return _admin_package_to_response(pkg)
+    return _admin_package_to_response(_admin_packages_query(db).filter(ProductPackage.id == pkg.id).one())
 
 
 @router.delete("/partners/{partner_id}/product-packages/{package_id}", status_code=204)
@@ -566,29 +669,35 @@ def admin_delete_product_package(
     db.commit()
 
 
-@router.delete("/partners/{partner_id}")
+@router.delete("/partners/{partner_id}", status_code=202, response_model=PartnerDeletionResponse)
 def delete_partner(
     partner_id: str,
     db: Session = Depends(get_db),
     admin: AdminUser = Depends(get_current_admin),
 ):
-    """Delete an ISV (partner) and all associated data: invites, boarding events, contacts, merchants, merchant users."""
+    """
+    Delete an ISV (partner) and all associated data: invites, boarding events, contacts, merchants, merchant users,
+    product packages and agreement files. The partner is deactivated now and deleted in the background;
+    poll GET /admin/partner-deletions/{id} for progress.
+    """
     partner = db.query(Partner).filter(Partner.id == partner_id).first()
     if not partner:
         raise HTTPException(status_code=404, detail="Partner not found")
-
-    event_ids = [r.id for r in db.query(BoardingEvent.id).filter(BoardingEvent.partner_id == partner_id).all()]
-    merchant_ids = [r.id for r in db.query(Merchant.id).filter(Merchant.partner_id == partner_id).all()]
-
-    if event_ids:
-        db.query(BoardingContact).filter(BoardingContact.boarding_event_id.in_(event_ids)).delete(synchronize_session=False)
-    db.query(Invite).filter(Invite.partner_id == partner_id).delete(synchronize_session=False)
-    db.query(ProductPackage).filter(ProductPackage.partner_id == partner_id).delete(synchronize_session=False)
-    db.query(BoardingEvent).filter(BoardingEvent.partner_id == partner_id).update({BoardingEvent.merchant_id: None}, synchronize_session=False)
-    db.query(BoardingEvent).filter(BoardingEvent.partner_id == partner_id).delete(synchronize_session=False)
-    if merchant_ids:
-        db.query(MerchantUser).filter(MerchantUser.merchant_id.in_(merchant_ids)).delete(synchronize_session=False)
-    db.query(Merchant).filter(Merchant.partner_id == partner_id).delete(synchronize_session=False)
-    db.query(Partner).filter(Partner.id == partner_id).delete(synchronize_session=False)
+    job = create_partner_deletion(db, partner)
     db.commit()
-    return {"ok": True, "message": "Partner deleted"}
+    invalidate_partner(partner_id)
+    submit_partner_deletion(job.id)
+    return job
+
+
+@router.get("/partner-deletions/{deletion_id}", response_model=PartnerDeletionResponse)
+def get_partner_deletion(
+    deletion_id: str,
+    db: Session = Depends(get_db),
+    admin: AdminUser = Depends(get_current_admin),
+):
+    """Progress of a partner deletion (rows deleted per table so far)."""
+    job = db.query(PartnerDeletion).filter(PartnerDeletion.id == deletion_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Deletion not found")
+    return job
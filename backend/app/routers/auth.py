@@ -3,12 +3,17 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_partner
-from app.core.deps import get_db
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.deps import get_async_db
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
 from app.models.fee_schedule import FeeSchedule
 from app.models.partner import Partner
 from app.schemas.partner import PartnerCreate, PartnerLogin, PartnerResponse, TokenResponse
@@ -21,15 +26,19 @@ class PartnerMeResponse(BaseModel):
 
 
 @router.post("/partner/register", response_model=PartnerResponse)
-def partner_register(data: PartnerCreate, db: Session = Depends(get_db)):
+async def partner_register(data: PartnerCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new partner (ISV). Assigns the first available fee schedule (or Default)."""
-    existing = db.query(Partner).filter(func.lower(Partner.email) == data.email.lower()).first()
+    existing = (
+        await db.execute(select(Partner.id).where(func.lower(Partner.email) == data.email.lower()).limit(1))
+    ).first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    schedule = db.query(FeeSchedule).filter(FeeSchedule.name == "Default").first() or db.query(FeeSchedule).first()
+    schedule = (
+        await db.execute(select(FeeSchedule).where(FeeSchedule.name == "Default").limit(1))
+    ).scalar_one_or_none() or (await db.execute(select(FeeSchedule).limit(1))).scalar_one_or_none()
     if not schedule:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -39,21 +48,22 @@ def partner_register(data: PartnerCreate, db: Session = Depends(get_db)):
         id=str(uuid.uuid4()),
         name=data.name,
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=await get_password_hash_async(data.password),
         fee_schedule_id=schedule.id,
         is_active=True,
     )
     db.add(partner)
-    db.commit()
-    db.refresh(partner)
+    await db.commit()
+    await db.refresh(partner)
     return partner
 
 
 @router.post("/partner/login", response_model=TokenResponse)
-def partner_login(data: PartnerLogin, db: Session = Depends(get_db)):
+async def partner_login(data: PartnerLogin, db: AsyncSession = Depends(get_async_db)):
     """Login as partner; returns JWT access token."""
-    partner = db.query(Partner).filter(func.lower(Partner.email) == data.email.lower()).first()
-    if not partner or not verify_password(data.password, partner.hashed_password):
+    result = await db.execute(select(Partner).where(func.lower(Partner.email) == data.email.lower()).limit(1))
+    partner = result.scalar_one_or_none()
+    if not partner or not await verify_password_async(data.password, partner.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -63,6 +73,9 @@ def partner_login(data: PartnerLogin, db: Session = Depends(get_db)):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Partner account is inactive",
         )
+    if password_needs_rehash(partner.hashed_password):
+        partner.hashed_password = await get_password_hash_async(data.password)
+        await db.commit()
     # 24h expiry for partner sessions (wizard/config can take a while)
     token = create_access_token(subject=partner.id, expires_delta=timedelta(hours=24))
     return TokenResponse(access_token=token)
@@ -1,5 +1,5 @@
+import asyncio
 import logging
-import re
 import secrets
 import uuid
 from datetime import datetime, timedelta, timezone
@@ -7,24 +7,43 @@ from typing import Optional
 
 from pathlib import Path as PathLib
 
-import httpx
-from fastapi import APIRouter, Depends, Form, HTTPException, Query
-from fastapi.responses import FileResponse, RedirectResponse
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, Query, Request
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 logger = logging.getLogger(__name__)
 
 from app.core.config import settings
-from app.core.deps import get_db
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.database import AsyncSessionLocal
+from app.core.deps import get_async_db, get_db
+from app.core.invite_context import (
+    InviteContext,
+    get_invite_context,
+    get_invite_context_async,
+    get_open_invite_context,
+    load_invite_context,
+    load_invite_context_async,
+)
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.models.agreement_job import AgreementJob
 from app.models.boarding_contact import BoardingContact
 from app.models.boarding_event import BoardingEvent, BoardingStatus
 from app.models.invite import Invite
 from app.models.merchant import Merchant
 from app.models.merchant_user import MerchantUser
+from app.models.product_package import ProductPackage
+from app.models.product_package_item import ProductPackageItem
 from app.models.verification_code import VerificationCode
 from app.schemas.boarding import (
+    AgreementJobResponse,
+    BoardingStreamStatus,
     InviteInfoResponse,
     InviteInfoPartner,
     ProductPackageDisplay,
@@ -46,32 +65,32 @@ from app.schemas.boarding import (
     BoardingLoginResponse,
     SaveForLaterSubmit,
 )
-from app.services.email import send_verification_code_email, send_save_for_later_email
+from app.services.address_lookup import (
+    UK_POSTCODE_REGEX,
+    AddressLookupError,
+    lookup_uk_addresses,
+    normalise_uk_postcode,
+    uk_address_lookup_configured,
+)
+from app.services.agreement_jobs import create_agreement_job, submit_agreement_job
+from app.services.boarding_notify import boarding_listener, notify_boarding_change, notify_boarding_change_async
+from app.services.email_outbox import queue_email
 
 router = APIRouter()
 
 # 6-digit email code expiry (industry norm ~10–15 mins)
 VERIFY_CODE_EXPIRE_MINUTES = 15
+# Comment line sent on idle boarding status streams so proxies don't time them out
+STREAM_KEEPALIVE_SECONDS = 15
 
 
 @router.get("/saved-data")
-def get_saved_data(
-    token: str = Query(..., description="Invite token from boarding URL"),
-    db: Session = Depends(get_db),
-):
+async def get_saved_data(ctx: InviteContext = Depends(get_invite_context_async)):
     """
     Public: get saved boarding data for the contact (if any exists).
     Returns the saved personal details and current step so the frontend can pre-populate forms.
     """
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
-        raise HTTPException(status_code=404, detail="Invalid or expired link")
-    
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Invalid link")
-    
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
+    contact = ctx.contact
     if not contact:
         return {
             "has_data": False,
@@ -131,27 +150,34 @@ def get_saved_data(
 
 
 @router.get("/invite-info", response_model=InviteInfoResponse)
-def get_invite_info(
+async def get_invite_info(
     token: str = Query(..., description="Invite token from the boarding URL"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Public: get partner and merchant context for the boarding page.
     Returns 404 if token invalid or expired.
     """
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
+    ctx = await load_invite_context_async(
+        db,
+        token,
+        selectinload(Invite.product_package)
+        .selectinload(ProductPackage.items)
+        .joinedload(ProductPackageItem.catalog_product),
+        selectinload(Invite.device_details),
+    )
+    if not ctx:
         raise HTTPException(status_code=404, detail="Invalid or expired link")
-    if invite.used_at:
+    if ctx.is_used:
         raise HTTPException(status_code=404, detail="Link already used")
 
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
+    invite, event = ctx.invite, ctx.event
     if not event:
         raise HTTPException(status_code=404, detail="Invalid link")
     # Allow completed boardings to access mini portal even if invite expired
-    if event.status != BoardingStatus.completed and invite.expires_at and invite.expires_at < datetime.now(timezone.utc):
+    if event.status != BoardingStatus.completed and ctx.is_expired:
         raise HTTPException(status_code=404, detail="Link expired")
-    partner = invite.partner
+    partner = ctx.partner
     if not partner:
         raise HTTPException(status_code=404, detail="Invalid link")
 
@@ -219,31 +245,89 @@ def get_invite_info(
 
 
 @router.get("/verify-status", response_model=VerifyStatusResponse)
-def get_verify_status(
+async def get_verify_status(
     token: str = Query(..., description="Invite token from boarding URL"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Public: check if the contact for this invite has verified their email.
-    Used by the original tab to update when the user clicks the link in another tab.
+    Used by the original tab to update when the user clicks the link in another tab (GET /boarding/events pushes this instead).
     """
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite or invite.used_at or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
+    ctx = await load_invite_context_async(db, token)
+    if not ctx or not ctx.is_open or not ctx.contact:
         return VerifyStatusResponse(verified=False)
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        return VerifyStatusResponse(verified=False)
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
-    if not contact:
-        return VerifyStatusResponse(verified=False)
-    return VerifyStatusResponse(verified=contact.email_verified_at is not None)
+    return VerifyStatusResponse(verified=ctx.contact.email_verified_at is not None)
+
+
+async def _stream_status(token: str) -> Optional[BoardingStreamStatus]:
+    """Current state for the boarding status stream (own short session: streams outlive the request's). None if the link is closed."""
+    async with AsyncSessionLocal() as db:
+        ctx = await load_invite_context_async(db, token)
+    if not ctx or not ctx.is_open or not ctx.event:
+        return None
+    contact = ctx.contact
+    return BoardingStreamStatus(
+        verified=bool(contact and contact.email_verified_at),
+        current_step=contact.current_step if contact else None,
+        status=ctx.event.status.value if ctx.event.status else None,
+        sumsub_verification_status=contact.sumsub_verification_status if contact else None,
+        truelayer_verified=contact.truelayer_verified if contact else None,
+    )
+
+
+@router.get("/events")
+async def stream_boarding_status(
+    request: Request,
+    token: str = Query(..., description="Invite token from boarding URL"),
+):
+    """
+    Public: server-sent events replacing verify-status polling. Sends an initial "status" event, then one whenever
+    email verification, SumSub or TrueLayer state changes (from any tab or worker). Closes after
+    BOARDING_STREAM_MAX_SECONDS; EventSource reconnects.
+    """
+    async with AsyncSessionLocal() as db:
+        ctx = await load_invite_context_async(db, token)
+    if not ctx or not ctx.is_open or not ctx.event:
+        raise HTTPException(status_code=404, detail="Invalid or expired link")
+    event_id = ctx.event.id
+
+    async def events():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.BOARDING_STREAM_MAX_SECONDS
+        async with boarding_listener.subscribe(event_id) as changes:
+            yield f"retry: {STREAM_KEEPALIVE_SECONDS * 1000}\n\n"
+            last = None
+            while True:
+                status = await _stream_status(token)
+                if status is None:
+                    yield "event: closed\ndata: {}\n\n"
+                    return
+                data = status.model_dump_json()
+                if data != last:
+                    yield f"event: status\ndata: {data}\n\n"
+                    last = data
+                while True:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0 or await request.is_disconnected():
+                        return
+                    try:
+                        await asyncio.wait_for(changes.get(), timeout=min(STREAM_KEEPALIVE_SECONDS, remaining))
+                        break
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/step/1", response_model=Step1Response)
-def submit_step1(
+async def submit_step1(
     token: str = Query(..., description="Invite token"),
     body: Step1Submit = ...,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Public: submit step 1 (email, confirm email, password).
@@ -253,16 +337,15 @@ def submit_step1(
     if body.email != body.confirm_email:
         raise HTTPException(status_code=400, detail="Email and confirm email do not match")
 
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite or invite.used_at or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
+    ctx = await load_invite_context_async(db, token)
+    if not ctx or not ctx.is_open:
         raise HTTPException(status_code=404, detail="Invalid or expired link")
 
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
+    event = ctx.event
     if not event:
         raise HTTPException(status_code=404, detail="Invalid link")
 
-    existing = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
-    if existing:
+    if ctx.contact:
         raise HTTPException(status_code=400, detail="Step 1 already submitted for this link")
 
     # 6-digit code (industry-standard email verification)
@@ -281,18 +364,18 @@ def submit_step1(
         id=str(uuid.uuid4()),
         boarding_event_id=event.id,
         email=body.email,
-        hashed_password=get_password_hash(body.password),
+        hashed_password=await get_password_hash_async(body.password),
         current_step="verify",  # User needs to verify email next
         invite_token=token,  # Store token so user can resume later
     )
     db.add(contact)
     event.status = BoardingStatus.in_progress
     event.current_step = 1
-    db.commit()
-
-    logger.info("Sending verification code to %s (expires in %s min)", body.email, VERIFY_CODE_EXPIRE_MINUTES)
-    sent = send_verification_code_email(body.email, verify_code, VERIFY_CODE_EXPIRE_MINUTES)
-    logger.info("Step 1 done: email_sent=%s", sent)
+    queued = queue_email(
+        db.sync_session, "verification_code", body.email, code=verify_code, expire_minutes=VERIFY_CODE_EXPIRE_MINUTES
+    )
+    await db.commit()
+    logger.info("Step 1 done: verification code for %s queued=%s", body.email, queued)
 
     return Step1Response(
         sent=True,
@@ -327,6 +410,7 @@ def _do_email_verified_flow(
     db.add(merchant_user)
     event.merchant_id = merchant.id
     event.current_step = 2
+    notify_boarding_change(db, event.id, "email_verified")
     db.commit()
 
 
@@ -343,15 +427,13 @@ def verify_email_code(
     if len(code) != 6:
         raise HTTPException(status_code=400, detail="Please enter the 6-digit code from your email.")
 
-    invite = db.query(Invite).filter(Invite.token == invite_token).first()
-    if not invite or invite.used_at or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
+    ctx = load_invite_context(db, invite_token)
+    if not ctx or not ctx.is_open:
         raise HTTPException(status_code=404, detail="Invalid or expired link")
 
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
+    invite, event, contact = ctx.invite, ctx.event, ctx.contact
     if not event:
         raise HTTPException(status_code=404, detail="Invalid link")
-
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
     if not contact:
         raise HTTPException(status_code=400, detail="Complete step 1 first")
     if contact.email_verified_at:
@@ -373,7 +455,7 @@ def verify_email_code(
         raise HTTPException(status_code=400, detail="Invalid or expired code. Check the code and try again.")
 
     # One email = one merchant_user (unique constraint). If they already completed boarding with this email, return a clear error.
-    existing_user = db.query(MerchantUser).filter(MerchantUser.email == contact.email).first()
+    existing_user = db.query(MerchantUser.id).filter(MerchantUser.email == contact.email).first()
     if existing_user:
         raise HTTPException(
             status_code=400,
@@ -387,20 +469,14 @@ def verify_email_code(
 
 @router.post("/step/2", response_model=Step2Response)
 def submit_step2(
-    token: str = Query(..., description="Invite token"),
-    body: Step2Submit = ...,
+    body: Step2Submit,
+    ctx: InviteContext = Depends(get_open_invite_context),
     db: Session = Depends(get_db),
 ):
     """
     Public: persist step 2 personal details. Requires completed step 1 and email verification.
     """
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite or invite.used_at or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
-        raise HTTPException(status_code=404, detail="Invalid or expired link")
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Invalid link")
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
+    contact = ctx.contact
     if not contact:
         raise HTTPException(status_code=400, detail="Complete step 1 first.")
     if not contact.email_verified_at:
@@ -432,30 +508,22 @@ def submit_step2(
     contact.phone_country_code = body.phone_country_code.strip()
     contact.phone_number = body.phone_number.strip()
     contact.current_step = "step3"  # User can now proceed to identity verification
-    if event.merchant_id:
-        merchant = db.query(Merchant).filter(Merchant.id == event.merchant_id).first()
-        if merchant:
-            merchant.legal_name = f"{contact.legal_first_name} {contact.legal_last_name}".strip()
+    if ctx.merchant:
+        ctx.merchant.legal_name = f"{contact.legal_first_name} {contact.legal_last_name}".strip()
     db.commit()
     return Step2Response()
 
 
 @router.post("/step/6", response_model=Step6Response)
 def submit_step6(
-    token: str = Query(..., description="Invite token"),
-    body: Step6Submit = ...,
+    body: Step6Submit,
+    ctx: InviteContext = Depends(get_open_invite_context),
     db: Session = Depends(get_db),
 ):
     """
     Public: persist step 6 bank details. Requires completed step 5.
     """
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite or invite.used_at or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
-        raise HTTPException(status_code=404, detail="Invalid or expired link")
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Invalid link")
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
+    contact = ctx.contact
     if not contact:
         raise HTTPException(status_code=400, detail="Complete previous steps first.")
     contact.bank_account_name = body.bank_account_name.strip()
@@ -523,7 +591,7 @@ def test_clear_email(body: TestClearEmailSubmit, db: Session = Depends(get_db)):
     if merchant:
         db.delete(merchant)
     # Remove contact(s) for this email so the user can do step 1 again (same invite, new code)
-    contacts = db.query(BoardingContact).filter(BoardingContact.email == email).all()
+    contacts = db.query(BoardingContact).filter(func.lower(BoardingContact.email) == email).all()
     for c in contacts:
         db.query(BoardingEvent).filter(BoardingEvent.id == c.boarding_event_id).update(
             {BoardingEvent.current_step: 1}
@@ -534,114 +602,27 @@ def test_clear_email(body: TestClearEmailSubmit, db: Session = Depends(get_db)):
     return TestClearEmailResponse(cleared=True, message="Registration cleared. You can use this email again.")
 
 
-# UK postcode format for address lookup validation
-_UK_POSTCODE_REGEX = re.compile(r"^[A-Z]{1,2}[0-9][0-9A-Z]?\s?[0-9][A-Z]{2}$", re.IGNORECASE)
-
-
-def _normalise_uk_postcode(postcode: str) -> str:
-    """Uppercase and single space."""
-    s = postcode.strip().upper().replace(" ", "")
-    if len(s) >= 5:
-        # Insert space before last 3 chars (e.g. SW1A2AA -> SW1A 2AA)
-        s = s[:-3] + " " + s[-3:]
-    return s
-
-
-def _ideal_postcodes_uk_lookup(postcode: str, api_key: str) -> list:
-    """Call Ideal Postcodes API for UK; return list of { addressLine1, addressLine2, town, postcode }."""
-    # Postcode in path: space and case insensitive; we send normalised
-    url = f"https://api.ideal-postcodes.co.uk/v1/postcodes/{postcode}"
-    params = {"api_key": api_key}
-    with httpx.Client(timeout=10.0) as client:
-        resp = client.get(url, params=params)
-    if resp.status_code == 402:
-        try:
-            body = resp.json()
-            code = body.get("code")
-            if code == 4020:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Address lookup credit has run out. Please add credits or update the API key in settings.",
-                )
-            if code == 4021:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Address lookup limit reached for today. Please try again tomorrow or increase your limit.",
-                )
-        except HTTPException:
-            raise
-        except Exception:
-            pass
-        raise HTTPException(
-            status_code=503,
-            detail="Address lookup credit or limit reached. Please update the API key or add credits.",
-        )
-    if resp.status_code != 200:
-        try:
-            body = resp.json()
-            msg = body.get("message", resp.text[:200])
-        except Exception:
-            msg = resp.text[:200] or "Address lookup temporarily unavailable."
-        logger.warning("Ideal Postcodes returned %s: %s", resp.status_code, msg)
-        raise HTTPException(
-            status_code=503,
-            detail="Address lookup temporarily unavailable. Please enter your address manually.",
-        )
-    try:
-        data = resp.json()
-    except Exception as e:
-        logger.warning("Ideal Postcodes invalid JSON: %s", e)
-        raise HTTPException(
-            status_code=502,
-            detail="Could not load addresses. Please enter your address manually.",
-        ) from e
-    # Response: { "code": 2000, "result": [ { "line_1", "line_2", "post_town", "postcode", ... } ] }
-    results = data.get("result") if isinstance(data.get("result"), list) else []
-    out = []
-    for r in results:
-        if not isinstance(r, dict):
-            continue
-        line1 = (r.get("line_1") or "").strip()
-        line2 = (r.get("line_2") or "").strip()
-        town = (r.get("post_town") or r.get("town_or_city") or "").strip()
-        pc = (r.get("postcode") or "").strip() or postcode
-        if line1:
-            out.append({
-                "addressLine1": line1,
-                "addressLine2": line2,
-                "town": town,
-                "postcode": pc,
-            })
-    return out
-
-
 @router.get("/address-lookup")
-def address_lookup(
+async def address_lookup(
     postcode: str = Query(..., min_length=1, description="UK postcode"),
 ):
     """
-    Public: lookup UK addresses by postcode via Ideal Postcodes.
-    Returns a list of { addressLine1, addressLine2, town, postcode }.
-    If ADDRESS_LOOKUP_UK_API_KEY is not set or the API fails (e.g. credit depleted), returns 503 so the frontend can fall back to manual entry.
+    Public: lookup UK addresses by postcode via Ideal Postcodes (cached per postcode) or the local postcode index
+    (ADDRESS_LOOKUP_UK_BACKEND). Returns a list of { addressLine1, addressLine2, town, postcode }.
+    If the backend is not configured or fails (e.g. credit depleted), returns 503 so the frontend can fall back to manual entry.
     """
-    if not settings.ADDRESS_LOOKUP_UK_API_KEY:
+    if not uk_address_lookup_configured():
         raise HTTPException(
             status_code=503,
             detail="Address lookup not configured. Please enter your address manually.",
         )
-    normalised = _normalise_uk_postcode(postcode)
-    if not _UK_POSTCODE_REGEX.match(normalised):
+    normalised = normalise_uk_postcode(postcode)
+    if not UK_POSTCODE_REGEX.match(normalised):
         raise HTTPException(status_code=400, detail="Invalid UK postcode format.")
     try:
-        return _ideal_postcodes_uk_lookup(normalised, settings.ADDRESS_LOOKUP_UK_API_KEY)
-    except HTTPException:
-        raise
-    except httpx.RequestError as e:
-        logger.warning("Ideal Postcodes request failed: %s", e)
-        raise HTTPException(
-            status_code=502,
-            detail="Could not load addresses. Please enter your address manually.",
-        ) from e
+        return await lookup_uk_addresses(normalised)
+    except AddressLookupError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail) from e
 
 
 @router.get("/truelayer-auth-url")
@@ -656,13 +637,12 @@ def get_truelayer_auth_url(
     """
     if not settings.TRUELAYER_CLIENT_ID or not settings.TRUELAYER_CLIENT_SECRET:
         raise HTTPException(status_code=503, detail="Bank verification is not configured.")
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite or invite.used_at or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
+    ctx = load_invite_context(db, token)
+    if not ctx or not ctx.is_open:
         raise HTTPException(status_code=404, detail="Invalid or expired link")
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
+    if not ctx.event:
         raise HTTPException(status_code=404, detail="Invalid link")
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
+    contact = ctx.contact
     if not contact:
         raise HTTPException(status_code=400, detail="Complete previous steps first.")
     if not contact.bank_sort_code or not contact.bank_account_number:
@@ -678,10 +658,66 @@ def get_truelayer_auth_url(
         raise HTTPException(status_code=503, detail=str(e)) from e
 
 
-def _process_truelayer_callback(code: str, state: Optional[str], db: Session) -> RedirectResponse:
+def _save_truelayer_failure(contact: BoardingContact, message: str) -> None:
+    contact.truelayer_verified_at = datetime.now(timezone.utc)
+    contact.truelayer_verified = False
+    contact.truelayer_verification_message = message[:512]
+
+
+def _save_truelayer_result(contact: BoardingContact, result: dict) -> None:
+    contact.truelayer_verified_at = datetime.now(timezone.utc)
+    contact.truelayer_verified = result.get("verified")
+    contact.truelayer_account_match = result.get("account_match")
+    contact.truelayer_account_name_score = result.get("account_name_score")
+    contact.truelayer_director_score = result.get("director_score")
+    contact.truelayer_account_holder_names = (
+        ",".join(result.get("account_holder_names", []))[:512] if result.get("account_holder_names") else None
+    )
+    contact.truelayer_verification_message = (result.get("message") or "")[:512]
+
+
+def _truelayer_verification_args(contact: BoardingContact) -> dict:
+    """run_verification kwargs (except access_token) from the contact's saved details."""
+    return {
+        "user_bank_account_name": contact.bank_account_name or "",
+        "user_sort_code": contact.bank_sort_code,
+        "user_account_number": contact.bank_account_number,
+        "company_name": contact.company_name or "",
+        "director_first_name": contact.legal_first_name or "",
+        "director_last_name": contact.legal_last_name or "",
+    }
+
+
+async def _complete_truelayer_verification(contact_id: str, event_id: str, access_token: str, args: dict) -> None:
+    """Background: run verification after the callback redirected; the result reaches the page via GET /boarding/events."""
+    from app.services.truelayer_verification import run_verification
+
+    try:
+        result = await run_verification(access_token=access_token, **args)
+        error = None
+    except Exception as e:
+        logger.exception("TrueLayer verification failed: %s", e)
+        result, error = None, e
+    async with AsyncSessionLocal() as db:
+        contact = await db.get(BoardingContact, contact_id)
+        if contact is None:
+            return
+        if error is not None:
+            _save_truelayer_failure(contact, f"Verification failed: {str(error)}")
+        else:
+            _save_truelayer_result(contact, result)
+        await notify_boarding_change_async(db, event_id, "truelayer")
+        await db.commit()
+
+
+async def _process_truelayer_callback(
+    code: str, state: Optional[str], db: AsyncSession, background_tasks: BackgroundTasks
+) -> RedirectResponse:
     """
     Shared logic for TrueLayer callback (GET or POST).
     If state is missing, redirects to frontend with error.
+    With TRUELAYER_VERIFY_IN_BACKGROUND, redirects with bank_verified=pending once the code is exchanged and
+    finishes verification after the response.
     """
     from urllib.parse import quote
 
@@ -693,18 +729,10 @@ def _process_truelayer_callback(code: str, state: Optional[str], db: Session) ->
             status_code=302,
         )
     state = state.strip()
-    invite = db.query(Invite).filter(Invite.token == state).first()
-    if not invite or invite.used_at or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
-        frontend_base = settings.FRONTEND_BASE_URL.rstrip("/")
-        return RedirectResponse(url=f"{frontend_base}/board/{state}?error=invalid_link", status_code=302)
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        frontend_base = settings.FRONTEND_BASE_URL.rstrip("/")
-        return RedirectResponse(url=f"{frontend_base}/board/{state}?error=invalid_link", status_code=302)
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
-    if not contact:
-        frontend_base = settings.FRONTEND_BASE_URL.rstrip("/")
+    ctx = await load_invite_context_async(db, state)
+    if not ctx or not ctx.is_open or not ctx.event or not ctx.contact:
         return RedirectResponse(url=f"{frontend_base}/board/{state}?error=invalid_link", status_code=302)
+    contact = ctx.contact
 
     from app.services.truelayer_verification import (
         exchange_code_for_token,
@@ -712,55 +740,50 @@ def _process_truelayer_callback(code: str, state: Optional[str], db: Session) ->
     )
 
     try:
-        access_token = exchange_code_for_token(code)
+        access_token = await exchange_code_for_token(code)
     except Exception as e:
         logger.exception("TrueLayer token exchange failed: %s", e)
-        contact.truelayer_verified_at = datetime.now(timezone.utc)
-        contact.truelayer_verified = False
-        contact.truelayer_verification_message = (f"Token exchange failed: {str(e)}")[:512]
-        db.commit()
-        frontend_base = settings.FRONTEND_BASE_URL.rstrip("/")
+        _save_truelayer_failure(contact, f"Token exchange failed: {str(e)}")
+        await notify_boarding_change_async(db, ctx.event.id, "truelayer")
+        await db.commit()
         err_msg = str(e)[:100] if str(e) else "unknown"
         return RedirectResponse(
             url=f"{frontend_base}/board/{state}?step=step6&bank_verified=0&error=token_exchange&error_detail={quote(err_msg, safe='')}",
             status_code=302,
         )
 
-    try:
-        result = run_verification(
-            access_token=access_token,
-            user_bank_account_name=contact.bank_account_name or "",
-            user_sort_code=contact.bank_sort_code,
-            user_account_number=contact.bank_account_number,
-            company_name=contact.company_name or "",
-            director_first_name=contact.legal_first_name or "",
-            director_last_name=contact.legal_last_name or "",
+    if settings.TRUELAYER_VERIFY_IN_BACKGROUND:
+        # Clear any previous result so the page waits for this one
+        contact.truelayer_verified_at = None
+        contact.truelayer_verified = None
+        contact.truelayer_verification_message = None
+        await db.commit()
+        background_tasks.add_task(
+            _complete_truelayer_verification,
+            contact.id,
+            ctx.event.id,
+            access_token,
+            _truelayer_verification_args(contact),
         )
+        return RedirectResponse(url=f"{frontend_base}/board/{state}?step=step6&bank_verified=pending", status_code=302)
+
+    try:
+        result = await run_verification(access_token=access_token, **_truelayer_verification_args(contact))
     except Exception as e:
         logger.exception("TrueLayer verification failed: %s", e)
-        contact.truelayer_verified_at = datetime.now(timezone.utc)
-        contact.truelayer_verified = False
-        contact.truelayer_verification_message = (f"Verification failed: {str(e)}")[:512]
-        db.commit()
-        frontend_base = settings.FRONTEND_BASE_URL.rstrip("/")
+        _save_truelayer_failure(contact, f"Verification failed: {str(e)}")
+        await notify_boarding_change_async(db, ctx.event.id, "truelayer")
+        await db.commit()
         err_msg = str(e)[:100] if str(e) else "unknown"
         return RedirectResponse(
             url=f"{frontend_base}/board/{state}?step=step6&bank_verified=0&error=verification_failed&error_detail={quote(err_msg, safe='')}",
             status_code=302,
         )
 
-    contact.truelayer_verified_at = datetime.now(timezone.utc)
-    contact.truelayer_verified = result.get("verified")
-    contact.truelayer_account_match = result.get("account_match")
-    contact.truelayer_account_name_score = result.get("account_name_score")
-    contact.truelayer_director_score = result.get("director_score")
-    contact.truelayer_account_holder_names = (
-        ",".join(result.get("account_holder_names", []))[:512] if result.get("account_holder_names") else None
-    )
-    contact.truelayer_verification_message = (result.get("message") or "")[:512]
-    db.commit()
+    _save_truelayer_result(contact, result)
+    await notify_boarding_change_async(db, ctx.event.id, "truelayer")
+    await db.commit()
 
-    frontend_base = settings.FRONTEND_BASE_URL.rstrip("/")
     verified = 1 if result.get("verified") else 0
     msg = result.get("message", "")
     redirect_url = f"{frontend_base}/board/{state}?step=step6&bank_verified={verified}"
@@ -770,50 +793,44 @@ def _process_truelayer_callback(code: str, state: Optional[str], db: Session) ->
 
 
 @router.get("/truelayer-callback")
-def truelayer_callback_get(
+async def truelayer_callback_get(
+    background_tasks: BackgroundTasks,
     code: str = Query(..., description="Authorization code from TrueLayer"),
     state: Optional[str] = Query(None, description="Invite token (state) - required for session"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Callback from TrueLayer after user connects their bank (GET redirect).
     Exchanges code for token, runs verification, saves result, redirects to frontend.
     """
-    return _process_truelayer_callback(code, state, db)
+    return await _process_truelayer_callback(code, state, db, background_tasks)
 
 
 @router.post("/truelayer-callback")
-def truelayer_callback_post(
+async def truelayer_callback_post(
+    background_tasks: BackgroundTasks,
     code: str = Form(..., description="Authorization code from TrueLayer"),
     state: Optional[str] = Form(None, description="Invite token (state) - required for session"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Callback from TrueLayer when response_mode=form_post is used.
     Same logic as GET; params come from form body instead of query.
     """
-    return _process_truelayer_callback(code, state, db)
+    return await _process_truelayer_callback(code, state, db, background_tasks)
 
 
 @router.post("/save-for-later")
 def save_for_later(
-    token: str = Query(..., description="Invite token"),
-    body: SaveForLaterSubmit = ...,
+    body: SaveForLaterSubmit,
+    ctx: InviteContext = Depends(get_invite_context),
     db: Session = Depends(get_db),
 ):
     """
     Public: save progress and send 'save for later' email to the user.
     Accepts current_step and step5 business details to persist before sending email.
     """
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
-        raise HTTPException(status_code=404, detail="Invalid or expired link")
-    
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Invalid link")
-    
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
+    contact = ctx.contact
     if not contact:
         raise HTTPException(status_code=400, detail="No account found. Please create an account first.")
     
@@ -860,15 +877,15 @@ def save_for_later(
         contact.company_incorporation_date = body.company_incorporation_date
     if body.company_industry_sic is not None:
         contact.company_industry_sic = body.company_industry_sic
-    db.commit()
-    
+
     # Get user's name for personalization
     user_name = contact.legal_first_name or "there"
-    
-    # Send email
-    sent = send_save_for_later_email(contact.email, user_name)
-    
-    if not sent:
+
+    # Queue email in the same transaction as the saved progress
+    queued = queue_email(db, "save_for_later", contact.email, user_name=user_name)
+    db.commit()
+
+    if not queued:
         raise HTTPException(
             status_code=500,
             detail="Failed to send email. Please check SMTP configuration."
@@ -882,25 +899,16 @@ def save_for_later(
 
 @router.post("/sumsub/generate-token", response_model=SumsubTokenResponse)
 async def generate_sumsub_token(
-    token: str = Query(..., description="Invite token"),
-    db: Session = Depends(get_db),
+    ctx: InviteContext = Depends(get_invite_context_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Public: Generate SumSub access token for identity verification.
     Uses the boarding_event_id as the SumSub user_id.
     """
     from app.services.sumsub import generate_access_token
-    
-    # Verify the invite token
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
-        raise HTTPException(status_code=404, detail="Invalid or expired link")
-    
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Invalid link")
-    
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
+
+    event, contact = ctx.event, ctx.contact
     if not contact:
         raise HTTPException(status_code=400, detail="No account found. Please create an account first.")
     
@@ -929,7 +937,7 @@ async def generate_sumsub_token(
         # Store the applicant ID in the database
         contact.sumsub_applicant_id = sumsub_user_id
         contact.sumsub_verification_status = "pending"
-        db.commit()
+        await db.commit()
         
         logger.info(f"Successfully generated SumSub token for user_id={sumsub_user_id}")
         return SumsubTokenResponse(
@@ -952,24 +960,15 @@ async def generate_sumsub_token(
 
 @router.post("/sumsub/complete")
 async def complete_sumsub_verification(
-    token: str = Query(..., description="Invite token"),
     status: str = Query(..., description="Verification status: completed or rejected"),
-    db: Session = Depends(get_db),
+    ctx: InviteContext = Depends(get_invite_context_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Public: Mark SumSub verification as complete.
     Called from frontend after user completes verification flow.
     """
-    # Verify the invite token
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
-        raise HTTPException(status_code=404, detail="Invalid or expired link")
-    
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Invalid link")
-    
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
+    contact = ctx.contact
     if not contact:
         raise HTTPException(status_code=400, detail="No account found.")
     
@@ -977,8 +976,8 @@ async def complete_sumsub_verification(
     contact.sumsub_verification_status = status
     if status == "completed":
         contact.current_step = "step4"  # Move to next step (business info)
-    
-    db.commit()
+    await notify_boarding_change_async(db, ctx.event.id, "sumsub")
+    await db.commit()
     
     return {
         "success": True,
@@ -998,20 +997,12 @@ def docusign_callback(
     Marks boarding complete, downloads signed PDF, sends completion email, redirects to done page.
     """
     token = state
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
+    ctx = load_invite_context(db, token)
+    if not ctx or not ctx.event or not ctx.merchant or not ctx.contact:
         # Redirect to frontend with error
         frontend_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}?error=invalid_link"
         return RedirectResponse(url=frontend_url, status_code=302)
-    event_obj = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event_obj or not event_obj.merchant_id:
-        frontend_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}?error=invalid_link"
-        return RedirectResponse(url=frontend_url, status_code=302)
-    merchant = db.query(Merchant).filter(Merchant.id == event_obj.merchant_id).first()
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event_obj.id).first()
-    if not merchant or not contact:
-        frontend_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}?error=invalid_link"
-        return RedirectResponse(url=frontend_url, status_code=302)
+    event_obj, merchant, contact = ctx.event, ctx.merchant, ctx.contact
 
     # Already completed – just redirect to done page
     if event_obj.status == BoardingStatus.completed:
@@ -1028,19 +1019,19 @@ def docusign_callback(
         event_obj.status = BoardingStatus.completed
         event_obj.completed_at = datetime.now(timezone.utc)
         contact.current_step = "done"
-        db.commit()
         pdf_path = upload_dir / (merchant.agreement_pdf_path or "")
-        if pdf_path.exists():
-            from app.services.email import send_completion_email
-
+        if merchant.agreement_pdf_path and pdf_path.exists():
             portal_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}"
             merchant_name = f"{(contact.legal_first_name or '').strip()} {(contact.legal_last_name or '').strip()}".strip() or (contact.email or "Merchant")
-            send_completion_email(
-                to_email=contact.email,
+            queue_email(
+                db,
+                "completion",
+                contact.email,
                 merchant_name=merchant_name,
                 portal_url=portal_url,
                 pdf_path=str(pdf_path),
             )
+        db.commit()
         return RedirectResponse(
             url=f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}",
             status_code=302,
@@ -1074,19 +1065,19 @@ def docusign_callback(
     event_obj.status = BoardingStatus.completed
     event_obj.completed_at = datetime.now(timezone.utc)
     contact.current_step = "done"
-    db.commit()
 
     if pdf_for_email and PathLib(pdf_for_email).exists():
-        from app.services.email import send_completion_email
-
         portal_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}"
         merchant_name = f"{(contact.legal_first_name or '').strip()} {(contact.legal_last_name or '').strip()}".strip() or (contact.email or "Merchant")
-        send_completion_email(
-            to_email=contact.email,
+        queue_email(
+            db,
+            "completion",
+            contact.email,
             merchant_name=merchant_name,
             portal_url=portal_url,
             pdf_path=pdf_for_email,
         )
+    db.commit()
 
     return RedirectResponse(
         url=f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}",
@@ -1100,24 +1091,20 @@ def submit_review(
     db: Session = Depends(get_db),
 ):
     """
-    Public: Generate agreement PDF, store against merchant, and complete boarding.
-    Requires completed step6 (bank details). Creates the PDF and saves path to merchant.
+    Public: Queue agreement PDF generation and completion of boarding.
+    Requires completed step6 (bank details). Returns a job_id; poll /boarding/agreement-job/{job_id}
+    for the agreement path and (with DocuSign) the signing URL.
     """
-    from app.services.agreement_pdf import generate_agreement_pdf
-    from app.models.fee_schedule import FeeSchedule
-
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite or invite.used_at:
+    ctx = load_invite_context(db, token)
+    if not ctx or ctx.is_used:
         raise HTTPException(status_code=404, detail="Invalid or expired link")
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
+    event, contact, merchant = ctx.event, ctx.contact, ctx.merchant
     if not event:
         raise HTTPException(status_code=404, detail="Invalid link")
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
     if not contact:
         raise HTTPException(status_code=400, detail="Complete previous steps first.")
     if not event.merchant_id:
         raise HTTPException(status_code=400, detail="Merchant not found. Please complete account setup.")
-    merchant = db.query(Merchant).filter(Merchant.id == event.merchant_id).first()
     if not merchant:
         raise HTTPException(status_code=400, detail="Merchant not found.")
 
@@ -1125,116 +1112,13 @@ def submit_review(
     if event.status == BoardingStatus.completed and merchant.agreement_pdf_path:
         return SubmitReviewResponse(success=True, agreement_pdf_path=merchant.agreement_pdf_path)
 
-    # Ensure agreements directory exists
-    upload_dir = PathLib(settings.UPLOAD_DIR)
-    agreements_dir = upload_dir / "agreements"
-    agreements_dir.mkdir(parents=True, exist_ok=True)
-    pdf_filename = f"agreement-{merchant.id}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}.pdf"
-    pdf_path = agreements_dir / pdf_filename
+    if settings.DOCUSIGN_INTEGRATION_KEY and settings.DOCUSIGN_USER_ID and not contact.email:
+        raise HTTPException(status_code=400, detail="Email required for e-signature.")
 
-    # Build product package with items (like invite-info)
-    product_package = None
-    if invite.product_package_id and invite.product_package:
-        pkg = invite.product_package
-        item_by_id = {it.id: it for it in pkg.items}
-        dd_by_item = {}
-        for dd in invite.device_details:
-            dd_by_item.setdefault(dd.package_item_id, []).append(dd)
-        items = []
-        for idx, dd in enumerate(invite.device_details):
-            it = item_by_id.get(dd.package_item_id)
-            if not it:
-                continue
-            cat = it.catalog_product
-            items.append({"catalog_product": cat, "config": it.config, "product_name": cat.name if cat else ""})
-        for it in pkg.items:
-            if it.id in dd_by_item:
-                continue
-            cat = it.catalog_product
-            items.append({"catalog_product": cat, "config": it.config, "product_name": cat.name if cat else ""})
-        product_package = type("ProductPackage", (), {"items": items})()
-
-    # Fee schedule from partner
-    fee_schedule = None
-    if invite.partner and invite.partner.fee_schedule_id:
-        fee_schedule = db.query(FeeSchedule).filter(FeeSchedule.id == invite.partner.fee_schedule_id).first()
-
-    try:
-        generate_agreement_pdf(
-            output_path=str(pdf_path),
-            contact=contact,
-            merchant=merchant,
-            invite=invite,
-            product_package=product_package,
-            fee_schedule=fee_schedule,
-        )
-    except Exception as e:
-        logger.exception("Failed to generate agreement PDF: %s", e)
-        raise HTTPException(status_code=500, detail="Failed to generate agreement. Please try again.")
-
-    # Store relative path for portability
-    relative_path = f"agreements/{pdf_filename}"
-    merchant.agreement_pdf_path = relative_path
-
-    # DocuSign: create envelope and return signing URL (don't complete yet)
-    if settings.DOCUSIGN_INTEGRATION_KEY and settings.DOCUSIGN_USER_ID:
-        try:
-            from app.services.docusign_signing import create_envelope_and_get_signing_url
-
-            return_url_base = settings.DOCUSIGN_RETURN_URL_BASE.rstrip("/")
-            return_url = f"{return_url_base}/boarding/docusign-callback?state={token}"
-            signer_email = contact.email or ""
-            signer_name = f"{(contact.legal_first_name or '').strip()} {(contact.legal_last_name or '').strip()}".strip() or "Signer"
-            if not signer_email:
-                raise HTTPException(status_code=400, detail="Email required for e-signature.")
-            backend_root = PathLib(__file__).resolve().parent.parent.parent
-            services_path = backend_root / settings.SERVICES_AGREEMENT_PATH
-            envelope_id, signing_url = create_envelope_and_get_signing_url(
-                pdf_path=str(pdf_path),
-                signer_email=signer_email,
-                signer_name=signer_name,
-                return_url=return_url,
-                services_agreement_path=str(services_path) if services_path.exists() else None,
-            )
-            merchant.docusign_envelope_id = envelope_id
-            contact.current_step = "step6"  # Keep at review until signed
-            db.commit()
-            return SubmitReviewResponse(
-                success=True,
-                agreement_pdf_path=relative_path,
-                redirect_to_signing=True,
-                signing_url=signing_url,
-            )
-        except ValueError as e:
-            logger.warning("DocuSign setup issue: %s. Completing without e-sign.", e)
-            # Fall through to non-DocuSign flow
-        except Exception as e:
-            logger.exception("DocuSign envelope creation failed: %s", e)
-            err_msg = str(e)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to create signing session: {err_msg}",
-            )
-
-    # Non-DocuSign flow: mark completed and send email
-    contact.current_step = "done"
-    event.status = BoardingStatus.completed
-    event.completed_at = datetime.now(timezone.utc)
+    job = create_agreement_job(db, "submit", ctx)
     db.commit()
-
-    # Send completion email with attachments
-    from app.services.email import send_completion_email
-
-    portal_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{token}"
-    merchant_name = f"{(contact.legal_first_name or '').strip()} {(contact.legal_last_name or '').strip()}".strip() or (contact.email or "Merchant")
-    send_completion_email(
-        to_email=contact.email,
-        merchant_name=merchant_name,
-        portal_url=portal_url,
-        pdf_path=str(pdf_path),
-    )
-
-    return SubmitReviewResponse(success=True, agreement_pdf_path=relative_path)
+    submit_agreement_job(job.id)
+    return SubmitReviewResponse(success=True, job_id=job.id, job_status=job.status)
 
 
 @router.post("/regenerate-agreement", response_model=SubmitReviewResponse)
@@ -1243,76 +1127,49 @@ def regenerate_agreement(
     db: Session = Depends(get_db),
 ):
     """
-    Regenerate the merchant agreement PDF from current data.
+    Queue regeneration of the merchant agreement PDF from current data.
     For testing/iteration on the PDF template. Works for any boarding with a merchant.
     """
-    from app.services.agreement_pdf import generate_agreement_pdf
-    from app.models.fee_schedule import FeeSchedule
-
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite or (invite.expires_at and invite.expires_at < datetime.now(timezone.utc)):
+    ctx = load_invite_context(db, token)
+    if not ctx or ctx.is_expired:
         raise HTTPException(status_code=404, detail="Invalid or expired link")
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
+    event, contact, merchant = ctx.event, ctx.contact, ctx.merchant
     if not event:
         raise HTTPException(status_code=404, detail="Invalid link")
-    contact = db.query(BoardingContact).filter(BoardingContact.boarding_event_id == event.id).first()
     if not contact:
         raise HTTPException(status_code=400, detail="Complete previous steps first.")
     if not event.merchant_id:
         raise HTTPException(status_code=400, detail="Merchant not found. Please complete account setup.")
-    merchant = db.query(Merchant).filter(Merchant.id == event.merchant_id).first()
     if not merchant:
         raise HTTPException(status_code=400, detail="Merchant not found.")
 
-    upload_dir = PathLib(settings.UPLOAD_DIR)
-    agreements_dir = upload_dir / "agreements"
-    agreements_dir.mkdir(parents=True, exist_ok=True)
-    pdf_filename = f"agreement-{merchant.id}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}.pdf"
-    pdf_path = agreements_dir / pdf_filename
-
-    product_package = None
-    if invite.product_package_id and invite.product_package:
-        pkg = invite.product_package
-        item_by_id = {it.id: it for it in pkg.items}
-        dd_by_item = {}
-        for dd in invite.device_details:
-            dd_by_item.setdefault(dd.package_item_id, []).append(dd)
-        items = []
-        for idx, dd in enumerate(invite.device_details):
-            it = item_by_id.get(dd.package_item_id)
-            if not it:
-                continue
-            cat = it.catalog_product
-            items.append({"catalog_product": cat, "config": it.config, "product_name": cat.name if cat else ""})
-        for it in pkg.items:
-            if it.id in dd_by_item:
-                continue
-            cat = it.catalog_product
-            items.append({"catalog_product": cat, "config": it.config, "product_name": cat.name if cat else ""})
-        product_package = type("ProductPackage", (), {"items": items})()
-
-    fee_schedule = None
-    if invite.partner and invite.partner.fee_schedule_id:
-        fee_schedule = db.query(FeeSchedule).filter(FeeSchedule.id == invite.partner.fee_schedule_id).first()
-
-    try:
-        generate_agreement_pdf(
-            output_path=str(pdf_path),
-            contact=contact,
-            merchant=merchant,
-            invite=invite,
-            product_package=product_package,
-            fee_schedule=fee_schedule,
-        )
-    except Exception as e:
-        logger.exception("Failed to regenerate agreement PDF: %s", e)
-        raise HTTPException(status_code=500, detail="Failed to regenerate agreement. Please try again.")
-
-    relative_path = f"agreements/{pdf_filename}"
-    merchant.agreement_pdf_path = relative_path
+    job = create_agreement_job(db, "regenerate", ctx)
     db.commit()
+    submit_agreement_job(job.id)
+    return SubmitReviewResponse(success=True, job_id=job.id, job_status=job.status)
 
-    return SubmitReviewResponse(success=True, agreement_pdf_path=relative_path)
+
+@router.get("/agreement-job/{job_id}", response_model=AgreementJobResponse)
+async def get_agreement_job(
+    job_id: str,
+    token: str = Query(..., description="Invite token the job was created with"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Status of a queued agreement job. signing_url is set once a DocuSign envelope is ready."""
+    result = await db.execute(
+        select(AgreementJob).where(AgreementJob.id == job_id, AgreementJob.invite_token == token)
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return AgreementJobResponse(
+        job_id=job.id,
+        status=job.status,
+        agreement_pdf_path=job.agreement_pdf_path,
+        redirect_to_signing=job.status == "succeeded" and bool(job.signing_url),
+        signing_url=job.signing_url if job.status == "succeeded" else None,
+        error=job.error if job.status == "failed" else None,
+    )
 
 
 @router.get("/blank-agreement-pdf")
@@ -1366,13 +1223,10 @@ def get_agreement_pdf(
     Serves the signed PDF (with DocuSign e-sign info) when available, otherwise the unsigned PDF.
     Requires a valid invite token for a completed boarding.
     """
-    invite = db.query(Invite).filter(Invite.token == token).first()
-    if not invite:
+    ctx = load_invite_context(db, token)
+    if not ctx:
         raise HTTPException(status_code=404, detail="Invalid or expired link")
-    event = db.query(BoardingEvent).filter(BoardingEvent.id == invite.boarding_event_id).first()
-    if not event or not event.merchant_id:
-        raise HTTPException(status_code=404, detail="Agreement not found")
-    merchant = db.query(Merchant).filter(Merchant.id == event.merchant_id).first()
+    merchant = ctx.merchant
     if not merchant:
         raise HTTPException(status_code=404, detail="Agreement not found")
     # Prefer signed PDF (with DocuSign e-sign info) when available
@@ -1390,26 +1244,33 @@ def get_agreement_pdf(
 
 
 @router.post("/login", response_model=BoardingLoginResponse)
-def boarding_login(
+async def boarding_login(
     body: BoardingLoginSubmit,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Merchant boarding login: verify email/password and return JWT token.
     Returns the user's current step so the frontend can navigate them to where they left off.
     """
     # Find boarding contact by email
-    contact = db.query(BoardingContact).filter(func.lower(BoardingContact.email) == body.email.lower()).first()
+    result = await db.execute(
+        select(BoardingContact).where(func.lower(BoardingContact.email) == body.email.lower()).limit(1)
+    )
+    contact = result.scalar_one_or_none()
     if not contact:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Verify password
-    if not verify_password(body.password, contact.hashed_password):
+    if not await verify_password_async(body.password, contact.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Check if email is verified
     if not contact.email_verified_at:
         raise HTTPException(status_code=403, detail="Please verify your email first")
+
+    if password_needs_rehash(contact.hashed_password):
+        contact.hashed_password = await get_password_hash_async(body.password)
+        await db.commit()
     
     # Create JWT token with boarding_event_id as subject
     access_token = create_access_token(
@@ -1,17 +1,20 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.core.deps import get_db
+from app.core.auth import get_current_admin
+from app.core.database import pool_metrics
+from app.core.deps import get_async_db
+from app.models.admin_user import AdminUser
 
 router = APIRouter()
 
 
 @router.get("")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Health check; includes DB connectivity."""
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         db_ok = True
     except Exception:
         db_ok = False
@@ -19,3 +22,9 @@ async def health_check(db: Session = Depends(get_db)):
         "status": "ok",
         "database": "connected" if db_ok else "disconnected",
     }
+
+
+@router.get("/db-pool")
+def db_pool_status(admin: AdminUser = Depends(get_current_admin)):
+    """Admin: connection pool state (checked out, overflow), checkout wait times and failures per engine."""
+    return pool_metrics()
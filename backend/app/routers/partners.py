@@ -1,13 +1,17 @@
 import secrets
 import uuid
 from datetime import datetime, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.auth import get_current_partner
 from app.core.config import settings
-from app.core.deps import get_db
+from app.core.deps import get_async_db, get_db
+from app.core.pagination import Page, filter_created, keyset, page_rows
 from app.models.boarding_event import BoardingEvent, BoardingStatus
 from app.models.invite import Invite
 from app.models.partner import Partner
@@ -15,7 +19,7 @@ from app.models.product_catalog import ProductCatalog
 from app.models.product_package import ProductPackage
 from app.models.product_package_item import ProductPackageItem
 from app.models.invite_device_detail import InviteDeviceDetail
-from app.schemas.invite import InviteCreate, InviteResponse
+from app.schemas.invite import BoardingEventSummary, InviteCreate, InviteResponse
 from app.schemas.product_catalog import ProductCatalogItem
 from app.schemas.product_package import (
     PackageItemCreate,
@@ -78,40 +82,21 @@ def list_product_catalog(
 
 @router.get("/product-packages", response_model=list[ProductPackageResponse])
 def list_product_packages(
+    response: Response,
+    page: Page = Depends(),
+    name: Optional[str] = Query(None, description="Name prefix (case-insensitive)"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
     db: Session = Depends(get_db),
     partner: Partner = Depends(get_current_partner),
 ):
-    """List product packages for the current partner."""
-    packages = db.query(ProductPackage).filter(ProductPackage.partner_id == partner.id).order_by(ProductPackage.created_at.desc()).all()
-    result = []
-    for pkg in packages:
-        items = []
-        for it in pkg.items:
-            cat = it.catalog_product
-            items.append(
-                PackageItemResponse(
-                    id=it.id,
-                    catalog_product_id=it.catalog_product_id,
-                    product_code=cat.product_code if cat else None,
-                    product_name=cat.name if cat else None,
-                    product_type=cat.product_type if cat else None,
-                    config=it.config,
-                    sort_order=it.sort_order,
-                    requires_store_epos=cat.requires_store_epos if cat else False,
-                )
-            )
-        result.append(
-            ProductPackageResponse(
-                id=pkg.id,
-                partner_id=pkg.partner_id,
-                uid=pkg.uid,
-                name=pkg.name,
-                description=pkg.description,
-                items=items,
-                created_at=pkg.created_at.isoformat() if pkg.created_at else None,
-            )
-        )
-    return result
+    """List product packages for the current partner, newest first (keyset-paginated)."""
+    q = filter_created(_packages_query(db).filter(ProductPackage.partner_id == partner.id), ProductPackage.created_at, created_after, created_before)
+    if name:
+        q = q.filter(ProductPackage.name.istartswith(name, autoescape=True))
+    order = (ProductPackage.created_at, ProductPackage.id)
+    packages = page_rows(keyset(q, page, *order, descending=True).all(), page, response, *order)
+    return [_package_to_response(pkg) for pkg in packages]
 
 
 @router.post("/product-packages", response_model=ProductPackageResponse)
@@ -146,8 +131,7 @@ def create_product_package(
             )
         )
     db.commit()
-    db.refresh(pkg)
-    return _package_to_response(pkg)
+    return _package_to_response(_packages_query(db).filter(ProductPackage.id == pkg.id).one())
 
 
 @router.get("/product-packages/{package_id}", response_model=ProductPackageResponse)
@@ -157,7 +141,7 @@ def get_product_package(
     partner: Partner = Depends(get_current_partner),
 ):
     """Get a product package by ID."""
-    pkg = db.query(ProductPackage).filter(ProductPackage.id == package_id, ProductPackage.partner_id == partner.id).first()
+    pkg = _packages_query(db).filter(ProductPackage.id == package_id, ProductPackage.partner_id == partner.id).first()
     if not pkg:
         raise HTTPException(status_code=404, detail="Package not found")
     return _package_to_response(pkg)
@@ -193,8 +177,7 @@ def update_product_package(
                 )
             )
     db.commit()
-    db.refresh(pkg)
-    return _package_to_response(pkg)
+    return _package_to_response(_packages_query(db).filter(ProductPackage.id == pkg.id).one())
 
 
 @router.delete("/product-packages/{package_id}", status_code=204)
@@ -211,6 +194,13 @@ def delete_product_package(
     db.commit()
 
 
+def _packages_query(db: Session):
+    """Packages with items and their catalog products eager-loaded (2 queries for any number of packages and items)."""
+    return db.query(ProductPackage).options(
+        selectinload(ProductPackage.items).joinedload(ProductPackageItem.catalog_product)
+    )
+
+
 def _package_to_response(pkg: ProductPackage) -> ProductPackageResponse:
     items = []
     for it in pkg.items:
@@ -337,3 +327,46 @@ def create_invite(
         boarding_event_id=event_id,
         token=token,
     )
+
+
+@router.get("/boarding/events", response_model=list[BoardingEventSummary])
+async def list_boarding_events(
+    response: Response,
+    page: Page = Depends(),
+    status: Optional[list[BoardingStatus]] = Query(None, description="Only these statuses (repeatable)"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    partner: Partner = Depends(get_current_partner),
+):
+    """
+    The partner's boarding events with their invites, newest first (keyset-paginated; see X-Next-Cursor).
+    Use instead of polling individual invite links.
+    """
+    stmt = (
+        select(
+            BoardingEvent.id,
+            BoardingEvent.status,
+            BoardingEvent.current_step,
+            BoardingEvent.merchant_id,
+            BoardingEvent.created_at,
+            BoardingEvent.updated_at,
+            BoardingEvent.completed_at,
+            Invite.token.label("invite_token"),
+            Invite.email.label("invite_email"),
+            Invite.merchant_name,
+            Invite.expires_at.label("invite_expires_at"),
+            Invite.used_at.label("invite_used_at"),
+        )
+        .outerjoin(Invite, Invite.boarding_event_id == BoardingEvent.id)  # one invite per event
+        .where(BoardingEvent.partner_id == partner.id)
+    )
+    if status:
+        stmt = stmt.where(BoardingEvent.status.in_(status))
+    stmt = filter_created(stmt, BoardingEvent.created_at, created_after, created_before)
+    order = (BoardingEvent.created_at, BoardingEvent.id)
+    rows = (await db.execute(keyset(stmt, page, *order, descending=True))).all()
+    return [
+        BoardingEventSummary(**{**row._mapping, "status": row.status.value})
+        for row in page_rows(rows, page, response, *order)
+    ]
@@ -30,6 +30,34 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
 
 
+class AgreementRegenerationCreate(BaseModel):
+    partner_id: Optional[str] = None
+    fee_schedule_id: Optional[str] = None
+
+
+class AgreementRegenerationResponse(BaseModel):
+    batch_id: str
+    total: int
+    queued: int = 0
+    running: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+
+class PartnerDeletionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    partner_id: str
+    partner_name: Optional[str] = None
+    status: str  # queued, running, succeeded, failed
+    phase: Optional[str] = None
+    deleted: dict[str, int] = {}
+    files_removed: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 # ISV (Partner) admin schemas
 class AdminPartnerCreate(BaseModel):
     name: str
@@ -61,6 +61,16 @@ class VerifyStatusResponse(BaseModel):
     verified: bool
 
 
+class BoardingStreamStatus(BaseModel):
+    """State pushed on GET /boarding/events whenever it changes."""
+
+    verified: bool  # email verified
+    current_step: Optional[str] = None
+    status: Optional[str] = None  # boarding event status
+    sumsub_verification_status: Optional[str] = None
+    truelayer_verified: Optional[bool] = None
+
+
 class TestClearEmailSubmit(BaseModel):
     email: str  # email to clear for testing (re-use same email)
 
@@ -139,6 +149,17 @@ class SubmitReviewResponse(BaseModel):
     agreement_pdf_path: Optional[str] = None
     redirect_to_signing: bool = False
     signing_url: Optional[str] = None
+    job_id: Optional[str] = None  # Set when generation was queued; poll /boarding/agreement-job/{job_id}
+    job_status: Optional[str] = None
+
+
+class AgreementJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, succeeded, failed
+    agreement_pdf_path: Optional[str] = None
+    redirect_to_signing: bool = False
+    signing_url: Optional[str] = None
+    error: Optional[str] = None
 
 
 class SaveForLaterSubmit(BaseModel):
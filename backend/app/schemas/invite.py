@@ -23,3 +23,20 @@ class InviteResponse(BaseModel):
     expires_at: datetime
     boarding_event_id: str
     token: str
+
+
+class BoardingEventSummary(BaseModel):
+    """Boarding event with its invite, as listed to the partner."""
+
+    id: str
+    status: str
+    current_step: int
+    merchant_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    invite_token: Optional[str] = None
+    invite_email: Optional[str] = None
+    merchant_name: Optional[str] = None
+    invite_expires_at: Optional[datetime] = None
+    invite_used_at: Optional[datetime] = None
@@ -0,0 +1,255 @@
+"""
+UK postcode address lookup.
+The backend is chosen by ADDRESS_LOOKUP_UK_BACKEND: "ideal_postcodes" (API, needs ADDRESS_LOOKUP_UK_API_KEY) or
+"local" (memory-mapped index built from an address CSV, see app.services.postcode_index).
+Postcode -> addresses is effectively static, so API results are kept in a per-worker LRU cache with a TTL (unknown
+postcodes too, for a shorter time) and concurrent lookups of the same postcode share one API call. Each call to
+Ideal Postcodes costs a lookup credit.
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.http_clients import get_async_http_client
+
+logger = logging.getLogger(__name__)
+
+IDEAL_POSTCODES_URL = "https://api.ideal-postcodes.co.uk/v1/postcodes/{postcode}"
+
+# UK postcode format for address lookup validation
+UK_POSTCODE_REGEX = re.compile(r"^[A-Z]{1,2}[0-9][0-9A-Z]?\s?[0-9][A-Z]{2}$", re.IGNORECASE)
+
+
+class AddressLookupError(Exception):
+    """Lookup failed; status_code and detail are passed on to the client."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def normalise_uk_postcode(postcode: str) -> str:
+    """Uppercase and single space."""
+    s = postcode.strip().upper().replace(" ", "")
+    if len(s) >= 5:
+        # Insert space before last 3 chars (e.g. SW1A2AA -> SW1A 2AA)
+        s = s[:-3] + " " + s[-3:]
+    return s
+
+
+class _TTLCache:
+    """LRU dict whose entries expire (monotonic seconds)."""
+
+    def __init__(self, max_entries: int):
+        self._lock = threading.Lock()
+        self._data: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class AddressBackend:
+    """Source of addresses for a normalised UK postcode."""
+
+    # Results are cached and concurrent lookups of a postcode coalesced (set for backends that are slow or cost per call)
+    cache_results = False
+
+    def configured(self) -> bool:
+        return True
+
+    async def lookup(self, postcode: str) -> list:
+        """[{ addressLine1, addressLine2, town, postcode }] (empty if unknown); raises AddressLookupError."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class IdealPostcodesBackend(AddressBackend):
+    """Ideal Postcodes API (shared pooled client)."""
+
+    cache_results = True
+
+    def configured(self) -> bool:
+        return bool(settings.ADDRESS_LOOKUP_UK_API_KEY)
+
+    async def lookup(self, postcode: str) -> list:
+        client = get_async_http_client("ideal_postcodes")
+        return await _ideal_postcodes_lookup(client, postcode, settings.ADDRESS_LOOKUP_UK_API_KEY)
+
+
+class LocalIndexBackend(AddressBackend):
+    """Memory-mapped postcode index at ADDRESS_LOOKUP_UK_INDEX_PATH, opened on first lookup."""
+
+    def __init__(self):
+        self._index = None
+        self._lock = threading.Lock()
+
+    def configured(self) -> bool:
+        return bool(settings.ADDRESS_LOOKUP_UK_INDEX_PATH)
+
+    def _get_index(self):
+        from app.services.postcode_index import PostcodeIndex, PostcodeIndexError
+
+        with self._lock:
+            if self._index is None:
+                try:
+                    self._index = PostcodeIndex(settings.ADDRESS_LOOKUP_UK_INDEX_PATH)
+                except (OSError, PostcodeIndexError) as e:
+                    logger.error("Could not open postcode index %s: %s", settings.ADDRESS_LOOKUP_UK_INDEX_PATH, e)
+                    raise AddressLookupError(
+                        503, "Address lookup temporarily unavailable. Please enter your address manually."
+                    ) from e
+                logger.info("Opened postcode index with %d postcodes", self._index.count)
+            return self._index
+
+    async def lookup(self, postcode: str) -> list:
+        # Binary search over mapped pages: no I/O wait worth a thread hop
+        return self._get_index().lookup(postcode)
+
+    async def close(self) -> None:
+        with self._lock:
+            index, self._index = self._index, None
+        if index is not None:
+            index.close()
+
+
+_BACKENDS = {"ideal_postcodes": IdealPostcodesBackend, "local": LocalIndexBackend}
+_backend: Optional[AddressBackend] = None
+_cache = _TTLCache(settings.ADDRESS_LOOKUP_CACHE_SIZE)
+_in_flight: dict[str, asyncio.Future] = {}
+
+
+def get_uk_backend() -> AddressBackend:
+    global _backend
+    if _backend is None:
+        _backend = _BACKENDS[settings.ADDRESS_LOOKUP_UK_BACKEND]()
+    return _backend
+
+
+def uk_address_lookup_configured() -> bool:
+    return get_uk_backend().configured()
+
+
+async def close_address_lookup() -> None:
+    """Release the backend's index (app shutdown)."""
+    global _backend
+    backend, _backend = _backend, None
+    if backend is not None:
+        await backend.close()
+
+
+async def lookup_uk_addresses(postcode: str) -> list:
+    """
+    Addresses for a normalised UK postcode as [{ addressLine1, addressLine2, town, postcode }] (empty if unknown).
+    Raises AddressLookupError (credit exhausted, API unavailable, ...). Errors are not cached.
+    """
+    backend = get_uk_backend()
+    if not backend.cache_results:
+        return await backend.lookup(postcode)
+    cached = _cache.get(postcode)
+    if cached is not None:
+        return cached
+    pending = _in_flight.get(postcode)
+    if pending is None:
+        pending = asyncio.ensure_future(_fetch_and_cache(backend, postcode))
+        _in_flight[postcode] = pending
+        pending.add_done_callback(lambda _f: _in_flight.pop(postcode, None))
+    # shield: a caller that disconnects doesn't cancel the lookup others are waiting on
+    return await asyncio.shield(pending)
+
+
+async def _fetch_and_cache(backend: AddressBackend, postcode: str) -> list:
+    addresses = await backend.lookup(postcode)
+    ttl = settings.ADDRESS_LOOKUP_CACHE_TTL_SECONDS if addresses else settings.ADDRESS_LOOKUP_NEGATIVE_TTL_SECONDS
+    _cache.set(postcode, addresses, ttl)
+    return addresses
+
+
+async def _ideal_postcodes_lookup(client: httpx.AsyncClient, postcode: str, api_key: str) -> list:
+    """Call Ideal Postcodes API for UK; return list of { addressLine1, addressLine2, town, postcode }."""
+    # Postcode in path: space and case insensitive; we send normalised
+    try:
+        resp = await client.get(IDEAL_POSTCODES_URL.format(postcode=postcode), params={"api_key": api_key})
+    except httpx.RequestError as e:
+        logger.warning("Ideal Postcodes request failed: %s", e)
+        raise AddressLookupError(502, "Could not load addresses. Please enter your address manually.") from e
+    if resp.status_code == 402:
+        code = None
+        try:
+            code = resp.json().get("code")
+        except Exception:
+            pass
+        if code == 4020:
+            raise AddressLookupError(
+                503, "Address lookup credit has run out. Please add credits or update the API key in settings."
+            )
+        if code == 4021:
+            raise AddressLookupError(
+                503, "Address lookup limit reached for today. Please try again tomorrow or increase your limit."
+            )
+        raise AddressLookupError(503, "Address lookup credit or limit reached. Please update the API key or add credits.")
+    if resp.status_code == 404:
+        # Postcode not found (code 4040)
+        return []
+    if resp.status_code != 200:
+        try:
+            msg = resp.json().get("message", resp.text[:200])
+        except Exception:
+            msg = resp.text[:200] or "Address lookup temporarily unavailable."
+        logger.warning("Ideal Postcodes returned %s: %s", resp.status_code, msg)
+        raise AddressLookupError(503, "Address lookup temporarily unavailable. Please enter your address manually.")
+    try:
+        data = resp.json()
+    except Exception as e:
+        logger.warning("Ideal Postcodes invalid JSON: %s", e)
+        raise AddressLookupError(502, "Could not load addresses. Please enter your address manually.") from e
+    # Response: { "code": 2000, "result": [ { "line_1", "line_2", "post_town", "postcode", ... } ] }
+    results = data.get("result") if isinstance(data.get("result"), list) else []
+    out = []
+    for r in results:
+        if not isinstance(r, dict):
+            continue
+        line1 = (r.get("line_1") or "").strip()
+        line2 = (r.get("line_2") or "").strip()
+        town = (r.get("post_town") or r.get("town_or_city") or "").strip()
+        pc = (r.get("postcode") or "").strip() or postcode
+        if line1:
+            out.append({
+                "addressLine1": line1,
+                "addressLine2": line2,
+                "town": town,
+                "postcode": pc,
+            })
+    return out
@@ -0,0 +1,354 @@
+"""
+Background agreement generation.
+submit-review and regenerate-agreement create an AgreementJob row and hand its id to a process pool. The worker
+process renders the agreement PDF, then (submit) creates the DocuSign envelope or completes boarding, and records
+the outcome on the row. Clients poll GET /boarding/agreement-job/{id} for the result and signing URL.
+"""
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.invite_context import InviteContext, load_invite_context
+from app.models.agreement_job import AgreementJob
+from app.models.boarding_event import BoardingStatus
+from app.models.fee_schedule import FeeSchedule
+from app.models.invite import Invite
+from app.models.product_package import ProductPackage
+from app.models.product_package_item import ProductPackageItem
+
+logger = logging.getLogger(__name__)
+
+# Jobs still "running" after this long are assumed lost (worker killed) and are re-queued on startup
+STALE_RUNNING_AFTER = timedelta(minutes=10)
+
+GENERATE_FAILED = "Failed to generate agreement. Please try again."
+REGENERATE_FAILED = "Failed to regenerate agreement. Please try again."
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def agreement_context_options() -> tuple:
+    """Loader options for everything generate_agreement_pdf reads beyond the invite context."""
+    return (
+        selectinload(Invite.product_package)
+        .selectinload(ProductPackage.items)
+        .joinedload(ProductPackageItem.catalog_product),
+        selectinload(Invite.device_details),
+    )
+
+
+def build_agreement_package(invite: Invite):
+    """Product package with items for the agreement (selected devices first, like invite-info). None if no package."""
+    if not (invite.product_package_id and invite.product_package):
+        return None
+    pkg = invite.product_package
+    item_by_id = {it.id: it for it in pkg.items}
+    dd_by_item = {}
+    for dd in invite.device_details:
+        dd_by_item.setdefault(dd.package_item_id, []).append(dd)
+    items = []
+    for dd in invite.device_details:
+        it = item_by_id.get(dd.package_item_id)
+        if not it:
+            continue
+        cat = it.catalog_product
+        items.append({"catalog_product": cat, "config": it.config, "product_name": cat.name if cat else ""})
+    for it in pkg.items:
+        if it.id in dd_by_item:
+            continue
+        cat = it.catalog_product
+        items.append({"catalog_product": cat, "config": it.config, "product_name": cat.name if cat else ""})
+    return type("ProductPackage", (), {"items": items})()
+
+
+def render_agreement(db: Session, ctx: InviteContext) -> tuple[Path, str]:
+    """Render the merchant agreement PDF under UPLOAD_DIR/agreements. Returns (absolute path, path relative to UPLOAD_DIR)."""
+    from app.services.agreement_pdf import generate_agreement_pdf
+
+    invite, merchant = ctx.invite, ctx.merchant
+    agreements_dir = Path(settings.UPLOAD_DIR) / "agreements"
+    agreements_dir.mkdir(parents=True, exist_ok=True)
+    pdf_filename = f"agreement-{merchant.id}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}.pdf"
+    pdf_path = agreements_dir / pdf_filename
+
+    fee_schedule = None
+    if ctx.partner and ctx.partner.fee_schedule_id:
+        fee_schedule = db.query(FeeSchedule).filter(FeeSchedule.id == ctx.partner.fee_schedule_id).first()
+
+    generate_agreement_pdf(
+        output_path=str(pdf_path),
+        contact=ctx.contact,
+        merchant=merchant,
+        invite=invite,
+        product_package=build_agreement_package(invite),
+        fee_schedule=fee_schedule,
+    )
+    return pdf_path, f"agreements/{pdf_filename}"
+
+
+def _active_agreement_job(db: Session, kind: str, merchant_id: str) -> Optional[AgreementJob]:
+    return (
+        db.query(AgreementJob)
+        .filter(
+            AgreementJob.merchant_id == merchant_id,
+            AgreementJob.kind == kind,
+            AgreementJob.status.in_(("queued", "running")),
+        )
+        .order_by(AgreementJob.created_at.desc())
+        .first()
+    )
+
+
+def create_agreement_job(db: Session, kind: str, ctx: InviteContext) -> AgreementJob:
+    """
+    Add a queued job for the context's merchant (caller commits, then calls submit_agreement_job).
+    Returns the existing job instead if one of the same kind is already queued or running for the merchant.
+    """
+    active = _active_agreement_job(db, kind, ctx.merchant.id)
+    if active:
+        return active
+    try:
+        return new_agreement_job(db, kind, ctx.merchant.id, ctx.invite.token)
+    except IntegrityError:
+        # A concurrent request queued one between the check and the insert (uq_agreement_jobs_active_merchant_kind)
+        active = _active_agreement_job(db, kind, ctx.merchant.id)
+        if active:
+            return active
+        raise
+
+
+def new_agreement_job(
+    db: Session, kind: str, merchant_id: str, invite_token: str, batch_id: Optional[str] = None
+) -> AgreementJob:
+    """
+    Add a queued job without checking for an active one (caller commits, then submits).
+    Raises IntegrityError if one of the same kind is already queued or running for the merchant; the insert is
+    in a savepoint, so the session stays usable.
+    """
+    job = AgreementJob(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        invite_token=invite_token,
+        merchant_id=merchant_id,
+        batch_id=batch_id,
+        status="queued",
+    )
+    with db.begin_nested():
+        db.add(job)
+    return job
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: workers import the app fresh instead of forking this process's threads and DB connections
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.AGREEMENT_JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _reset_executor(broken: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def submit_agreement_job(job_id: str) -> None:
+    """Run a committed queued job in the process pool."""
+    executor = _get_executor()
+    try:
+        future = executor.submit(run_agreement_job, job_id)
+    except BrokenProcessPool:
+        _reset_executor(executor)
+        future = _get_executor().submit(run_agreement_job, job_id)
+    future.add_done_callback(lambda f: _on_job_done(job_id, executor, f))
+
+
+def _on_job_done(job_id: str, executor: ProcessPoolExecutor, future: Future) -> None:
+    if future.cancelled():
+        return
+    e = future.exception()
+    if e is None:
+        return
+    logger.error("Agreement job %s did not complete: %s", job_id, e)
+    if isinstance(e, BrokenProcessPool):
+        _reset_executor(executor)
+    mark_agreement_job_failed(job_id)
+
+
+def mark_agreement_job_failed(job_id: str) -> None:
+    """Fail a job whose worker raised or died (run_agreement_job records ordinary failures itself)."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(AgreementJob)
+            .where(AgreementJob.id == job_id, AgreementJob.status.in_(("queued", "running")))
+            .values(status="failed", error=GENERATE_FAILED, finished_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def resume_agreement_jobs() -> int:
+    """Re-queue jobs lost with a previous process and submit all queued jobs. Returns how many were submitted."""
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        db.execute(
+            update(AgreementJob)
+            .where(AgreementJob.status == "running", AgreementJob.started_at < now - STALE_RUNNING_AFTER)
+            .values(status="queued", started_at=None)
+        )
+        db.commit()
+        job_ids = [jid for (jid,) in db.query(AgreementJob.id).filter(AgreementJob.status == "queued").all()]
+    finally:
+        db.close()
+    for job_id in job_ids:
+        submit_agreement_job(job_id)
+    return len(job_ids)
+
+
+def shutdown_agreement_executor() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _claim(db: Session, job_id: str) -> bool:
+    """Mark a queued job running. False if another worker already took it (or it no longer exists)."""
+    result = db.execute(
+        update(AgreementJob)
+        .where(AgreementJob.id == job_id, AgreementJob.status == "queued")
+        .values(status="running", started_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+class _JobFailed(Exception):
+    """Job failed; message is shown to the user."""
+
+
+def run_agreement_job(job_id: str) -> None:
+    """Process-pool entry point: run one job and record its outcome."""
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return
+        job = db.query(AgreementJob).filter(AgreementJob.id == job_id).first()
+        try:
+            if job.kind == "submit":
+                _run_submit(db, job)
+            else:
+                _run_regenerate(db, job)
+        except _JobFailed as e:
+            db.rollback()
+            job = db.query(AgreementJob).filter(AgreementJob.id == job_id).first()
+            job.status = "failed"
+            job.error = str(e)[:1024]
+        else:
+            job.status = "succeeded"
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _load_context(db: Session, job: AgreementJob) -> InviteContext:
+    ctx = load_invite_context(db, job.invite_token, *agreement_context_options())
+    if not ctx or not ctx.event or not ctx.contact or not ctx.merchant or ctx.merchant.id != job.merchant_id:
+        raise _JobFailed("Invalid link")
+    return ctx
+
+
+def _render(db: Session, ctx: InviteContext, failure_message: str) -> tuple[Path, str]:
+    try:
+        return render_agreement(db, ctx)
+    except Exception as e:
+        logger.exception("Failed to generate agreement PDF: %s", e)
+        raise _JobFailed(failure_message) from e
+
+
+def _run_regenerate(db: Session, job: AgreementJob) -> None:
+    ctx = _load_context(db, job)
+    _, relative_path = _render(db, ctx, REGENERATE_FAILED)
+    ctx.merchant.agreement_pdf_path = relative_path
+    job.agreement_pdf_path = relative_path
+
+
+def _run_submit(db: Session, job: AgreementJob) -> None:
+    from app.services.email_outbox import queue_email
+
+    ctx = _load_context(db, job)
+    contact, merchant, event = ctx.contact, ctx.merchant, ctx.event
+    pdf_path, relative_path = _render(db, ctx, GENERATE_FAILED)
+    merchant.agreement_pdf_path = relative_path
+    job.agreement_pdf_path = relative_path
+
+    # DocuSign: create envelope and hand back the signing URL (don't complete yet)
+    if settings.DOCUSIGN_INTEGRATION_KEY and settings.DOCUSIGN_USER_ID:
+        signer_email = contact.email or ""
+        if not signer_email:
+            raise _JobFailed("Email required for e-signature.")
+        try:
+            from app.services.docusign_signing import create_envelope_and_get_signing_url
+
+            return_url_base = settings.DOCUSIGN_RETURN_URL_BASE.rstrip("/")
+            return_url = f"{return_url_base}/boarding/docusign-callback?state={job.invite_token}"
+            signer_name = f"{(contact.legal_first_name or '').strip()} {(contact.legal_last_name or '').strip()}".strip() or "Signer"
+            backend_root = Path(__file__).resolve().parent.parent.parent
+            services_path = backend_root / settings.SERVICES_AGREEMENT_PATH
+            envelope_id, signing_url = create_envelope_and_get_signing_url(
+                pdf_path=str(pdf_path),
+                signer_email=signer_email,
+                signer_name=signer_name,
+                return_url=return_url,
+                services_agreement_path=str(services_path) if services_path.exists() else None,
+            )
+            merchant.docusign_envelope_id = envelope_id
+            contact.current_step = "step6"  # Keep at review until signed
+            job.signing_url = signing_url
+            return
+        except ValueError as e:
+            logger.warning("DocuSign setup issue: %s. Completing without e-sign.", e)
+            # Fall through to non-DocuSign flow
+        except Exception as e:
+            logger.exception("DocuSign envelope creation failed: %s", e)
+            raise _JobFailed(f"Failed to create signing session: {e}") from e
+
+    # Non-DocuSign flow: mark completed and queue completion email with attachments
+    contact.current_step = "done"
+    event.status = BoardingStatus.completed
+    event.completed_at = datetime.now(timezone.utc)
+
+    portal_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board/{job.invite_token}"
+    merchant_name = f"{(contact.legal_first_name or '').strip()} {(contact.legal_last_name or '').strip()}".strip() or (contact.email or "Merchant")
+    queue_email(
+        db,
+        "completion",
+        contact.email,
+        merchant_name=merchant_name,
+        portal_url=portal_url,
+        pdf_path=str(pdf_path),
+    )
@@ -4,12 +4,15 @@ Uses Path brand colours: dark green (#297D2D) for titles, salmon pink (#FF5252)
 """
 import os
 import textwrap
+from functools import lru_cache
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Optional
 
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
 # Path brand colours
@@ -18,6 +21,10 @@ PATH_SALMON = colors.HexColor("#FF5252")
 PATH_BLACK = colors.HexColor("#1a1a1a")
 PATH_GREY = colors.HexColor("#4a4a4a")
 
+# Store images as zlib-compressed binary rather than ASCII85 text: ReportLab's pure-Python ASCII85 encoder
+# dominated render time (the logo is re-encoded into every document), and the files come out smaller
+rl_config.useA85 = 0
+
 
 def _val(s: Optional[str]) -> str:
     """Return value or placeholder."""
@@ -52,20 +59,39 @@ def _format_delivery_timeframe(s: Optional[str]) -> str:
     return m.get(v, _val(s))
 
 
-def _draw_header(c: canvas.Canvas, logo_path: Optional[str]) -> None:
-    """Draw Path logo top left - larger, further left, one line lower from top."""
-    x, y = 20, A4[1] - 62
-    if logo_path and os.path.isfile(logo_path):
-        try:
-            c.drawImage(logo_path, x, y, width=130, height=36, preserveAspectRatio=True)
-        except Exception:
+LOGO_PATH = Path(__file__).resolve().parent.parent.parent / "static" / "path-logo.png"
+HEADER_FORM = "pathHeader"
+FOOTER_FORM = "pathFooter"
+
+
+@lru_cache(maxsize=1)
+def _logo_image() -> Optional[ImageReader]:
+    """Path logo decoded once per process. None if missing or unreadable (header falls back to text)."""
+    if not LOGO_PATH.is_file():
+        return None
+    try:
+        logo = ImageReader(str(LOGO_PATH))
+        logo.getRGBData()  # decode now so every document reuses the pixels
+        return logo
+    except Exception:
+        return None
+
+
+def _draw_header(c: canvas.Canvas) -> None:
+    """Draw Path logo top left - larger, further left, one line lower from top.
+    Drawn once per document as a Form XObject; later pages only reference it."""
+    if not c.hasForm(HEADER_FORM):
+        c.beginForm(HEADER_FORM)
+        x, y = 20, A4[1] - 62
+        logo = _logo_image()
+        if logo is not None:
+            c.drawImage(logo, x, y, width=130, height=36, preserveAspectRatio=True)
+        else:
             c.setFont("Helvetica-Bold", 18)
             c.setFillColor(PATH_GREEN)
             c.drawString(x, y + 8, "Path")
-    else:
-        c.setFont("Helvetica-Bold", 18)
-        c.setFillColor(PATH_GREEN)
-        c.drawString(x, y + 8, "Path")
+        c.endForm()
+    c.doForm(HEADER_FORM)
 
 
 FOOTER_Y = 30
@@ -73,10 +99,16 @@ FOOTER_MARGIN = 55  # Min y for content; footer + blank space above
 
 
 def _draw_footer(c: canvas.Canvas, page_num: int) -> None:
-    """Draw footer with copyright line and page numbers. Blank space above."""
+    """Draw footer with copyright line (shared Form XObject) and page number. Blank space above."""
+    if not c.hasForm(FOOTER_FORM):
+        c.beginForm(FOOTER_FORM)
+        c.setFont("Helvetica", 8)
+        c.setFillColor(PATH_GREY)
+        c.drawString(40, FOOTER_Y, "© Path2ai.tech. All rights reserved.")
+        c.endForm()
+    c.doForm(FOOTER_FORM)
     c.setFont("Helvetica", 8)
     c.setFillColor(PATH_GREY)
-    c.drawString(40, FOOTER_Y, "© Path2ai.tech. All rights reserved.")
     c.drawRightString(A4[0] - 40, FOOTER_Y, f"Page {page_num}")
 
 
@@ -117,6 +149,52 @@ def _field_line(
     return y - LINE_HEIGHT_FIELD
 
 
+INTRO_TEXT = (
+    "By filling out and signing this application the Merchant requests that Path enter into an agreement "
+    "with the Merchant for payment processing services to acquire the Merchant's Transactions and process them "
+    "for clearing and settlement purposes, through an acquiring bank as selected by Path.\n\n"
+    "This application, the general Terms and Conditions and the Merchant Terms and Conditions shall collectively "
+    "form the Merchant Agreement between the Merchant and the Path, giving permission for Path to provide payment "
+    "processing services. By signing this application, the Merchant agrees to the terms of the Merchant Agreement."
+)
+
+CONSENT_TEXT = (
+    "By signing this application, the Merchant confirms that it understands and accepts that in order to evaluate its application "
+    "Path will perform several checks, including politically exposed person (PEP)/ sanction screening and an electronic credit "
+    "check and in order to fulfil its legal obligation under anti-money laundering regulations. For this purpose, Path will use "
+    "the service of Sumsub or a similar third-party service provider (the \"service provider\"). By signing this application, the "
+    "Merchant authorises Path to undertake searches with the service provider for the purpose of both verifying the "
+    "Merchant's identity and that of its beneficial owners, during the application review and at any time during the term of the "
+    "business relationship. The Merchant confirms on behalf of itself and its beneficial owners and directors that it is aware that "
+    "a record of the searches and results thereof may be retained by Path. The Merchant also acknowledges that should "
+    "further documentation be required to support verification checks, Path may request via a secure system for ID "
+    "documentation such as a Passport or Driving Licence copy.\n\n"
+    "The Merchant confirms that they accept the pricing and membership rates as defined in this form and acknowledges "
+    "that in the event of any Chargebacks these will be charged at a fee of £25 per Chargeback.\n\n"
+    "In terms of applicable data protection laws and regulations, Path will process the above data and any other data which "
+    "Merchant may subsequently give to Path or which has been obtained by Path independently for this application, "
+    "for the following purposes, namely:\n"
+    "• To be able to process this application and provide its services;\n"
+    "• For due diligence procedures, internal assessment, risk assessment and analysis;\n"
+    "• For the detection and prevention of fraud and other criminal activity which Path is bound to report;\n"
+    "• To comply with any laws, rules, or regulations imposed on Path by any relevant authority, regulator or acquiring bank;\n"
+    "I consent to the processing of such data for the purpose specified on this application and consent to the disclosure of "
+    "information given above to, and to the exchange thereof with the acquiring bank when required. I understand that I have a "
+    "right of access to, and the right to rectify, the personal data.\n"
+    "I represent that:\n"
+    "• all the information I have given on this application form is true, complete and accurate and properly reflects the Merchant's business;\n"
+    "• persons whose personal data is disclosed in this application have provided their explicit consent to such use and processing;\n"
+    "• I am duly authorised to bind the Merchant to the terms of the Merchant Agreement.\n"
+    "Path reserves the right to request more information/documentation during onboarding or during the term of the business relationship."
+)
+
+
+@lru_cache(maxsize=None)
+def _wrapped_paragraphs(text: str) -> tuple[tuple[str, ...], ...]:
+    """Static text split into paragraphs (blank line) and wrapped to 90 chars; computed once per process."""
+    return tuple(tuple(textwrap.wrap(para.replace("\n", " "), width=90)) for para in text.split("\n\n"))
+
+
 def generate_agreement_pdf(
     output_path: str,
     contact: Any,
@@ -129,12 +207,6 @@ def generate_agreement_pdf(
     Generate the Path Merchant Agreement PDF.
     Returns the path to the generated file.
     """
-    logo_path = Path(__file__).resolve().parent.parent.parent / "static" / "path-logo.png"
-    if not logo_path.exists():
-        logo_path = None
-    else:
-        logo_path = str(logo_path)
-
     c = canvas.Canvas(output_path, pagesize=A4)
     width, height = A4
     margin_bottom = FOOTER_MARGIN
@@ -147,7 +219,7 @@ def generate_agreement_pdf(
             _draw_footer(c, page_num)
             c.showPage()
             page_num += 1
-            _draw_header(c, logo_path)
+            _draw_header(c)
             # Page 2+: extra space between logo and next heading
             y = height - 84
 
@@ -158,7 +230,7 @@ def generate_agreement_pdf(
             maybe_new_page()
 
     # Header with logo
-    _draw_header(c, logo_path)
+    _draw_header(c)
     y -= 50
 
     # Title
@@ -171,18 +243,10 @@ def generate_agreement_pdf(
     y -= 24
 
     # Intro paragraph
-    intro = (
-        "By filling out and signing this application the Merchant requests that Path enter into an agreement "
-        "with the Merchant for payment processing services to acquire the Merchant's Transactions and process them "
-        "for clearing and settlement purposes, through an acquiring bank as selected by Path.\n\n"
-        "This application, the general Terms and Conditions and the Merchant Terms and Conditions shall collectively "
-        "form the Merchant Agreement between the Merchant and the Path, giving permission for Path to provide payment "
-        "processing services. By signing this application, the Merchant agrees to the terms of the Merchant Agreement."
-    )
     c.setFont("Helvetica", 9)
     c.setFillColor(PATH_BLACK)
-    for para in intro.split("\n\n"):
-        for line in textwrap.wrap(para, width=90):
+    for lines in _wrapped_paragraphs(INTRO_TEXT):
+        for line in lines:
             maybe_new_page()
             c.drawString(LABEL_COL, y, line)
             y -= LINE_HEIGHT_INTRO
@@ -348,41 +412,11 @@ def generate_agreement_pdf(
     # Merchant's Consent
     ensure_section_fits(3)
     y = _section_title(c, y, "Merchant's Consent")
-    consent_text = (
-        "By signing this application, the Merchant confirms that it understands and accepts that in order to evaluate its application "
-        "Path will perform several checks, including politically exposed person (PEP)/ sanction screening and an electronic credit "
-        "check and in order to fulfil its legal obligation under anti-money laundering regulations. For this purpose, Path will use "
-        "the service of Sumsub or a similar third-party service provider (the \"service provider\"). By signing this application, the "
-        "Merchant authorises Path to undertake searches with the service provider for the purpose of both verifying the "
-        "Merchant's identity and that of its beneficial owners, during the application review and at any time during the term of the "
-        "business relationship. The Merchant confirms on behalf of itself and its beneficial owners and directors that it is aware that "
-        "a record of the searches and results thereof may be retained by Path. The Merchant also acknowledges that should "
-        "further documentation be required to support verification checks, Path may request via a secure system for ID "
-        "documentation such as a Passport or Driving Licence copy.\n\n"
-        "The Merchant confirms that they accept the pricing and membership rates as defined in this form and acknowledges "
-        "that in the event of any Chargebacks these will be charged at a fee of £25 per Chargeback.\n\n"
-        "In terms of applicable data protection laws and regulations, Path will process the above data and any other data which "
-        "Merchant may subsequently give to Path or which has been obtained by Path independently for this application, "
-        "for the following purposes, namely:\n"
-        "• To be able to process this application and provide its services;\n"
-        "• For due diligence procedures, internal assessment, risk assessment and analysis;\n"
-        "• For the detection and prevention of fraud and other criminal activity which Path is bound to report;\n"
-        "• To comply with any laws, rules, or regulations imposed on Path by any relevant authority, regulator or acquiring bank;\n"
-        "I consent to the processing of such data for the purpose specified on this application and consent to the disclosure of "
-        "information given above to, and to the exchange thereof with the acquiring bank when required. I understand that I have a "
-        "right of access to, and the right to rectify, the personal data.\n"
-        "I represent that:\n"
-        "• all the information I have given on this application form is true, complete and accurate and properly reflects the Merchant's business;\n"
-        "• persons whose personal data is disclosed in this application have provided their explicit consent to such use and processing;\n"
-        "• I am duly authorised to bind the Merchant to the terms of the Merchant Agreement.\n"
-        "Path reserves the right to request more information/documentation during onboarding or during the term of the business relationship."
-    )
     # Consent text: same format as intro (9pt, same wrap, same line height)
     c.setFont("Helvetica", 9)
     c.setFillColor(PATH_BLACK)
-    for para in consent_text.split("\n\n"):
-        para_flat = para.replace("\n", " ")
-        for line in textwrap.wrap(para_flat, width=90):
+    for lines in _wrapped_paragraphs(CONSENT_TEXT):
+        for line in lines:
             maybe_new_page()
             c.setFont("Helvetica", 9)
             c.setFillColor(PATH_BLACK)
@@ -458,32 +492,35 @@ def _blank_objects() -> tuple[Any, Any, Any, Any, Any]:
     return contact, merchant, invite, None, None
 
 
-def add_signature_block_to_services_agreement(
-    source_path: str,
-    output_path: str,
-    applicant_name: str,
-) -> str:
+@lru_cache(maxsize=4)
+def _load_services_agreement(source_path: str, mtime_ns: int, size: int) -> bytes:
+    with open(source_path, "rb") as f:
+        return f.read()
+
+
+def _services_agreement_bytes(source_path: str) -> bytes:
+    """Static Services Agreement, read once per process (re-read if the file changes)."""
+    if not os.path.isfile(source_path):
+        raise FileNotFoundError(f"Services Agreement not found: {source_path}")
+    st = os.stat(source_path)
+    return _load_services_agreement(source_path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=128)
+def _services_signature_page(applicant_name: str) -> bytes:
     """
-    Append a signature block page to the Services Agreement PDF.
+    One-page PDF with the Services Agreement signature block.
     Same layout as the Path Agreement: Signed for and on Behalf of the Merchant,
     with invisible anchors /sn2/ and [Date2] for DocuSign.
-    Returns the output path.
     """
-    from pypdf import PdfReader, PdfWriter
     from io import BytesIO
 
-    if not os.path.isfile(source_path):
-        raise FileNotFoundError(f"Services Agreement not found: {source_path}")
-
-    # Create signature block page with reportlab
     buffer = BytesIO()
     c = canvas.Canvas(buffer, pagesize=A4)
     width, height = A4
     page_num = 1  # This will be the last page
 
-    logo_path = Path(__file__).resolve().parent.parent.parent / "static" / "path-logo.png"
-    logo_str = str(logo_path) if logo_path.exists() else None
-    _draw_header(c, logo_str)
+    _draw_header(c)
     y = height - 100
 
     # Signature block – same as Path Agreement but with /sn2/ and [Date2]
@@ -507,18 +544,37 @@ def add_signature_block_to_services_agreement(
 
     _draw_footer(c, page_num)
     c.save()
-    buffer.seek(0)
-
-    # Merge: original Services Agreement + signature page
-    reader_orig = PdfReader(source_path)
-    reader_sig = PdfReader(buffer)
-    writer = PdfWriter()
-    for page in reader_orig.pages:
-        writer.add_page(page)
-    writer.add_page(reader_sig.pages[0])
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    return buffer.getvalue()
+
+
+def services_agreement_with_signature_block(source_path: str, applicant_name: str) -> bytes:
+    """
+    Services Agreement PDF with a signature block page appended for applicant_name.
+    The static document is cached and only the signature page is rendered; it is added as an
+    incremental update, so the original bytes are copied through rather than re-serialised.
+    """
+    from io import BytesIO
+    from pypdf import PdfReader, PdfWriter
+
+    base = _services_agreement_bytes(source_path)
+    writer = PdfWriter(BytesIO(base), incremental=True)
+    writer.add_page(PdfReader(BytesIO(_services_signature_page(applicant_name))).pages[0])
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
 
+
+def add_signature_block_to_services_agreement(
+    source_path: str,
+    output_path: str,
+    applicant_name: str,
+) -> str:
+    """
+    Append a signature block page to the Services Agreement PDF and write it to output_path.
+    Returns the output path.
+    """
+    with open(output_path, "wb") as f:
+        f.write(services_agreement_with_signature_block(source_path, applicant_name))
     return output_path
 
 
@@ -0,0 +1,150 @@
+"""
+Bulk agreement regeneration (e.g. after a fee schedule or template change).
+Selects in-flight merchants (agreement generated, boarding not completed), queues one regenerate AgreementJob per
+merchant under a shared batch_id, and runs them across a process pool. Progress is the job status counts per batch.
+
+CLI (runs on every core of the current machine):
+    python -m app.services.agreement_regeneration [--partner-id ID] [--fee-schedule-id ID] [--workers N]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.agreement_job import AgreementJob
+from app.models.boarding_event import BoardingEvent, BoardingStatus
+from app.models.invite import Invite
+from app.models.merchant import Merchant
+from app.models.partner import Partner
+from app.services.agreement_jobs import (
+    mark_agreement_job_failed,
+    new_agreement_job,
+    run_agreement_job,
+    submit_agreement_job,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def select_merchants_for_regeneration(
+    db: Session, partner_id: Optional[str] = None, fee_schedule_id: Optional[str] = None
+) -> list[tuple[str, str]]:
+    """
+    (merchant_id, invite_token) for in-flight merchants matching the filters, latest invite per merchant.
+    Merchants with a regenerate job already queued or running are skipped.
+    """
+    q = (
+        db.query(Merchant.id, Invite.token)
+        .join(BoardingEvent, BoardingEvent.merchant_id == Merchant.id)
+        .join(Invite, Invite.boarding_event_id == BoardingEvent.id)
+        .filter(Merchant.agreement_pdf_path.isnot(None), BoardingEvent.status != BoardingStatus.completed)
+    )
+    if partner_id:
+        q = q.filter(Merchant.partner_id == partner_id)
+    if fee_schedule_id:
+        q = q.join(Partner, Partner.id == Merchant.partner_id).filter(Partner.fee_schedule_id == fee_schedule_id)
+    active = {
+        mid
+        for (mid,) in db.query(AgreementJob.merchant_id).filter(
+            AgreementJob.kind == "regenerate", AgreementJob.status.in_(("queued", "running"))
+        )
+    }
+    selected: dict[str, str] = {}
+    for merchant_id, token in q.order_by(Merchant.id, Invite.created_at.desc()):
+        if merchant_id not in active and merchant_id not in selected:
+            selected[merchant_id] = token
+    return list(selected.items())
+
+
+def queue_regeneration_batch(
+    db: Session, partner_id: Optional[str] = None, fee_schedule_id: Optional[str] = None
+) -> tuple[str, list[str]]:
+    """Create queued regenerate jobs for the selected merchants and commit. Returns (batch_id, job ids)."""
+    batch_id = str(uuid.uuid4())
+    job_ids = []
+    for merchant_id, token in select_merchants_for_regeneration(db, partner_id, fee_schedule_id):
+        try:
+            job_ids.append(new_agreement_job(db, "regenerate", merchant_id, token, batch_id=batch_id).id)
+        except IntegrityError:
+            # Regeneration queued for this merchant since the selection (e.g. from the boarding page)
+            continue
+    db.commit()
+    return batch_id, job_ids
+
+
+def start_regeneration_batch(
+    db: Session, partner_id: Optional[str] = None, fee_schedule_id: Optional[str] = None
+) -> tuple[str, int]:
+    """Queue a batch and hand it to this process's agreement job pool. Returns (batch_id, jobs queued)."""
+    batch_id, job_ids = queue_regeneration_batch(db, partner_id, fee_schedule_id)
+    for job_id in job_ids:
+        submit_agreement_job(job_id)
+    logger.info("Queued agreement regeneration batch %s (%d merchants)", batch_id, len(job_ids))
+    return batch_id, len(job_ids)
+
+
+def batch_progress(db: Session, batch_id: str) -> dict[str, int]:
+    """Job counts by status for a batch (queued, running, succeeded, failed, total)."""
+    counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+    rows = (
+        db.query(AgreementJob.status, func.count(AgreementJob.id))
+        .filter(AgreementJob.batch_id == batch_id)
+        .group_by(AgreementJob.status)
+        .all()
+    )
+    for status, n in rows:
+        counts[status] = n
+    counts["total"] = sum(counts.values())
+    return counts
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate agreement PDFs for in-flight merchants.")
+    parser.add_argument("--partner-id", help="Only merchants of this partner (ISV)")
+    parser.add_argument("--fee-schedule-id", help="Only merchants whose partner uses this fee schedule")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    db = SessionLocal()
+    try:
+        batch_id, job_ids = queue_regeneration_batch(db, args.partner_id, args.fee_schedule_id)
+    finally:
+        db.close()
+    total = len(job_ids)
+    print(f"Batch {batch_id}: {total} merchant(s) to regenerate with {args.workers} worker(s)")
+    if not total:
+        return 0
+
+    errors = 0
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+        futures = {ex.submit(run_agreement_job, job_id): job_id for job_id in job_ids}
+        for done, future in enumerate(as_completed(futures), start=1):
+            if future.exception() is not None:
+                errors += 1
+                job_id = futures[future]
+                logger.error("Regeneration job %s did not complete: %s", job_id, future.exception())
+                mark_agreement_job_failed(job_id)
+            if done % 50 == 0 or done == total:
+                print(f"{done}/{total} processed", flush=True)
+
+    db = SessionLocal()
+    try:
+        progress = batch_progress(db, batch_id)
+    finally:
+        db.close()
+    print(f"Done: {progress['succeeded']} succeeded, {progress['failed']} failed, {progress['queued'] + progress['running']} not run")
+    return 1 if errors or progress["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Archival of stale boardings.
+A boarding that was never submitted (draft / in_progress / pending_kyc), whose invites all expired and that has had
+no activity for BOARDING_ARCHIVE_AFTER_DAYS can no longer be continued. A background thread (one per worker) moves
+such boardings out of boarding_events / boarding_contact / invites / invite_device_details into boarding_archive
+(one row per boarding, status "expired", with a JSON snapshot of the removed rows), BOARDING_ARCHIVE_BATCH_SIZE
+boardings per transaction, so the live tables and their indexes only hold boardings that are still in play.
+Merchants created at email verification are left in place.
+
+CLI (one-off run, e.g. for the initial backlog):
+    python -m app.services.boarding_archive [--dry-run]
+"""
+import argparse
+import enum
+import logging
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.boarding_archive import BoardingArchive
+from app.models.boarding_contact import BoardingContact
+from app.models.boarding_event import BoardingEvent, BoardingStatus
+from app.models.invite import Invite
+from app.models.invite_device_detail import InviteDeviceDetail
+
+logger = logging.getLogger(__name__)
+
+# Statuses before the merchant submits; later ones (pending_review, completed, rejected) are kept
+ARCHIVABLE_STATUSES = (BoardingStatus.draft, BoardingStatus.in_progress, BoardingStatus.pending_kyc)
+
+
+def _stale_events(cutoff: datetime):
+    """Select of archivable event ids: unsubmitted, every invite expired before cutoff, no activity since cutoff."""
+    live_invite = exists().where(Invite.boarding_event_id == BoardingEvent.id, Invite.expires_at >= cutoff)
+    recent_contact = exists().where(
+        BoardingContact.boarding_event_id == BoardingEvent.id,
+        func.coalesce(BoardingContact.updated_at, BoardingContact.created_at) >= cutoff,
+    )
+    return select(BoardingEvent.id).where(
+        BoardingEvent.status.in_(ARCHIVABLE_STATUSES),
+        func.coalesce(BoardingEvent.updated_at, BoardingEvent.created_at) < cutoff,
+        ~live_invite,
+        ~recent_contact,
+    )
+
+
+def _cutoff() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=settings.BOARDING_ARCHIVE_AFTER_DAYS)
+
+
+def _row(obj) -> dict:
+    """Column values of a model instance as JSON-serialisable values."""
+    out = {}
+    for col in obj.__table__.columns:
+        value = getattr(obj, col.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, enum.Enum):
+            value = value.value
+        out[col.key] = value
+    return out
+
+
+def _archive_row(event: BoardingEvent) -> BoardingArchive:
+    contact = event.contact
+    invites = list(event.invites)
+    activity = [event.updated_at, event.created_at]
+    if contact:
+        activity += [contact.updated_at, contact.created_at]
+    activity += [inv.used_at for inv in invites]
+    return BoardingArchive(
+        id=event.id,
+        partner_id=event.partner_id,
+        merchant_id=event.merchant_id,
+        status="expired",
+        last_status=event.status.value,
+        last_step=event.current_step,
+        contact_email=contact.email if contact else None,
+        created_at=event.created_at,
+        last_activity_at=max((t for t in activity if t is not None), default=None),
+        data={
+            "event": _row(event),
+            "contact": _row(contact) if contact else None,
+            "invites": [_row(inv) for inv in invites],
+            "device_details": [_row(dd) for inv in invites for dd in inv.device_details],
+        },
+    )
+
+
+def _archive_batch(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Archive up to batch_size stale boardings in one transaction. Returns how many were archived."""
+    event_ids = list(
+        db.execute(
+            _stale_events(cutoff).limit(batch_size).with_for_update(of=BoardingEvent, skip_locked=True)
+        ).scalars()
+    )
+    if not event_ids:
+        db.rollback()
+        return 0
+    events = (
+        db.query(BoardingEvent)
+        .options(
+            selectinload(BoardingEvent.contact),
+            selectinload(BoardingEvent.invites).selectinload(Invite.device_details),
+        )
+        .filter(BoardingEvent.id.in_(event_ids))
+        .all()
+    )
+    db.add_all([_archive_row(ev) for ev in events])
+    invite_ids = [inv.id for ev in events for inv in ev.invites]
+    opts = {"synchronize_session": False}
+    if invite_ids:
+        db.execute(delete(InviteDeviceDetail).where(InviteDeviceDetail.invite_id.in_(invite_ids)).execution_options(**opts))
+        db.execute(delete(Invite).where(Invite.id.in_(invite_ids)).execution_options(**opts))
+    db.execute(delete(BoardingContact).where(BoardingContact.boarding_event_id.in_(event_ids)).execution_options(**opts))
+    db.execute(delete(BoardingEvent).where(BoardingEvent.id.in_(event_ids)).execution_options(**opts))
+    db.commit()
+    db.expunge_all()
+    return len(events)
+
+
+def archive_stale_boardings(stop: Optional[threading.Event] = None) -> int:
+    """Archive every stale boarding, a batch per transaction. Returns how many were archived."""
+    cutoff = _cutoff()
+    batch_size = settings.BOARDING_ARCHIVE_BATCH_SIZE
+    archived = 0
+    db = SessionLocal()
+    try:
+        while stop is None or not stop.is_set():
+            n = _archive_batch(db, cutoff, batch_size)
+            archived += n
+            if n < batch_size:
+                break
+    finally:
+        db.close()
+    return archived
+
+
+def count_stale_boardings() -> int:
+    db = SessionLocal()
+    try:
+        return db.execute(select(func.count()).select_from(_stale_events(_cutoff()).subquery())).scalar_one()
+    finally:
+        db.close()
+
+
+class BoardingArchiver:
+    """Background thread running archive_stale_boardings() on an interval."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="boarding-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                archived = archive_stale_boardings(self._stop)
+                if archived:
+                    logger.info("Archived %d stale boarding(s)", archived)
+            except Exception as e:
+                logger.exception("Boarding archival failed: %s", e)
+            self._stop.wait(settings.BOARDING_ARCHIVE_INTERVAL_SECONDS)
+
+
+boarding_archiver = BoardingArchiver()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Archive expired, never-submitted boardings.")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the boardings that would be archived")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.dry_run:
+        print(f"{count_stale_boardings()} boarding(s) would be archived")
+        return 0
+    print(f"Archived {archive_stale_boardings()} boarding(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Server push for boarding state changes (email verified, SumSub, TrueLayer).
+Handlers call notify_boarding_change() inside their transaction. On Postgres that is pg_notify on CHANNEL, delivered
+on commit to every worker; each worker holds one LISTEN connection (boarding_listener) and fans notifications out to
+the streams subscribed to that boarding_event_id (GET /boarding/events). Without Postgres the notification is
+delivered in-process after commit.
+"""
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "boarding_events"
+# Pending notifications per stream; older ones are dropped (the stream re-reads current state anyway)
+QUEUE_SIZE = 8
+RECONNECT_MAX_DELAY_SECONDS = 30
+
+
+def notify_boarding_change(db: Session, event_id: str, kind: str) -> None:
+    """Notify subscribers of event_id once the caller's transaction commits."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_notify(CHANNEL, f"{event_id}:{kind}")))
+        return
+    _queue_local(db, event_id, kind)
+
+
+async def notify_boarding_change_async(db: AsyncSession, event_id: str, kind: str) -> None:
+    """notify_boarding_change for an AsyncSession."""
+    if db.sync_session.get_bind().dialect.name == "postgresql":
+        await db.execute(select(func.pg_notify(CHANNEL, f"{event_id}:{kind}")))
+        return
+    _queue_local(db.sync_session, event_id, kind)
+
+
+def _queue_local(db: Session, event_id: str, kind: str) -> None:
+    db.info.setdefault("boarding_notifications", []).append((event_id, kind))
+    if not event.contains(db, "after_commit", _deliver_local):
+        event.listen(db, "after_commit", _deliver_local)
+        event.listen(db, "after_rollback", _discard_local)
+
+
+def _deliver_local(session: Session) -> None:
+    for event_id, kind in session.info.pop("boarding_notifications", []):
+        boarding_listener.dispatch_threadsafe(event_id, kind)
+
+
+def _discard_local(session: Session) -> None:
+    session.info.pop("boarding_notifications", None)
+
+
+class BoardingListener:
+    """Per-worker LISTEN connection and the asyncio queues of the streams waiting on each boarding event."""
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, event_id: str):
+        """Queue receiving the kind of each change to event_id while the context is open."""
+        self._ensure_listening()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.setdefault(event_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(event_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[event_id]
+
+    def dispatch_threadsafe(self, event_id: str, kind: str) -> None:
+        """Deliver a change from any thread (sync handlers run in the threadpool)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._dispatch, event_id, kind)
+
+    def _dispatch(self, event_id: str, kind: str) -> None:
+        for queue in self._subscribers.get(event_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(kind)
+
+    def _ensure_listening(self) -> None:
+        from app.core.database import async_engine
+
+        self._loop = asyncio.get_running_loop()
+        if async_engine.dialect.name != "postgresql":
+            return
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._listen(), name="boarding-listener")
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        from app.core.database import async_engine
+
+        url = async_engine.url.set(drivername="postgresql")
+        if "ssl" in url.query:
+            # Engine URL carries asyncpg's ssl=...; a libpq-style DSN wants sslmode=...
+            query = dict(url.query)
+            query["sslmode"] = query.pop("ssl")
+            url = url.set(query=query)
+        dsn = url.render_as_string(hide_password=False)
+        delay = 1
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: closed.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                delay = 1
+                # Changes made while not listening were missed: have every open stream re-read its state
+                for event_id in list(self._subscribers):
+                    self._dispatch(event_id, "resync")
+                await closed.wait()
+                logger.warning("Boarding LISTEN connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Boarding LISTEN connection failed: %s; retrying in %ds", e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+
+    def _on_notify(self, _conn, _pid: int, _channel: str, payload: str) -> None:
+        event_id, _, kind = payload.partition(":")
+        self._dispatch(event_id, kind)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+boarding_listener = BoardingListener()
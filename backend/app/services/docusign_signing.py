@@ -5,6 +5,9 @@ Creates envelopes, gets signing URLs, and downloads completed documents.
 import base64
 import logging
 import os
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -20,6 +23,7 @@ from docusign_esign import (
     Recipients,
     RecipientViewRequest,
 )
+from docusign_esign.client.api_exception import ApiException
 
 from app.core.config import settings
 
@@ -32,22 +36,36 @@ SCOPES = ["signature", "impersonation"]
 SIGNER_CLIENT_ID = "1000"
 
 
-def _get_private_key() -> bytes:
-    """Load RSA private key from env (contents or file path)."""
-    key = (settings.DOCUSIGN_PRIVATE_KEY or "").strip()
-    if not key:
-        raise ValueError("DOCUSIGN_PRIVATE_KEY not configured")
-    # If it looks like a path, load from file
+# Token lifetime requested from DocuSign; cached tokens are refreshed this many seconds before they expire
+TOKEN_EXPIRES_IN = 4000
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# Process-wide caches: access token (+ API client bound to it), resolved account ID, parsed private key
+_cache_lock = threading.Lock()
+_token: Optional[str] = None
+_token_expires_at = 0.0
+_api_client: Optional[ApiClient] = None
+_account_id: Optional[str] = None
+
+
+@lru_cache(maxsize=1)
+def _load_private_key(key: str) -> bytes:
     if "\n" not in key and len(key) < 200 and os.path.isfile(key):
         with open(key, "r") as f:
             return f.read().encode("ascii")
     return key.encode("ascii")
 
 
-def _get_access_token() -> str:
-    """Obtain JWT access token for DocuSign API."""
-    from docusign_esign.client.api_exception import ApiException
+def _get_private_key() -> bytes:
+    """Load RSA private key from env (contents or file path). File is read once per configured value."""
+    key = (settings.DOCUSIGN_PRIVATE_KEY or "").strip()
+    if not key:
+        raise ValueError("DOCUSIGN_PRIVATE_KEY not configured")
+    return _load_private_key(key)
+
 
+def _request_access_token() -> tuple[str, int]:
+    """Request a new JWT access token. Returns (token, lifetime in seconds)."""
     api_client = ApiClient()
     api_client.set_base_path(settings.DOCUSIGN_AUTH_SERVER)
     private_key = _get_private_key()
@@ -57,10 +75,14 @@ def _get_access_token() -> str:
             user_id=settings.DOCUSIGN_USER_ID,
             oauth_host_name=settings.DOCUSIGN_AUTH_SERVER,
             private_key_bytes=private_key,
-            expires_in=4000,
+            expires_in=TOKEN_EXPIRES_IN,
             scopes=SCOPES,
         )
-        return response.access_token
+        try:
+            expires_in = int(response.expires_in or TOKEN_EXPIRES_IN)
+        except (TypeError, ValueError):
+            expires_in = TOKEN_EXPIRES_IN
+        return response.access_token, expires_in
     except ApiException as e:
         body = e.body.decode("utf-8") if e.body else str(e)
         if "consent_required" in body:
@@ -71,31 +93,67 @@ def _get_access_token() -> str:
         raise
 
 
+def _get_access_token() -> str:
+    """JWT access token for DocuSign API, cached until shortly before it expires."""
+    global _token, _token_expires_at, _api_client
+    with _cache_lock:
+        if _token and time.monotonic() < _token_expires_at:
+            return _token
+        token, expires_in = _request_access_token()
+        _token = token
+        _token_expires_at = time.monotonic() + max(expires_in - TOKEN_REFRESH_MARGIN_SECONDS, 0)
+        _api_client = None
+        return token
+
+
+def clear_token_cache() -> None:
+    """Drop the cached token (e.g. after DocuSign rejects it); the next call requests a new one."""
+    global _token, _token_expires_at, _api_client
+    with _cache_lock:
+        _token = None
+        _token_expires_at = 0.0
+        _api_client = None
+
+
+def _clear_token_if_rejected(e: ApiException) -> None:
+    if e.status == 401:
+        logger.warning("DocuSign rejected cached access token; it will be refreshed on the next call")
+        clear_token_cache()
+
+
 def _get_api_client() -> ApiClient:
-    """Create DocuSign API client with JWT token."""
+    """DocuSign API client with JWT token. Reused (with its HTTP connection pool) while the token is valid."""
+    global _api_client
     token = _get_access_token()
-    api_client = ApiClient()
-    base = settings.DOCUSIGN_BASE_PATH.rstrip("/")
-    if not base.startswith("http"):
-        base = f"https://{base}"
-    api_client.host = f"{base}/restapi"
-    api_client.set_default_header("Authorization", f"Bearer {token}")
-    return api_client
+    with _cache_lock:
+        if _api_client is not None and _token == token:
+            return _api_client
+        api_client = ApiClient()
+        base = settings.DOCUSIGN_BASE_PATH.rstrip("/")
+        if not base.startswith("http"):
+            base = f"https://{base}"
+        api_client.host = f"{base}/restapi"
+        api_client.set_default_header("Authorization", f"Bearer {token}")
+        if _token == token:
+            _api_client = api_client
+        return api_client
 
 
 def _get_account_id() -> str:
-    """Get DocuSign account ID from settings or userinfo API."""
+    """Get DocuSign account ID from settings or userinfo API (looked up once per process)."""
+    global _account_id
     if settings.DOCUSIGN_ACCOUNT_ID:
         return settings.DOCUSIGN_ACCOUNT_ID
-    import httpx
+    if _account_id:
+        return _account_id
+    from app.services.http_clients import get_http_client
 
     token = _get_access_token()
     auth_server = settings.DOCUSIGN_AUTH_SERVER
     url = f"https://{auth_server}/oauth/userinfo"
-    resp = httpx.get(
+    resp = get_http_client("docusign").get(
         url,
         headers={"Authorization": f"Bearer {token}"},
-        timeout=10,
     )
     resp.raise_for_status()
     data = resp.json()
@@ -103,10 +161,13 @@ def _get_account_id() -> str:
     if not accounts:
         raise ValueError("No DocuSign accounts found for user. Set DOCUSIGN_ACCOUNT_ID in .env.")
     # Prefer default account
+    account_id = accounts[0]["account_id"]
     for acc in accounts:
         if acc.get("is_default"):
-            return acc["account_id"]
-    return accounts[0]["account_id"]
+            account_id = acc["account_id"]
+            break
+    _account_id = account_id
+    return account_id
 
 
 def create_envelope_and_get_signing_url(
@@ -137,35 +198,20 @@ def create_envelope_and_get_signing_url(
     )
 
     # Add Services Agreement with signature block if available
-    services_pdf_path = None
     if services_agreement_path and os.path.isfile(services_agreement_path):
-        import tempfile
-        from app.services.agreement_pdf import add_signature_block_to_services_agreement
-
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            services_pdf_path = tmp.name
-        try:
-            add_signature_block_to_services_agreement(
-                source_path=services_agreement_path,
-                output_path=services_pdf_path,
-                applicant_name=signer_name,
-            )
-            with open(services_pdf_path, "rb") as f:
-                doc2_bytes = base64.b64encode(f.read()).decode("ascii")
-            documents.append(
-                Document(
-                    document_base64=doc2_bytes,
-                    name="Services Agreement",
-                    file_extension="pdf",
-                    document_id="2",
-                )
+        from app.services.agreement_pdf import services_agreement_with_signature_block
+
+        doc2_bytes = base64.b64encode(
+            services_agreement_with_signature_block(services_agreement_path, signer_name)
+        ).decode("ascii")
+        documents.append(
+            Document(
+                document_base64=doc2_bytes,
+                name="Services Agreement",
+                file_extension="pdf",
+                document_id="2",
             )
-        finally:
-            if services_pdf_path and os.path.isfile(services_pdf_path):
-                try:
-                    os.unlink(services_pdf_path)
-                except OSError:
-                    pass
+        )
 
     signer = Signer(
         email=signer_email,
@@ -227,10 +273,14 @@ def create_envelope_and_get_signing_url(
     account_id = _get_account_id()
     envelope_api = EnvelopesApi(api_client)
 
-    envelope = envelope_api.create_envelope(
-        account_id=account_id,
-        envelope_definition=envelope_definition,
-    )
+    try:
+        envelope = envelope_api.create_envelope(
+            account_id=account_id,
+            envelope_definition=envelope_definition,
+        )
+    except ApiException as e:
+        _clear_token_if_rejected(e)
+        raise
     envelope_id = envelope.envelope_id
 
     recipient_view_request = RecipientViewRequest(
@@ -262,11 +312,15 @@ def download_completed_document(envelope_id: str, output_path: str) -> bool:
     account_id = _get_account_id()
     envelope_api = EnvelopesApi(api_client)
 
-    doc_bytes = envelope_api.get_document(
-        account_id=account_id,
-        envelope_id=envelope_id,
-        document_id="combined",
-    )
+    try:
+        doc_bytes = envelope_api.get_document(
+            account_id=account_id,
+            envelope_id=envelope_id,
+            document_id="combined",
+        )
+    except ApiException as e:
+        _clear_token_if_rejected(e)
+        raise
 
     # SDK may return bytes or file-like; handle both
     if hasattr(doc_bytes, "read"):
@@ -1,4 +1,9 @@
-"""Send emails (verification code, completion) via SMTP. From Path2ai.tech when configured."""
+"""Send emails (verification code, completion) via SMTP. From Path2ai.tech when configured.
+
+Each email has a build_* function (returns the MIME message) and a send_* function (builds and sends now
+on a pooled connection, see app.services.smtp_pool).
+Request handlers queue emails via app.services.email_outbox instead of sending inline.
+"""
 
 import logging
 import os
@@ -10,11 +15,30 @@ from email.mime.text import MIMEText
 from pathlib import Path
 
 from app.core.config import settings
+from app.services.smtp_pool import smtp_pool
 
 logger = logging.getLogger(__name__)
 
-# Avoid blocking the request forever if SMTP is slow or unreachable
-SMTP_TIMEOUT_SECONDS = 15
+
+def smtp_configured() -> bool:
+    return bool(settings.SMTP_HOST and settings.SMTP_USER)
+
+
+def _send_message(to_email: str, msg: MIMEMultipart, label: str) -> bool:
+    """Send one message on a pooled connection. Returns True if sent."""
+    try:
+        smtp_pool.send(to_email, msg)
+        logger.info("%s sent to %s", label, to_email)
+        return True
+    except smtplib.SMTPAuthenticationError as e:
+        logger.exception("SMTP login failed for %s: %s", to_email, e)
+        return False
+    except (OSError, TimeoutError) as e:
+        logger.exception("SMTP connection error (timeout or network) for %s: %s", to_email, e)
+        return False
+    except Exception as e:
+        logger.exception("Failed to send %s to %s: %s", label.lower(), to_email, e)
+        return False
 
 
 def _logo_url() -> str:
@@ -24,15 +48,8 @@ def _logo_url() -> str:
     return f"{base}/logo-path.png"
 
 
-def send_verification_code_email(to_email: str, code: str, expire_minutes: int = 15) -> bool:
-    """
-    Send 6-digit verification code email. From SMTP_FROM_EMAIL (e.g. noreply@path2ai.tech).
-    Returns True if sent, False if SMTP not configured or send failed.
-    """
-    if not settings.SMTP_HOST or not settings.SMTP_USER:
-        logger.warning("SMTP not configured (SMTP_HOST/SMTP_USER). Skipping send.")
-        return False
-
+def build_verification_code_email(to_email: str, code: str, expire_minutes: int = 15) -> MIMEMultipart:
+    """Build the 6-digit verification code email. From SMTP_FROM_EMAIL (e.g. noreply@path2ai.tech)."""
     logo_url = _logo_url()
     subject = "Your verification code - Path Boarding"
     html = f"""
@@ -75,36 +92,23 @@ def send_verification_code_email(to_email: str, code: str, expire_minutes: int =
     msg["To"] = to_email
     msg.attach(MIMEText(text, "plain"))
     msg.attach(MIMEText(html, "html"))
-
-    try:
-        with smtplib.SMTP(
-            settings.SMTP_HOST, settings.SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS
-        ) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.SMTP_FROM_EMAIL, [to_email], msg.as_string())
-        logger.info("Verification code email sent to %s", to_email)
-        return True
-    except smtplib.SMTPAuthenticationError as e:
-        logger.exception("SMTP login failed for %s: %s", to_email, e)
-        return False
-    except (OSError, TimeoutError) as e:
-        logger.exception("SMTP connection error (timeout or network) for %s: %s", to_email, e)
-        return False
-    except Exception as e:
-        logger.exception("Failed to send verification email to %s: %s", to_email, e)
-        return False
+    return msg
 
 
-def send_save_for_later_email(to_email: str, user_name: str) -> bool:
+def send_verification_code_email(to_email: str, code: str, expire_minutes: int = 15) -> bool:
     """
-    Send 'save for later' email with link to login page.
+    Send 6-digit verification code email now.
     Returns True if sent, False if SMTP not configured or send failed.
     """
-    if not settings.SMTP_HOST or not settings.SMTP_USER:
+    if not smtp_configured():
         logger.warning("SMTP not configured (SMTP_HOST/SMTP_USER). Skipping send.")
         return False
+    msg = build_verification_code_email(to_email, code, expire_minutes)
+    return _send_message(to_email, msg, "Verification code email")
 
+
+def build_save_for_later_email(to_email: str, user_name: str) -> MIMEMultipart:
+    """Build the 'save for later' email with link to login page."""
     logo_url = _logo_url()
     login_url = f"{settings.FRONTEND_BASE_URL.rstrip('/')}/board"
     
@@ -163,42 +167,31 @@ Path2ai.tech
     msg["To"] = to_email
     msg.attach(MIMEText(text, "plain"))
     msg.attach(MIMEText(html, "html"))
+    return msg
 
-    try:
-        with smtplib.SMTP(
-            settings.SMTP_HOST, settings.SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS
-        ) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.SMTP_FROM_EMAIL, [to_email], msg.as_string())
-        logger.info("Save for later email sent to %s", to_email)
-        return True
-    except smtplib.SMTPAuthenticationError as e:
-        logger.exception("SMTP login failed for %s: %s", to_email, e)
-        return False
-    except (OSError, TimeoutError) as e:
-        logger.exception("SMTP connection error (timeout or network) for %s: %s", to_email, e)
-        return False
-    except Exception as e:
-        logger.exception("Failed to send save for later email to %s: %s", to_email, e)
+
+def send_save_for_later_email(to_email: str, user_name: str) -> bool:
+    """
+    Send 'save for later' email now.
+    Returns True if sent, False if SMTP not configured or send failed.
+    """
+    if not smtp_configured():
+        logger.warning("SMTP not configured (SMTP_HOST/SMTP_USER). Skipping send.")
         return False
+    msg = build_save_for_later_email(to_email, user_name)
+    return _send_message(to_email, msg, "Save for later email")
 
 
-def send_completion_email(
+def build_completion_email(
     to_email: str,
     merchant_name: str,
     portal_url: str,
     pdf_path: str,
-) -> bool:
+) -> MIMEMultipart:
     """
-    Send completion email with Merchant Agreement PDF and Services Agreement attached.
+    Build the completion email with Merchant Agreement PDF and Services Agreement attached.
     Thanks merchant by name, advises attachments for reference, link to portal, support email.
-    Returns True if sent, False if SMTP not configured or send failed.
     """
-    if not settings.SMTP_HOST or not settings.SMTP_USER:
-        logger.warning("SMTP not configured (SMTP_HOST/SMTP_USER). Skipping completion email.")
-        return False
-
     logo_url = _logo_url()
     support_email = "support@path2ai.tech"
     display_name = (merchant_name or "Merchant").strip() or "Merchant"
@@ -287,22 +280,29 @@ Path2ai.tech
             msg.attach(part)
     else:
         logger.warning("Services Agreement not found at %s, skipping attachment", services_path)
+    return msg
 
-    try:
-        with smtplib.SMTP(
-            settings.SMTP_HOST, settings.SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS
-        ) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.SMTP_FROM_EMAIL, [to_email], msg.as_string())
-        logger.info("Completion email sent to %s", to_email)
-        return True
-    except smtplib.SMTPAuthenticationError as e:
-        logger.exception("SMTP login failed for %s: %s", to_email, e)
-        return False
-    except (OSError, TimeoutError) as e:
-        logger.exception("SMTP connection error for %s: %s", to_email, e)
-        return False
-    except Exception as e:
-        logger.exception("Failed to send completion email to %s: %s", to_email, e)
+
+def send_completion_email(
+    to_email: str,
+    merchant_name: str,
+    portal_url: str,
+    pdf_path: str,
+) -> bool:
+    """
+    Send completion email now (Merchant Agreement PDF and Services Agreement attached).
+    Returns True if sent, False if SMTP not configured or send failed.
+    """
+    if not smtp_configured():
+        logger.warning("SMTP not configured (SMTP_HOST/SMTP_USER). Skipping completion email.")
         return False
+    msg = build_completion_email(to_email, merchant_name, portal_url, pdf_path)
+    return _send_message(to_email, msg, "Completion email")
+
+
+# Outbox kind -> builder(to_email, **payload)
+EMAIL_BUILDERS = {
+    "verification_code": build_verification_code_email,
+    "save_for_later": build_save_for_later_email,
+    "completion": build_completion_email,
+}
@@ -0,0 +1,166 @@
+"""
+Durable outbound email queue.
+Handlers call queue_email() inside their own transaction; OutboxSender (one background thread per worker)
+claims batches of due rows with FOR UPDATE SKIP LOCKED, sends them with smtp_pool.send_many(),
+and retries failures with exponential backoff.
+"""
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.services.email import EMAIL_BUILDERS, smtp_configured
+from app.services.smtp_pool import smtp_pool
+
+logger = logging.getLogger(__name__)
+
+# Rows claimed (and locked) per batch
+BATCH_SIZE = 20
+# Upper bound for retry backoff
+RETRY_MAX_DELAY_SECONDS = 3600
+
+
+def queue_email(db: Session, kind: str, to_email: str, **payload) -> bool:
+    """
+    Add an email to the outbox in the caller's transaction; it is sent after the caller commits.
+    payload is passed to the builder for kind (see EMAIL_BUILDERS) and must be JSON-serialisable.
+    Returns False (and queues nothing) if SMTP is not configured. No I/O: async handlers pass db.sync_session.
+    """
+    if kind not in EMAIL_BUILDERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+    if not smtp_configured():
+        logger.warning("SMTP not configured (SMTP_HOST/SMTP_USER). Not queueing %s email.", kind)
+        return False
+    db.add(
+        EmailOutbox(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            to_email=to_email,
+            payload=payload,
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+    )
+    if not event.contains(db, "after_commit", _wake_sender):
+        event.listen(db, "after_commit", _wake_sender)
+    return True
+
+
+def _wake_sender(session: Session) -> None:
+    outbox_sender.wake()
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    delay = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(delay, RETRY_MAX_DELAY_SECONDS))
+
+
+class OutboxSender:
+    """Background thread that drains email_outbox through the shared SMTP pool."""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+        logger.info("Email outbox sender started")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        smtp_pool.close()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.process_due()
+            except Exception as e:
+                logger.exception("Email outbox sender error: %s", e)
+                processed = 0
+            if processed:
+                continue
+            smtp_pool.keepalive()
+            self._wake.wait(settings.EMAIL_OUTBOX_POLL_SECONDS)
+            self._wake.clear()
+
+    def process_due(self, limit: int = 200) -> int:
+        """Send up to limit due emails. Returns how many rows were processed (sent or rescheduled)."""
+        processed = 0
+        while processed < limit and not self._stop.is_set():
+            n = self._process_batch(min(BATCH_SIZE, limit - processed))
+            if not n:
+                break
+            processed += n
+        return processed
+
+    def _process_batch(self, batch_size: int) -> int:
+        db = SessionLocal()
+        try:
+            now = datetime.now(timezone.utc)
+            rows = (
+                db.query(EmailOutbox)
+                .filter(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not rows:
+                db.rollback()
+                return 0
+            errors: dict = {}
+            to_send = []
+            for row in rows:
+                row.attempts += 1
+                try:
+                    to_send.append((row, EMAIL_BUILDERS[row.kind](row.to_email, **(row.payload or {}))))
+                except Exception as e:
+                    errors[row.id] = e
+            results = smtp_pool.send_many([(row.to_email, msg) for row, msg in to_send])
+            for (row, _), err in zip(to_send, results):
+                if err is not None:
+                    errors[row.id] = err
+            for row in rows:
+                self._record_result(row, errors.get(row.id))
+            db.commit()
+            return len(rows)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _record_result(row: EmailOutbox, error: Optional[Exception]) -> None:
+        if error is None:
+            row.status = "sent"
+            row.sent_at = datetime.now(timezone.utc)
+            row.last_error = None
+            logger.info("Sent %s email to %s", row.kind, row.to_email)
+            return
+        row.last_error = f"{type(error).__name__}: {error}"[:1024]
+        if row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            row.status = "failed"
+            logger.error("Giving up on %s email to %s after %d attempts: %s", row.kind, row.to_email, row.attempts, error)
+        else:
+            row.next_attempt_at = datetime.now(timezone.utc) + _retry_delay(row.attempts)
+            logger.warning("Failed to send %s email to %s (attempt %d), will retry: %s", row.kind, row.to_email, row.attempts, error)
+
+
+outbox_sender = OutboxSender()
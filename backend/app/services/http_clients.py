@@ -0,0 +1,96 @@
+"""
+Pooled HTTP clients for third-party APIs (SumSub, TrueLayer, DocuSign, Ideal Postcodes).
+One httpx.Client and/or AsyncClient per provider per process, kept alive between calls so requests reuse
+connections (no DNS + TCP + TLS handshake per call). Created at app startup, closed on shutdown; processes without
+the app lifecycle (agreement job workers, CLIs) create them on first use.
+"""
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _Provider:
+    timeout: float
+    # Which flavours the app's call sites use (created eagerly at startup)
+    sync: bool = False
+    asynchronous: bool = False
+
+
+PROVIDERS = {
+    "sumsub": _Provider(timeout=30.0, asynchronous=True),
+    "truelayer": _Provider(timeout=15.0, asynchronous=True),
+    "docusign": _Provider(timeout=10.0, sync=True),
+    "ideal_postcodes": _Provider(timeout=10.0, asynchronous=True),
+}
+
+# HTTP/2 needs the h2 package (httpx[http2]); without it clients speak HTTP/1.1
+_HTTP2 = settings.HTTP_CLIENT_HTTP2 and importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_sync_clients: dict[str, httpx.Client] = {}
+_async_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def _client_options(provider: str) -> dict:
+    return {
+        "timeout": httpx.Timeout(PROVIDERS[provider].timeout, connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS),
+        "limits": httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "http2": _HTTP2,
+    }
+
+
+def get_http_client(provider: str) -> httpx.Client:
+    """Shared sync client for provider (thread-safe; do not close it)."""
+    client = _sync_clients.get(provider)
+    if client is None:
+        with _lock:
+            client = _sync_clients.get(provider)
+            if client is None:
+                client = _sync_clients[provider] = httpx.Client(**_client_options(provider))
+    return client
+
+
+def get_async_http_client(provider: str) -> httpx.AsyncClient:
+    """Shared async client for provider (bound to the app's event loop; do not close it)."""
+    client = _async_clients.get(provider)
+    if client is None:
+        with _lock:
+            client = _async_clients.get(provider)
+            if client is None:
+                client = _async_clients[provider] = httpx.AsyncClient(**_client_options(provider))
+    return client
+
+
+def start_http_clients() -> None:
+    """Create every provider's clients up front (app startup)."""
+    for name, provider in PROVIDERS.items():
+        if provider.sync:
+            get_http_client(name)
+        if provider.asynchronous:
+            get_async_http_client(name)
+    logger.info("HTTP clients ready (HTTP/2 %s)", "on" if _HTTP2 else "off")
+
+
+async def close_http_clients() -> None:
+    """Close all clients and their connections (app shutdown)."""
+    with _lock:
+        sync_clients = list(_sync_clients.values())
+        async_clients = list(_async_clients.values())
+        _sync_clients.clear()
+        _async_clients.clear()
+    for client in sync_clients:
+        client.close()
+    for client in async_clients:
+        await client.aclose()
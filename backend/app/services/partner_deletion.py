@@ -0,0 +1,308 @@
+"""
+Background partner (ISV) deletion.
+DELETE /admin/partners/{id} deactivates the partner and queues a PartnerDeletion. A worker thread then deletes
+everything boarded under the partner table by table with set-based DELETE ... WHERE id IN (SELECT ... LIMIT n),
+committing after every chunk so no transaction holds locks for long, removes the merchants' agreement PDFs and the
+partner logo from disk, and finally deletes the partner row. Progress (rows per table) is recorded on the job row.
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.auth import invalidate_partner
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.agreement_job import AgreementJob
+from app.models.boarding_archive import BoardingArchive
+from app.models.boarding_contact import BoardingContact
+from app.models.boarding_event import BoardingEvent
+from app.models.invite import Invite
+from app.models.invite_device_detail import InviteDeviceDetail
+from app.models.merchant import Merchant
+from app.models.merchant_user import MerchantUser
+from app.models.partner import Partner
+from app.models.partner_deletion import PartnerDeletion
+from app.models.product_package import ProductPackage
+from app.models.product_package_item import ProductPackageItem
+from app.models.verification_code import VerificationCode
+
+logger = logging.getLogger(__name__)
+
+# Jobs with no progress for this long are assumed lost (process killed) and are re-queued on startup
+STALE_RUNNING_AFTER = timedelta(minutes=10)
+# Passes over the tables before giving up when rows keep appearing (e.g. an invite created mid-deletion)
+MAX_PASSES = 3
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_stopping = threading.Event()
+
+
+class _Interrupted(Exception):
+    """Shutdown requested between chunks; the job is re-queued and resumes on next startup."""
+
+
+def create_partner_deletion(db: Session, partner: Partner) -> PartnerDeletion:
+    """
+    Deactivate the partner and add a queued deletion (caller commits, then calls submit_partner_deletion).
+    Returns the existing job instead if one is already queued or running for the partner.
+    """
+    partner.is_active = False
+    active = (
+        db.query(PartnerDeletion)
+        .filter(PartnerDeletion.partner_id == partner.id, PartnerDeletion.status.in_(("queued", "running")))
+        .first()
+    )
+    if active:
+        return active
+    job = PartnerDeletion(
+        id=str(uuid.uuid4()),
+        partner_id=partner.id,
+        partner_name=partner.name,
+        status="queued",
+        deleted={},
+        files_removed=0,
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # One deletion at a time per process keeps the extra DB load bounded
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="partner-deletion")
+        return _executor
+
+
+def submit_partner_deletion(job_id: str) -> None:
+    """Run a committed queued deletion in the background thread."""
+    future = _get_executor().submit(run_partner_deletion, job_id)
+    future.add_done_callback(lambda f: _on_done(job_id, f))
+
+
+def _on_done(job_id: str, future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Partner deletion %s did not complete: %s", job_id, future.exception())
+
+
+def resume_partner_deletions() -> int:
+    """Re-queue deletions lost with a previous process and submit all queued ones. Returns how many were submitted."""
+    _stopping.clear()
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        db.execute(
+            update(PartnerDeletion)
+            .where(PartnerDeletion.status == "running", PartnerDeletion.updated_at < now - STALE_RUNNING_AFTER)
+            .values(status="queued")
+        )
+        db.commit()
+        job_ids = [jid for (jid,) in db.query(PartnerDeletion.id).filter(PartnerDeletion.status == "queued").all()]
+    finally:
+        db.close()
+    for job_id in job_ids:
+        submit_partner_deletion(job_id)
+    return len(job_ids)
+
+
+def shutdown_partner_deletion_executor() -> None:
+    """Stop after the current chunk; an interrupted deletion is re-queued."""
+    global _executor
+    _stopping.set()
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _claim(db: Session, job_id: str) -> bool:
+    now = datetime.now(timezone.utc)
+    result = db.execute(
+        update(PartnerDeletion)
+        .where(PartnerDeletion.id == job_id, PartnerDeletion.status == "queued")
+        .values(status="running", started_at=now, updated_at=now)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def run_partner_deletion(job_id: str) -> None:
+    """Worker entry point: run one deletion and record its outcome."""
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return
+        job = db.query(PartnerDeletion).filter(PartnerDeletion.id == job_id).first()
+        try:
+            _delete_partner(db, job)
+        except _Interrupted:
+            db.rollback()
+            job.status = "queued"
+            db.commit()
+            return
+        except Exception as e:
+            logger.exception("Partner deletion %s failed: %s", job_id, e)
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)[:1024]
+        else:
+            job.status = "succeeded"
+            job.phase = None
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _delete_partner(db: Session, job: PartnerDeletion) -> None:
+    partner_id = job.partner_id
+    for _ in range(MAX_PASSES):
+        _delete_dependents(db, job)
+        logo_url = db.execute(select(Partner.logo_url).where(Partner.id == partner_id)).scalar_one_or_none()
+        job.phase = "partners"
+        try:
+            n = db.execute(delete(Partner).where(Partner.id == partner_id)).rowcount
+            _record(db, job, "partners", n)
+        except IntegrityError:
+            # Something was created under the partner since its table was cleared; go round again
+            db.rollback()
+            continue
+        invalidate_partner(partner_id)
+        if _remove_logo(logo_url):
+            job.files_removed += 1
+        return
+    raise RuntimeError("Partner still has data after repeated deletion passes")
+
+
+def _delete_dependents(db: Session, job: PartnerDeletion) -> None:
+    partner_id = job.partner_id
+    events = select(BoardingEvent.id).where(BoardingEvent.partner_id == partner_id)
+    contact_emails = (
+        select(BoardingContact.email)
+        .join(BoardingEvent, BoardingEvent.id == BoardingContact.boarding_event_id)
+        .where(BoardingEvent.partner_id == partner_id)
+    )
+    _delete_chunks(db, job, VerificationCode, select(VerificationCode.id).where(VerificationCode.contact.in_(contact_emails)))
+    _delete_chunks(db, job, BoardingContact, select(BoardingContact.id).where(BoardingContact.boarding_event_id.in_(events)))
+    _delete_chunks(
+        db,
+        job,
+        InviteDeviceDetail,
+        select(InviteDeviceDetail.id)
+        .join(Invite, Invite.id == InviteDeviceDetail.invite_id)
+        .where(Invite.partner_id == partner_id),
+    )
+    _delete_chunks(db, job, Invite, select(Invite.id).where(Invite.partner_id == partner_id))
+    _delete_chunks(db, job, BoardingEvent, events)
+    _delete_chunks(db, job, BoardingArchive, select(BoardingArchive.id).where(BoardingArchive.partner_id == partner_id))
+    _delete_merchants(db, job)
+    _delete_chunks(
+        db,
+        job,
+        ProductPackageItem,
+        select(ProductPackageItem.id)
+        .join(ProductPackage, ProductPackage.id == ProductPackageItem.package_id)
+        .where(ProductPackage.partner_id == partner_id),
+    )
+    _delete_chunks(db, job, ProductPackage, select(ProductPackage.id).where(ProductPackage.partner_id == partner_id))
+
+
+def _delete_chunks(db: Session, job: PartnerDeletion, model, ids) -> None:
+    """Delete rows of model whose id is selected by ids, PARTNER_DELETE_CHUNK_SIZE per transaction."""
+    table = model.__tablename__
+    job.phase = table
+    chunk = settings.PARTNER_DELETE_CHUNK_SIZE
+    while True:
+        if _stopping.is_set():
+            raise _Interrupted()
+        n = db.execute(
+            delete(model).where(model.id.in_(ids.limit(chunk))).execution_options(synchronize_session=False)
+        ).rowcount
+        _record(db, job, table, n)
+        if n < chunk:
+            return
+
+
+def _delete_merchants(db: Session, job: PartnerDeletion) -> None:
+    """Merchants with their users and agreement jobs, a chunk at a time; their agreement PDFs go after each commit."""
+    job.phase = "merchants"
+    chunk = settings.PARTNER_DELETE_CHUNK_SIZE
+    while True:
+        if _stopping.is_set():
+            raise _Interrupted()
+        merchant_ids = list(
+            db.execute(select(Merchant.id).where(Merchant.partner_id == job.partner_id).limit(chunk)).scalars()
+        )
+        if not merchant_ids:
+            return
+        opts = {"synchronize_session": False}
+        users = db.execute(delete(MerchantUser).where(MerchantUser.merchant_id.in_(merchant_ids)).execution_options(**opts))
+        jobs = db.execute(delete(AgreementJob).where(AgreementJob.merchant_id.in_(merchant_ids)).execution_options(**opts))
+        merchants = db.execute(delete(Merchant).where(Merchant.id.in_(merchant_ids)).execution_options(**opts))
+        _record(
+            db,
+            job,
+            merchant_users=users.rowcount,
+            agreement_jobs=jobs.rowcount,
+            merchants=merchants.rowcount,
+        )
+        # Saved with the next chunk's progress
+        job.files_removed += _remove_agreement_files(set(merchant_ids))
+
+
+def _record(db: Session, job: PartnerDeletion, table: Optional[str] = None, n: int = 0, **counts: int) -> None:
+    """Add deleted-row counts to the job and commit the chunk with its progress."""
+    if table:
+        counts[table] = n
+    deleted = dict(job.deleted or {})
+    for name, count in counts.items():
+        deleted[name] = deleted.get(name, 0) + count
+    job.deleted = deleted
+    job.updated_at = datetime.now(timezone.utc)
+    db.commit()
+
+
+def _remove_agreement_files(merchant_ids: set[str]) -> int:
+    """Unlink agreement-{merchant_id}-*.pdf and signed-{merchant_id}-*.pdf under UPLOAD_DIR/agreements."""
+    agreements_dir = Path(settings.UPLOAD_DIR) / "agreements"
+    removed = 0
+    try:
+        entries = os.scandir(agreements_dir)
+    except FileNotFoundError:
+        return 0
+    with entries:
+        for entry in entries:
+            prefix, _, rest = entry.name.partition("-")
+            if prefix in ("agreement", "signed") and rest[:36] in merchant_ids and entry.is_file():
+                try:
+                    os.unlink(entry.path)
+                    removed += 1
+                except OSError as e:
+                    logger.warning("Could not remove %s: %s", entry.path, e)
+    return removed
+
+
+def _remove_logo(logo_url: Optional[str]) -> bool:
+    """Remove the partner logo file (logo_url is like /uploads/partners/xxx.png)."""
+    if not logo_url or not logo_url.startswith("/uploads/partners/"):
+        return False
+    name = logo_url.replace("/uploads/partners/", "")
+    if not name or ".." in name:
+        return False
+    try:
+        (Path(settings.UPLOAD_DIR) / "partners" / name).unlink()
+        return True
+    except OSError:
+        return False
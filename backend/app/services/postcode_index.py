@@ -0,0 +1,152 @@
+"""
+Local UK postcode -> addresses index (offline address lookup backend).
+A CSV of addresses (PAF-style, one row per address) is compiled once into a single file that workers memory-map
+read-only, so the OS page cache holds one copy shared by every worker and a lookup is a binary search over the
+mapped keys:
+
+    header   MAGIC, u32 postcode count
+    keys     count x 8 bytes: normalised postcode ("SW1A 1AA"), ASCII, NUL padded, sorted
+    offsets  (count + 1) x u64: start of each postcode's addresses in data (relative to data)
+    data     per postcode, UTF-8 addresses separated by RS; fields line 1, line 2, town separated by US
+
+CLI (CSV needs postcode, line_1 and post_town columns; line_2 and line_3 are optional):
+    python -m app.services.postcode_index build addresses.csv postcodes.idx
+"""
+import argparse
+import bisect
+import csv
+import mmap
+import os
+import struct
+import sys
+from typing import Optional
+
+from app.services.address_lookup import UK_POSTCODE_REGEX, normalise_uk_postcode
+
+MAGIC = b"PCIDX001"
+_HEADER = struct.Struct("<8sI")
+KEY_SIZE = 8
+_OFFSET = struct.Struct("<Q")
+_RS, _US = "\x1e", "\x1f"
+
+
+class PostcodeIndexError(Exception):
+    """Index file missing, truncated or not a postcode index."""
+
+
+class _Keys:
+    """Sequence view of the mapped keys for bisect (no copy)."""
+
+    def __init__(self, mm: mmap.mmap, count: int):
+        self._mm = mm
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        start = _HEADER.size + i * KEY_SIZE
+        return self._mm[start:start + KEY_SIZE]
+
+
+class PostcodeIndex:
+    """Read-only memory-mapped index; lookup() takes a normalised postcode."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise PostcodeIndexError(f"{path}: not a postcode index") from e
+        try:
+            magic, count = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise PostcodeIndexError(f"{path}: not a postcode index")
+            self._offsets_start = _HEADER.size + count * KEY_SIZE
+            self._data_start = self._offsets_start + (count + 1) * _OFFSET.size
+            if len(self._mm) < self._data_start or len(self._mm) != self._data_start + self._offset(count):
+                raise PostcodeIndexError(f"{path}: truncated postcode index")
+        except (struct.error, PostcodeIndexError):
+            self._mm.close()
+            raise
+        self.count = count
+        self._keys = _Keys(self._mm, count)
+
+    def _offset(self, i: int) -> int:
+        return _OFFSET.unpack_from(self._mm, self._offsets_start + i * _OFFSET.size)[0]
+
+    def lookup(self, postcode: str) -> list:
+        """[{ addressLine1, addressLine2, town, postcode }] for the postcode; empty if not in the index."""
+        key = postcode.encode("ascii", "replace").ljust(KEY_SIZE, b"\0")
+        if len(key) != KEY_SIZE:
+            return []
+        i = bisect.bisect_left(self._keys, key)
+        if i == self.count or self._keys[i] != key:
+            return []
+        start, end = self._offset(i), self._offset(i + 1)
+        blob = self._mm[self._data_start + start:self._data_start + end].decode()
+        out = []
+        for record in blob.split(_RS):
+            line1, line2, town = record.split(_US)
+            out.append({"addressLine1": line1, "addressLine2": line2, "town": town, "postcode": postcode})
+        return out
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def _clean(value: Optional[str]) -> str:
+    # Separators can't appear inside fields
+    return " ".join((value or "").replace(_RS, " ").replace(_US, " ").split())
+
+
+def build_index(csv_path: str, index_path: str) -> tuple[int, int]:
+    """Compile the CSV into index_path (written to a temp file, then renamed). Returns (postcodes, addresses)."""
+    by_postcode: dict[bytes, list[str]] = {}
+    addresses = 0
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = {"postcode", "line_1", "post_town"} - set(reader.fieldnames or ())
+        if missing:
+            raise PostcodeIndexError(f"{csv_path}: missing column(s) {', '.join(sorted(missing))}")
+        for row in reader:
+            postcode = normalise_uk_postcode(row["postcode"] or "")
+            line1 = _clean(row["line_1"])
+            if not line1 or not UK_POSTCODE_REGEX.match(postcode):
+                continue
+            line2 = ", ".join(p for p in (_clean(row.get("line_2")), _clean(row.get("line_3"))) if p)
+            key = postcode.encode("ascii").ljust(KEY_SIZE, b"\0")
+            by_postcode.setdefault(key, []).append(_US.join((line1, line2, _clean(row["post_town"]))))
+            addresses += 1
+
+    keys = sorted(by_postcode)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, len(keys)))
+        out.writelines(keys)
+        blobs = [_RS.join(by_postcode[k]).encode() for k in keys]
+        offset = 0
+        for blob in blobs:
+            out.write(_OFFSET.pack(offset))
+            offset += len(blob)
+        out.write(_OFFSET.pack(offset))
+        out.writelines(blobs)
+    os.replace(tmp_path, index_path)
+    return len(keys), addresses
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local UK postcode index for address lookup.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Compile an address CSV into an index file")
+    build.add_argument("csv_path")
+    build.add_argument("index_path")
+    args = parser.parse_args(argv)
+
+    postcodes, addresses = build_index(args.csv_path, args.index_path)
+    print(f"{args.index_path}: {postcodes} postcode(s), {addresses} address(es)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
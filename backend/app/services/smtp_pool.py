@@ -0,0 +1,201 @@
+"""
+Pool of authenticated SMTP connections.
+Connections are reused across messages (no TCP + TLS + AUTH per send), checked with NOOP when they have been
+idle, and replaced when the server drops them. send_many() spreads a batch over up to SMTP_POOL_SIZE connections.
+"""
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.message import Message
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Avoid blocking forever if SMTP is slow or unreachable
+SMTP_TIMEOUT_SECONDS = 15
+
+# Server replied with an error: the connection is still usable, only this message failed
+SMTP_REPLY_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+    smtplib.SMTPResponseException,
+)
+
+
+def open_smtp_connection() -> smtplib.SMTP:
+    """Connect, STARTTLS and log in. Caller owns the connection (quit() when done)."""
+    server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+    try:
+        server.starttls()
+        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _close_quietly(conn: smtplib.SMTP) -> None:
+    try:
+        conn.quit()
+    except Exception:
+        conn.close()
+
+
+class SmtpPool:
+    """Up to size kept-alive SMTP connections shared by all threads in this process."""
+
+    def __init__(self, size: int, keepalive_seconds: float, max_idle_seconds: float):
+        self.size = max(size, 1)
+        self.keepalive_seconds = keepalive_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self._cond = threading.Condition()
+        # (connection, last used for a send, last known alive: used or NOOPed), most recently used last
+        self._idle: List[Tuple[smtplib.SMTP, float, float]] = []
+        self._open = 0
+
+    @contextmanager
+    def connection(self, verify: bool = False) -> Iterator[smtplib.SMTP]:
+        """
+        Check out a live connection (verify=True: NOOP any reused connection first, regardless of idle time).
+        It is discarded instead of returned if the block raises anything but a server reply error.
+        """
+        conn = self._acquire(verify)
+        try:
+            yield conn
+        except SMTP_REPLY_ERRORS:
+            self._release(conn)
+            raise
+        except BaseException:
+            self._discard(conn)
+            raise
+        self._release(conn)
+
+    def send(self, to_email: str, msg: Message) -> None:
+        """Send one message. Retries once on a verified connection if the pooled one was dropped."""
+        for attempt in range(2):
+            try:
+                with self.connection(verify=bool(attempt)) as conn:
+                    conn.sendmail(settings.SMTP_FROM_EMAIL, [to_email], msg.as_string())
+                return
+            except SMTP_REPLY_ERRORS:
+                raise
+            except OSError:
+                if attempt:
+                    raise
+
+    def send_many(self, messages: Sequence[Tuple[str, Message]]) -> List[Optional[Exception]]:
+        """
+        Send (to_email, msg) pairs over up to size connections in parallel.
+        Returns one entry per message, in order: None if sent, else the exception.
+        """
+        results: List[Optional[Exception]] = [None] * len(messages)
+        if not messages:
+            return results
+        workers = min(self.size, len(messages))
+
+        def send_slice(start: int) -> None:
+            for i in range(start, len(messages), workers):
+                to_email, msg = messages[i]
+                try:
+                    self.send(to_email, msg)
+                except Exception as e:
+                    results[i] = e
+
+        if workers == 1:
+            send_slice(0)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smtp-send") as ex:
+                list(ex.map(send_slice, range(workers)))
+        return results
+
+    def keepalive(self) -> None:
+        """
+        NOOP idle connections not used or checked for keepalive_seconds; close those that fail NOOP or have not
+        sent anything for max_idle_seconds (NOOPs keep a connection alive but don't count as use).
+        """
+        now = time.monotonic()
+        with self._cond:
+            idle, self._idle = self._idle, []
+        keep: List[Tuple[smtplib.SMTP, float, float]] = []
+        for conn, last_used, last_alive in idle:
+            if now - last_used > self.max_idle_seconds:
+                self._discard(conn)
+            elif now - last_alive <= self.keepalive_seconds:
+                keep.append((conn, last_used, last_alive))
+            elif self._noop(conn):
+                keep.append((conn, last_used, now))
+            else:
+                self._discard(conn)
+        with self._cond:
+            self._idle = keep + self._idle
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Close all idle connections (e.g. on shutdown)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def _acquire(self, verify: bool = False) -> smtplib.SMTP:
+        deadline = time.monotonic() + SMTP_TIMEOUT_SECONDS
+        while True:
+            with self._cond:
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a pooled SMTP connection")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used, last_alive = self._idle.pop()
+                else:
+                    conn = None
+                    self._open += 1
+            if conn is None:
+                try:
+                    return open_smtp_connection()
+                except BaseException:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+            now = time.monotonic()
+            if now - last_used <= self.max_idle_seconds:
+                if now - last_alive <= self.keepalive_seconds and not verify:
+                    return conn
+                if self._noop(conn):
+                    return conn
+            self._discard(conn)
+
+    def _release(self, conn: smtplib.SMTP) -> None:
+        with self._cond:
+            now = time.monotonic()
+            self._idle.append((conn, now, now))
+            self._cond.notify()
+
+    def _discard(self, conn: smtplib.SMTP) -> None:
+        _close_quietly(conn)
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _noop(conn: smtplib.SMTP) -> bool:
+        try:
+            code, _ = conn.noop()
+        except (OSError, smtplib.SMTPException):
+            return False
+        return code == 250
+
+
+smtp_pool = SmtpPool(
+    settings.SMTP_POOL_SIZE,
+    keepalive_seconds=settings.SMTP_POOL_KEEPALIVE_SECONDS,
+    max_idle_seconds=settings.SMTP_POOL_MAX_IDLE_SECONDS,
+)
@@ -7,6 +7,7 @@ from typing import Dict, Any, Optional
 import httpx
 
 from app.core.config import settings
+from app.services.http_clients import get_async_http_client
 
 
 def _generate_signature(
@@ -111,13 +112,12 @@ async def generate_access_token(
     logger.info(f"Request headers: {headers}")
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, headers=headers)
-            logger.info(f"SumSub response status: {response.status_code}")
-            response.raise_for_status()
-            result = response.json()
-            logger.info(f"SumSub token generated successfully for userId={params['userId']}")
-            return result
+        response = await get_async_http_client("sumsub").post(url, headers=headers)
+        logger.info(f"SumSub response status: {response.status_code}")
+        response.raise_for_status()
+        result = response.json()
+        logger.info(f"SumSub token generated successfully for userId={params['userId']}")
+        return result
     except httpx.HTTPStatusError as e:
         # Log the response for debugging
         logger.error(f"SumSub API error: {e.response.status_code} - {e.response.text}")
@@ -144,7 +144,6 @@ async def get_applicant_status(user_id: str) -> Dict[str, Any]:
     headers = _get_headers("GET", path)
     url = settings.SUMSUB_BASE_URL + path
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    response = await get_async_http_client("sumsub").get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
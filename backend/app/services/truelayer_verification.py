@@ -4,17 +4,19 @@ Uses Data API (info) and Verification API to verify:
 1. Bank account name (user-provided) vs account holder - fuzzy match
 2. Sort code + account number - 100% exact match
 3. Account holders vs directors - fuzzy match
+Calls go through the shared pooled async client; the info and verification calls run concurrently.
 """
+import asyncio
 import logging
 import re
 import secrets
 from typing import Any, Optional, Tuple
 from urllib.parse import urlencode
 
-import httpx
 from rapidfuzz import fuzz
 
 from app.core.config import settings
+from app.services.http_clients import get_async_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +69,7 @@ def build_auth_url(state: str) -> str:
     return f"{base}/?{urlencode(params)}"
 
 
-def exchange_code_for_token(code: str) -> str:
+async def exchange_code_for_token(code: str) -> str:
     """Exchange authorization code for access token. Returns access_token."""
     if not settings.TRUELAYER_CLIENT_ID or not settings.TRUELAYER_CLIENT_SECRET:
         raise ValueError("TrueLayer not configured")
@@ -81,30 +83,30 @@ def exchange_code_for_token(code: str) -> str:
         "code": code,
     }
 
-    with httpx.Client(timeout=15) as client:
-        resp = client.post(token_url, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"})
-        resp.raise_for_status()
-        body = resp.json()
+    resp = await get_async_http_client("truelayer").post(
+        token_url, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    resp.raise_for_status()
+    body = resp.json()
     access_token = body.get("access_token")
     if not access_token:
         raise ValueError("No access_token in TrueLayer token response")
     return access_token
 
 
-def get_user_info(access_token: str) -> Optional[str]:
+async def get_user_info(access_token: str) -> Optional[str]:
     """GET /data/v1/info - returns full_name of the person who connected the bank (director)."""
     api_base = settings.TRUELAYER_API_URL.rstrip("/")
     url = f"{api_base}/data/v1/info"
 
-    with httpx.Client(timeout=15) as client:
-        resp = client.get(
-            url,
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        if resp.status_code != 200:
-            logger.warning("TrueLayer info API returned %s: %s", resp.status_code, resp.text[:200])
-            return None
-        data = resp.json()
+    resp = await get_async_http_client("truelayer").get(
+        url,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    if resp.status_code != 200:
+        logger.warning("TrueLayer info API returned %s: %s", resp.status_code, resp.text[:200])
+        return None
+    data = resp.json()
 
     results = data.get("results") or []
     if not results:
@@ -113,7 +115,7 @@ def get_user_info(access_token: str) -> Optional[str]:
     return first.get("full_name")
 
 
-def verify_account(
+async def verify_account(
     access_token: str,
     name_to_verify: str,
 ) -> dict[str, Any]:
@@ -124,17 +126,16 @@ def verify_account(
     api_base = settings.TRUELAYER_API_URL.rstrip("/")
     url = f"{api_base}/verification/v1/verify"
 
-    with httpx.Client(timeout=15) as client:
-        resp = client.post(
-            url,
-            headers={
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json",
-            },
-            json={"name": name_to_verify},
-        )
-        resp.raise_for_status()
-        data = resp.json()
+    resp = await get_async_http_client("truelayer").post(
+        url,
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        },
+        json={"name": name_to_verify},
+    )
+    resp.raise_for_status()
+    data = resp.json()
 
     return {
         "verified": data.get("verified", False),
@@ -181,7 +182,7 @@ def _extract_uk_sort_code_and_account_from_iban(iban: Optional[str]) -> Tuple[st
     return "", ""
 
 
-def run_verification(
+async def run_verification(
     access_token: str,
     user_bank_account_name: str,
     user_sort_code: Optional[str],
@@ -209,11 +210,11 @@ def run_verification(
     """
     director_name = f"{director_first_name or ''} {director_last_name or ''}".strip()
 
-    # 1. Get user info (director who connected)
-    info_full_name = get_user_info(access_token)
-
-    # 2. Verify with company name to get report of accounts
-    verification = verify_account(access_token, company_name or user_bank_account_name or " ")
+    # User info (director who connected) and verification with company name (report of accounts) are independent
+    info_full_name, verification = await asyncio.gather(
+        get_user_info(access_token),
+        verify_account(access_token, company_name or user_bank_account_name or " "),
+    )
     report = verification.get("report") or []
     account_holder_name = verification.get("account_holder_name")
 
@@ -0,0 +1,80 @@
+"""
+Verification code sweeper.
+Codes are only looked up while unused and unexpired, so rows that expired or were used more than
+VERIFICATION_CODE_RETENTION_HOURS ago are deleted by a background thread (one per worker) every
+VERIFICATION_CODE_SWEEP_INTERVAL_SECONDS, in batches of VERIFICATION_CODE_SWEEP_BATCH_SIZE. Batches lock their rows
+with SKIP LOCKED, so workers sweeping at the same time don't wait on each other.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, or_, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.verification_code import VerificationCode
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_verification_codes(stop: Optional[threading.Event] = None) -> int:
+    """Delete expired and used codes past retention. Returns how many rows were removed."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.VERIFICATION_CODE_RETENTION_HOURS)
+    batch = settings.VERIFICATION_CODE_SWEEP_BATCH_SIZE
+    stale = (
+        select(VerificationCode.id)
+        .where(or_(VerificationCode.expires_at < cutoff, VerificationCode.used_at < cutoff))
+        .limit(batch)
+        .with_for_update(skip_locked=True)
+    )
+    removed = 0
+    db = SessionLocal()
+    try:
+        while stop is None or not stop.is_set():
+            n = db.execute(
+                delete(VerificationCode)
+                .where(VerificationCode.id.in_(stale))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            removed += n
+            if n < batch:
+                break
+    finally:
+        db.close()
+    return removed
+
+
+class VerificationCodeSweeper:
+    """Background thread running sweep_verification_codes() on an interval."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="verification-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                removed = sweep_verification_codes(self._stop)
+                if removed:
+                    logger.info("Verification code sweep removed %d row(s)", removed)
+            except Exception as e:
+                logger.exception("Verification code sweep failed: %s", e)
+            self._stop.wait(settings.VERIFICATION_CODE_SWEEP_INTERVAL_SECONDS)
+
+
+verification_sweeper = VerificationCodeSweeper()
@@ -0,0 +1,129 @@
+"""
+Query-count regression tests for product package endpoints: packages, their items and the items' catalog products
+are eager-loaded, so the number of statements must not grow with the number of packages or items (no N+1).
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import Page
+from app.models import (
+    BoardingEvent,
+    FeeSchedule,
+    Invite,
+    InviteDeviceDetail,
+    Partner,
+    ProductCatalog,
+    ProductPackage,
+    ProductPackageItem,
+)
+from app.routers.admin import admin_list_product_packages
+from app.routers.boarding import get_invite_info
+from app.routers.partners import list_product_packages
+
+# packages + items (with catalog products joined)
+LIST_QUERIES = 2
+# partner lookup + LIST_QUERIES
+ADMIN_LIST_QUERIES = 1 + LIST_QUERIES
+# invite context + package + items (with catalog products joined) + device details
+INVITE_INFO_QUERIES = 4
+
+
+def _id() -> str:
+    return str(uuid.uuid4())
+
+
+def _partner(db) -> Partner:
+    fee_schedule = FeeSchedule(id=_id(), name="Default", rates={})
+    partner = Partner(
+        id=_id(), name="ISV", email=f"{uuid.uuid4().hex[:8]}@example.com", hashed_password="x",
+        fee_schedule_id=fee_schedule.id, is_active=True,
+    )
+    db.add_all([fee_schedule, partner])
+    db.commit()
+    return partner
+
+
+def _packages(db, partner: Partner, packages: int, items: int) -> list[ProductPackage]:
+    created = []
+    for p in range(packages):
+        pkg = ProductPackage(id=_id(), partner_id=partner.id, uid=f"PKG-{uuid.uuid4().hex[:6]}", name=f"Package {p}")
+        db.add(pkg)
+        for i in range(items):
+            cat = ProductCatalog(
+                id=_id(), product_type="physical_pos", product_code=uuid.uuid4().hex[:12], name=f"Product {i}",
+                requires_store_epos=True,
+            )
+            db.add_all([cat, ProductPackageItem(id=_id(), package_id=pkg.id, catalog_product_id=cat.id, config={}, sort_order=i)])
+        created.append(pkg)
+    db.commit()
+    return created
+
+
+def _invite(db, partner: Partner, pkg: ProductPackage, device_details: int) -> str:
+    event = BoardingEvent(id=_id(), partner_id=partner.id, current_step=1)
+    invite = Invite(
+        id=_id(), partner_id=partner.id, boarding_event_id=event.id, token=uuid.uuid4().hex,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=1), product_package_id=pkg.id,
+    )
+    db.add_all([event, invite])
+    for item in pkg.items[:device_details]:
+        db.add(InviteDeviceDetail(id=_id(), invite_id=invite.id, package_item_id=item.id, store_name="Store"))
+    db.commit()
+    return invite.token
+
+
+def _list_kwargs() -> dict:
+    return {"response": Response(), "page": Page(limit=100, cursor=None), "name": None, "created_after": None, "created_before": None}
+
+
+@pytest.mark.parametrize("packages,items", [(1, 1), (5, 4)])
+def test_list_product_packages_query_count(db, query_counter, packages, items):
+    partner = _partner(db)
+    _packages(db, partner, packages, items)
+    db.expunge_all()
+
+    with query_counter:
+        result = list_product_packages(db=db, partner=partner, **_list_kwargs())
+
+    assert len(result) == packages
+    assert all(len(pkg.items) == items and pkg.items[0].product_code for pkg in result)
+    assert query_counter.count == LIST_QUERIES
+
+
+@pytest.mark.parametrize("packages,items", [(1, 1), (5, 4)])
+def test_admin_list_product_packages_query_count(db, query_counter, packages, items):
+    partner = _partner(db)
+    _packages(db, partner, packages, items)
+    partner_id = partner.id
+    db.expunge_all()
+
+    with query_counter:
+        result = admin_list_product_packages(partner_id=partner_id, db=db, admin=None, **_list_kwargs())
+
+    assert len(result) == packages
+    assert all(len(pkg.items) == items and pkg.items[0].product_code for pkg in result)
+    assert query_counter.count == ADMIN_LIST_QUERIES
+
+
+@pytest.mark.parametrize("items,device_details", [(1, 1), (6, 3)])
+def test_get_invite_info_query_count(db, async_engine, items, device_details):
+    partner = _partner(db)
+    (pkg,) = _packages(db, partner, 1, items)
+    token = _invite(db, partner, pkg, device_details)
+    engine, query_counter = async_engine
+
+    async def call():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            with query_counter:
+                return await get_invite_info(token=token, db=session)
+
+    result = asyncio.run(call())
+
+    assert len(result.product_package.items) == items
+    assert all(item.product_code for item in result.product_package.items)
+    assert query_counter.count == INVITE_INFO_QUERIES
@@ -0,0 +1,102 @@
+"""Local postcode index: build from a CSV fixture, lookups, and how a bad index file surfaces at the endpoint."""
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.routers.boarding import address_lookup
+from app.services import address_lookup as address_lookup_service
+from app.services.address_lookup import normalise_uk_postcode
+from app.services.postcode_index import MAGIC, PostcodeIndex, PostcodeIndexError, build_index
+
+FIXTURE_CSV = Path(__file__).parent / "fixtures" / "addresses.csv"
+
+
+@pytest.fixture
+def index_path(tmp_path) -> Path:
+    path = tmp_path / "postcodes.idx"
+    build_index(str(FIXTURE_CSV), str(path))
+    return path
+
+
+@pytest.fixture
+def index(index_path):
+    idx = PostcodeIndex(str(index_path))
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def local_backend(monkeypatch):
+    """Endpoint on the local index backend; set ADDRESS_LOOKUP_UK_INDEX_PATH with monkeypatch in the test."""
+    monkeypatch.setattr(settings, "ADDRESS_LOOKUP_UK_BACKEND", "local")
+    monkeypatch.setattr(address_lookup_service, "_backend", None)
+    yield
+    asyncio.run(address_lookup_service.close_address_lookup())
+
+
+def test_build_index_counts(tmp_path):
+    # Rows with an invalid postcode or no line 1 are skipped
+    assert build_index(str(FIXTURE_CSV), str(tmp_path / "postcodes.idx")) == (3, 5)
+
+
+def test_lookup_hit(index):
+    assert index.lookup("M1 1AE") == [
+        {"addressLine1": "1 Piccadilly Gardens", "addressLine2": "", "town": "MANCHESTER", "postcode": "M1 1AE"}
+    ]
+
+
+def test_lookup_miss(index):
+    assert index.lookup("SW1A 2AA") == []
+    assert index.lookup("ZZ99 9ZZ") == []
+
+
+@pytest.mark.parametrize("raw", ["SW1A 1AA", "sw1a1aa", "Sw1A1Aa", " sw1a 1aa "])
+def test_postcode_forms_share_a_key(index, raw):
+    addresses = index.lookup(normalise_uk_postcode(raw))
+    assert [a["addressLine1"] for a in addresses] == ["Buckingham Palace", "The Royal Mews"]
+
+
+def test_line_2_and_line_3_joined(index):
+    addresses = index.lookup("EC1A 1BB")
+    assert [(a["addressLine1"], a["addressLine2"]) for a in addresses] == [
+        ("Flat 2", "12 Long Lane, Barbican"),
+        ("Flat 1", "12 Long Lane"),
+    ]
+
+
+def test_truncated_index_raises(index_path):
+    data = index_path.read_bytes()
+    index_path.write_bytes(data[:-5])
+    with pytest.raises(PostcodeIndexError):
+        PostcodeIndex(str(index_path))
+
+
+def test_wrong_magic_raises(index_path):
+    data = index_path.read_bytes()
+    index_path.write_bytes(b"X" * len(MAGIC) + data[len(MAGIC):])
+    with pytest.raises(PostcodeIndexError):
+        PostcodeIndex(str(index_path))
+
+
+def test_empty_file_raises(tmp_path):
+    path = tmp_path / "empty.idx"
+    path.write_bytes(b"")
+    with pytest.raises(PostcodeIndexError):
+        PostcodeIndex(str(path))
+
+
+def test_endpoint_uses_local_index(local_backend, monkeypatch, index_path):
+    monkeypatch.setattr(settings, "ADDRESS_LOOKUP_UK_INDEX_PATH", str(index_path))
+    addresses = asyncio.run(address_lookup(postcode="ec1a1bb"))
+    assert [a["addressLine1"] for a in addresses] == ["Flat 2", "Flat 1"]
+
+
+def test_endpoint_bad_index_is_503(local_backend, monkeypatch, index_path):
+    index_path.write_bytes(b"not a postcode index")
+    monkeypatch.setattr(settings, "ADDRESS_LOOKUP_UK_INDEX_PATH", str(index_path))
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(address_lookup(postcode="M1 1AE"))
+    assert exc_info.value.status_code == 503
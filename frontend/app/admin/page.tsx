@@ -4,7 +4,7 @@ import Image from "next/image";
 import Link from "next/link";
 import { useRouter } from "next/navigation";
 import { useCallback, useEffect, useState } from "react";
-import { API_BASE, apiGet, apiPatch, apiPost, apiDelete } from "@/lib/api";
+import { API_BASE, apiGet, apiGetAll, apiPatch, apiPost, apiDelete } from "@/lib/api";
 import { ProductPackageWizard, type CatalogProduct, type WizardItem } from "@/components/ProductPackageWizard";
 
 const ADMIN_TOKEN_KEY = "path_admin_token";
@@ -12,6 +12,7 @@ const ADMIN_TOKEN_KEY = "path_admin_token";
 type AdminUser = { id: string; username: string; created_at: string };
 type Partner = { id: string; name: string; email: string; external_id?: string | null; logo_url?: string | null; merchant_support_email?: string | null; merchant_support_phone?: string | null; is_active: boolean; fee_schedule_id: string; created_at: string };
 type FeeSchedule = { id: string; name: string; rates: Record<string, Record<string, number>> };
+type PartnerDeletion = { id: string; partner_id: string; status: "queued" | "running" | "succeeded" | "failed"; phase?: string | null; deleted: Record<string, number>; files_removed: number; error?: string | null };
 
 type PackageItem = { id: string; catalog_product_id: string; product_code?: string; product_name?: string; product_type?: string; config?: Record<string, unknown>; sort_order: number; requires_store_epos: boolean };
 type ProductPackage = { id: string; partner_id: string; uid: string; name: string; description?: string; items: PackageItem[]; created_at?: string };
@@ -84,7 +85,7 @@ export default function AdminPage() {
 
   const loadAdmins = useCallback(async () => {
     if (!token) return;
-    const res = await apiGet<AdminUser[]>("/admin/users", { headers: authHeaders(token) });
+    const res = await apiGetAll<AdminUser>("/admin/users", { headers: authHeaders(token) });
     if (isUnauthorized(res)) {
       clearAdminAndRedirect();
       return;
@@ -94,7 +95,7 @@ export default function AdminPage() {
 
   const loadPartners = useCallback(async () => {
     if (!token) return;
-    const res = await apiGet<Partner[]>("/admin/partners", { headers: authHeaders(token) });
+    const res = await apiGetAll<Partner>("/admin/partners", { headers: authHeaders(token) });
     if (isUnauthorized(res)) {
       clearAdminAndRedirect();
       return;
@@ -104,7 +105,7 @@ export default function AdminPage() {
 
   const loadFeeSchedules = useCallback(async () => {
     if (!token) return;
-    const res = await apiGet<FeeSchedule[]>("/admin/fee-schedules", { headers: authHeaders(token) });
+    const res = await apiGetAll<FeeSchedule>("/admin/fee-schedules", { headers: authHeaders(token) });
     if (isUnauthorized(res)) {
       clearAdminAndRedirect();
       return;
@@ -319,7 +320,7 @@ export default function AdminPage() {
       setUpdatePartnerError(json.detail ?? json.message ?? "Delete failed");
       return;
     }
-    setUpdatePartnerMessage("Partner deleted.");
+    setUpdatePartnerMessage("Deleting partner…");
     setSelectedPartnerId("");
     setPartnerNameEdit("");
     setPartnerEmailEdit("");
@@ -327,6 +328,24 @@ export default function AdminPage() {
     setPartnerPasswordNewConfirm("");
     setPartnerLogoFile(null);
     loadPartners();
+    // Deletion runs in the background; poll until it finishes
+    let deletion = json as PartnerDeletion;
+    while (deletion.status === "queued" || deletion.status === "running") {
+      await new Promise((r) => setTimeout(r, 1000));
+      const poll = await apiGet<PartnerDeletion>(`/admin/partner-deletions/${deletion.id}`, { headers: authHeaders(token) });
+      if (poll.error) {
+        setUpdatePartnerError(poll.error);
+        return;
+      }
+      deletion = poll.data;
+    }
+    if (deletion.status === "failed") {
+      setUpdatePartnerMessage(null);
+      setUpdatePartnerError(deletion.error ?? "Delete failed");
+    } else {
+      setUpdatePartnerMessage("Partner deleted.");
+    }
+    loadPartners();
   }
 
   const selectedPartner = partners.find((p) => p.id === selectedPartnerId);
@@ -829,7 +848,7 @@ function AdminProductPackagesSection({
     if (!token) return;
     let cancelled = false;
     (async () => {
-      const res = await apiGet<CatalogProduct[]>("/admin/product-catalog", { headers: authHeaders(token) });
+      const res = await apiGetAll<CatalogProduct>("/admin/product-catalog", { headers: authHeaders(token) });
       if (cancelled) return;
       if (res.error && (res as { statusCode?: number }).statusCode === 401) {
         clearAdminAndRedirect();
@@ -851,7 +870,7 @@ function AdminProductPackagesSection({
     const partner = partners.find((p) => p.id === pkgPartnerId);
     (async () => {
       const [pkgRes, feeRes] = await Promise.all([
-        apiGet<ProductPackage[]>(`/admin/partners/${pkgPartnerId}/product-packages`, { headers: authHeaders(token) }),
+        apiGetAll<ProductPackage>(`/admin/partners/${pkgPartnerId}/product-packages`, { headers: authHeaders(token) }),
         partner?.fee_schedule_id
           ? apiGet<FeeSchedule>(`/admin/fee-schedules/${partner.fee_schedule_id}`, { headers: authHeaders(token) })
           : Promise.resolve({ data: null as FeeSchedule | null }),
@@ -996,7 +1015,7 @@ function AdminProductPackagesSection({
               setEditingPackageId(null);
               setSuccessMsg(editingPackageId ? "Package updated." : `Package created. UID: ${uid}`);
               if (token && pkgPartnerId) {
-                apiGet<ProductPackage[]>(`/admin/partners/${pkgPartnerId}/product-packages`, { headers: authHeaders(token) }).then((r) => {
+                apiGetAll<ProductPackage>(`/admin/partners/${pkgPartnerId}/product-packages`, { headers: authHeaders(token) }).then((r) => {
                   if (r.data) setPackages(r.data);
                 });
               }
@@ -322,6 +322,7 @@ export default function BoardingEntryPage() {
   const [bankVerifying, setBankVerifying] = useState(false);
   const [bankVerificationMessage, setBankVerificationMessage] = useState<string | null>(null);
   const [bankVerified, setBankVerified] = useState<boolean | null>(null);
+  const [bankVerificationPending, setBankVerificationPending] = useState(false);
   const [reviewAgreeChecked, setReviewAgreeChecked] = useState(false);
   const [reviewSubmitting, setReviewSubmitting] = useState(false);
   const [regenerating, setRegenerating] = useState(false);
@@ -735,7 +736,11 @@ export default function BoardingEntryPage() {
     if (stepParam === "step6" && token) {
       setStep("step6");
       setBankConfirmationChecked(true); // restore – user had it checked to reach Verify
-      if (verifiedParam !== null) {
+      if (verifiedParam === "pending") {
+        setBankVerified(null);
+        setBankVerificationPending(true);
+        setBankVerificationMessage("Verifying your bank account...");
+      } else if (verifiedParam !== null) {
         setBankVerified(verifiedParam === "1");
         if (messageParam) setBankVerificationMessage(decodeURIComponent(messageParam));
       }
@@ -762,6 +767,25 @@ export default function BoardingEntryPage() {
     }
   }, [searchParams, token, router]);
 
+  // Bank verification finishing in the background: wait for the result on the boarding status stream
+  useEffect(() => {
+    if (!bankVerificationPending || !token) return;
+    const source = new EventSource(`${API_BASE}/boarding/events?token=${encodeURIComponent(token)}`);
+    source.addEventListener("status", async (e) => {
+      const status = JSON.parse((e as MessageEvent).data) as { truelayer_verified?: boolean | null };
+      if (status.truelayer_verified == null) return;
+      source.close();
+      const res = await apiGet<{
+        truelayer_verified?: boolean | null;
+        truelayer_verification_message?: string | null;
+      }>(`/boarding/saved-data?token=${encodeURIComponent(token)}`);
+      setBankVerified(res.data?.truelayer_verified ?? status.truelayer_verified);
+      setBankVerificationMessage(res.data?.truelayer_verification_message ?? null);
+      setBankVerificationPending(false);
+    });
+    return () => source.close();
+  }, [bankVerificationPending, token]);
+
   // Pre-populate directors when company is confirmed: matching verified user + Louise for demo
   const verifiedUserName = [legalFirstName.trim(), legalLastName.trim()].filter(Boolean).join(" ");
   useEffect(() => {
@@ -3548,7 +3572,7 @@ export default function BoardingEntryPage() {
                   <button
                     type="button"
                     onClick={handleVerifyWithBank}
-                    disabled={!step6Valid || bankVerifying || bankVerified === true}
+                    disabled={!step6Valid || bankVerifying || bankVerificationPending || bankVerified === true}
                     className="w-full py-3 px-4 rounded-lg font-medium border-2 border-path-primary text-path-primary bg-white hover:bg-path-primary/5 transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
                   >
                     {bankVerifying ? "Redirecting to your bank..." : "Verify with my bank"}
@@ -3846,6 +3870,7 @@ export default function BoardingEntryPage() {
                     agreement_pdf_path?: string;
                     redirect_to_signing?: boolean;
                     signing_url?: string;
+                    job_id?: string;
                   }>(
                     `/boarding/submit-review?token=${encodeURIComponent(token ?? "")}`,
                     {}
@@ -3855,8 +3880,39 @@ export default function BoardingEntryPage() {
                     setReviewSubmitting(false);
                     return;
                   }
-                  if (res.data?.redirect_to_signing && res.data?.signing_url) {
-                    window.location.href = res.data.signing_url;
+                  let result: { redirect_to_signing?: boolean; signing_url?: string | null } | undefined = res.data;
+                  // Agreement is generated in the background: poll the job until it finishes
+                  if (res.data?.job_id) {
+                    const jobPath = `/boarding/agreement-job/${encodeURIComponent(res.data.job_id)}?token=${encodeURIComponent(token ?? "")}`;
+                    const deadline = Date.now() + 120000;
+                    result = undefined;
+                    while (Date.now() < deadline) {
+                      await new Promise((r) => setTimeout(r, 1000));
+                      const jobRes = await apiGet<{
+                        status: string;
+                        redirect_to_signing?: boolean;
+                        signing_url?: string | null;
+                        error?: string | null;
+                      }>(jobPath);
+                      if (jobRes.error) continue;
+                      if (jobRes.data?.status === "failed") {
+                        alert(jobRes.data.error || "Failed to generate agreement. Please try again.");
+                        setReviewSubmitting(false);
+                        return;
+                      }
+                      if (jobRes.data?.status === "succeeded") {
+                        result = jobRes.data;
+                        break;
+                      }
+                    }
+                    if (!result) {
+                      alert("Generating your agreement is taking longer than expected. Please try again.");
+                      setReviewSubmitting(false);
+                      return;
+                    }
+                  }
+                  if (result?.redirect_to_signing && result?.signing_url) {
+                    window.location.href = result.signing_url;
                     return;
                   }
                   setStep("done");
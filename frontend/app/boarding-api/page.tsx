@@ -4,7 +4,7 @@ import Image from "next/image";
 import Link from "next/link";
 import { useRouter } from "next/navigation";
 import { useCallback, useEffect, useState } from "react";
-import { API_BASE, apiGet, apiPost, apiPatch, apiDelete } from "@/lib/api";
+import { API_BASE, apiGet, apiGetAll, apiPost, apiPatch, apiDelete } from "@/lib/api";
 import { ProductPackageWizard, type CatalogProduct, type WizardItem } from "@/components/ProductPackageWizard";
 import { StoreAddressInput } from "@/components/StoreAddressInput";
 
@@ -121,7 +121,7 @@ export default function BoardingApiPage() {
     (async () => {
       const [catRes, pkgRes, feeRes] = await Promise.all([
         apiGet<CatalogProduct[]>("/partners/product-catalog", { headers: authHeaders(token) }),
-        apiGet<ProductPackage[]>("/partners/product-packages", { headers: authHeaders(token) }),
+        apiGetAll<ProductPackage>("/partners/product-packages", { headers: authHeaders(token) }),
         apiGet<{ rates: Record<string, Record<string, number>> }>("/partners/fee-schedule", { headers: authHeaders(token) }),
       ]);
       if (cancelled) return;
@@ -741,7 +741,7 @@ export default function BoardingApiPage() {
                   setEditingPackageId(null);
                   setPackageCreateSuccess(editingPackageId ? "Package updated." : `Package created. UID: ${uid}`);
                   if (token) {
-                    apiGet<ProductPackage[]>("/partners/product-packages", { headers: authHeaders(token) }).then((r) => {
+                    apiGetAll<ProductPackage>("/partners/product-packages", { headers: authHeaders(token) }).then((r) => {
                       if (r.data) setPackages(r.data);
                     });
                   }
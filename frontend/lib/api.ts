@@ -38,6 +38,10 @@ export async function apiGet<T>(path: string, options?: RequestInit): Promise<Ap
     method: "GET",
     headers: { "Content-Type": "application/json", ...options?.headers },
   });
+  return readGetResponse<T>(res);
+}
+
+async function readGetResponse<T>(res: Response): Promise<ApiResponse<T>> {
   const text = await res.text();
   const json = (() => {
     try {
@@ -65,6 +69,26 @@ export async function apiGet<T>(path: string, options?: RequestInit): Promise<Ap
   return { data: json as T };
 }
 
+/** GET a keyset-paginated list endpoint, following X-Next-Cursor until all pages are loaded. */
+export async function apiGetAll<T>(path: string, options?: RequestInit): Promise<ApiResponse<T[]>> {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const sep = path.includes("?") ? "&" : "?";
+    const url: string = cursor ? `${path}${sep}cursor=${encodeURIComponent(cursor)}` : path;
+    const res = await fetch(`${API_BASE}${url}`, {
+      ...options,
+      method: "GET",
+      headers: { "Content-Type": "application/json", ...options?.headers },
+    });
+    const page = await readGetResponse<T[]>(res);
+    if (page.error !== undefined) return page;
+    items.push(...page.data);
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return { data: items };
+}
+
 export async function apiPut<T>(
   path: string,
   body: unknown,